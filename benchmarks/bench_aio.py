@@ -0,0 +1,91 @@
+"""
+Benchmark of event loop latency while loading many maml files with the sync api (on the
+loop) and with the async api (in an executor).
+
+Run with: python benchmarks/bench_aio.py
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from pymaml import MAML, afrom_files
+
+FIELD = {"name": "RA", "unit": "deg", "ucd": "pos.eq.ra", "data_type": "float64"}
+
+
+def write_files(directory: str, n_files: int, n_fields: int) -> list[str]:
+    """Writes n_files maml files with n_fields fields each."""
+    data = {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "fields": [dict(FIELD, name=f"col_{i}") for i in range(n_fields)],
+    }
+    file_names = []
+    for i in range(n_files):
+        file_name = os.path.join(directory, f"bench_{i}.maml")
+        with open(file_name, "w", encoding="utf8") as file:
+            yaml.safe_dump(data, file, sort_keys=False)
+        file_names.append(file_name)
+    return file_names
+
+
+async def ticker(lags: list[float], interval: float = 0.001) -> None:
+    """Measures how late the loop wakes up from short sleeps."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def measure(load) -> tuple[float, float, float]:
+    """Runs load() next to the ticker. Returns the total time, max and mean loop lag."""
+    lags = []
+    task = asyncio.create_task(ticker(lags))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await load()
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    return elapsed, max(lags), sum(lags) / len(lags)
+
+
+def main() -> None:
+    """Compares the sync api, the async api with threads and with processes."""
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = write_files(directory, 200, 200)
+
+        async def sync():
+            for file_name in file_names:
+                MAML.from_file(file_name, "v1.1")
+                await asyncio.sleep(0)
+
+        async def threads():
+            await afrom_files(file_names, "v1.1", limit=8)
+
+        with ProcessPoolExecutor() as executor:
+
+            async def processes():
+                await afrom_files(file_names, "v1.1", limit=32, executor=executor)
+
+            print(f"{'api':>16} {'total (s)':>10} {'max lag (ms)':>13} {'mean lag (ms)':>14}")
+            for name, load in (
+                ("sync", sync),
+                ("async threads", threads),
+                ("async processes", processes),
+            ):
+                elapsed, max_lag, mean_lag = asyncio.run(measure(load))
+                print(
+                    f"{name:>16} {elapsed:>10.3f} {max_lag * 1e3:>13.2f} "
+                    f"{mean_lag * 1e3:>14.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of MAMLBuilder.build() compared with validating the whole document, when
+building after every added field and when building once at the end.
+
+Run with: python benchmarks/bench_builder.py
+"""
+
+import time
+
+from pymaml.maml import MAML, MAMLBuilder
+
+FIELD = {
+    "name": "RA",
+    "unit": "deg",
+    "info": "Right ascension",
+    "ucd": "pos.eq.ra;meta.main",
+    "data_type": "float64",
+    "qc": {"min": 0.0, "max": 360.0},
+}
+
+
+def new_builder() -> MAMLBuilder:
+    """A builder with every required key except the fields."""
+    builder = MAMLBuilder("v1.1")
+    builder.set("table", "bench").set("version", 1).set("date", "2025-09-12").set("author", "me")
+    return builder
+
+
+def run(n_fields: int, full: bool) -> float:
+    """Adds n_fields fields, building after each one. Returns the time taken."""
+    builder = new_builder()
+    start = time.perf_counter()
+    for i in range(n_fields):
+        builder.add("fields", dict(FIELD, name=f"col_{i}"))
+        if full:
+            MAML(builder._data, "v1.1")
+        else:
+            builder.build()
+    return time.perf_counter() - start
+
+
+def final_build(n_fields: int) -> tuple[float, float]:
+    """Times validating the whole document and build() once every field has been added."""
+    builder = new_builder()
+    for i in range(n_fields):
+        builder.add("fields", dict(FIELD, name=f"col_{i}"))
+    start = time.perf_counter()
+    MAML(builder._data, "v1.1")
+    middle = time.perf_counter()
+    builder.build()
+    return middle - start, time.perf_counter() - middle
+
+
+def main() -> None:
+    """Times both approaches over a range of table widths."""
+    run(10, full=True)  # warm up the model and adapter schemas
+    run(10, full=False)
+    print("Building after every added field (each build only copies the list of frozen fields):")
+    print(f"{'fields':>7} {'full (s)':>9} {'incremental (s)':>16} {'speedup':>8}")
+    for n_fields in (10, 100, 1000, 3000):
+        t_full = run(n_fields, full=True)
+        t_incremental = run(n_fields, full=False)
+        print(
+            f"{n_fields:>7} {t_full:>9.4f} {t_incremental:>16.4f} "
+            f"{t_full / t_incremental:>7.1f}x"
+        )
+    print("\nOne build() after adding every field (validation was done by add):")
+    print(f"{'fields':>7} {'full (ms)':>10} {'build (ms)':>11} {'speedup':>8}")
+    for n_fields in (100, 1000, 10000):
+        t_full, t_build = final_build(n_fields)
+        print(
+            f"{n_fields:>7} {t_full * 1e3:>10.3f} {t_build * 1e3:>11.3f} "
+            f"{t_full / t_build:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
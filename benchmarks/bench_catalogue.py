@@ -0,0 +1,58 @@
+"""
+Benchmark of cataloguing a directory of maml files: a full scan, loading a snapshot and
+rescanning with the snapshot after a few files changed.
+
+Run with: python benchmarks/bench_catalogue.py [number of files]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+from pymaml.catalogue import Catalogue
+
+
+def write_tree(directory: str, n_files: int) -> None:
+    """Tables that each depend on the previous one, with a few fields."""
+    for i in range(n_files):
+        data = {
+            "survey": "S",
+            "dataset": f"D{i % 10}",
+            "table": f"t{i}",
+            "version": 1,
+            "date": "2025-01-01",
+            "author": "me",
+            "depends": [{"table": f"t{i - 1}"}] if i else [{"table": "missing"}],
+            "fields": [{"name": f"c{j}", "data_type": "float64"} for j in range(20)],
+        }
+        with open(os.path.join(directory, f"t{i:06}.maml"), "w", encoding="utf8") as file:
+            yaml.safe_dump(data, file, sort_keys=False)
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:>8.3f}s")
+    return result
+
+
+def main(n_files: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        write_tree(directory, n_files)
+        snapshot = os.path.join(directory, "catalogue.json")
+        print(f"{n_files} files")
+        timed("scan (1 process)", lambda: Catalogue.scan(directory, workers=1))
+        catalogue = timed("scan (process pool)", lambda: Catalogue.scan(directory))
+        timed("save snapshot", lambda: catalogue.save(snapshot))
+        loaded = timed("load snapshot", lambda: Catalogue.load(snapshot))
+        write_tree(directory, 10)
+        timed("rescan (10 changed)", lambda: Catalogue.scan(directory, previous=loaded))
+        timed("1000 dependents queries", lambda: [loaded.dependents(f"t{i}") for i in range(1000)])
+        timed("cycles", loaded.cycles)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,56 @@
+"""
+Benchmark of the memory used by the fields of a wide table as pydantic models and as
+CompactFields.
+
+Run with: python benchmarks/bench_compact.py
+"""
+
+import gc
+import tracemalloc
+
+from pymaml.compact import CompactFields
+from pymaml.model_v1p1 import FieldEntry
+
+UNITS = ["deg", "mag", "Jy", None]
+TYPES = ["float64", "float32", "int64", "string"]
+
+
+def field(i: int) -> dict:
+    """A typical field of a wide table."""
+    return {
+        "name": f"col_{i}",
+        "unit": UNITS[i % 4],
+        "info": f"Column number {i % 50}",
+        "ucd": "phot.mag;em.opt.V" if i % 4 == 1 else None,
+        "data_type": TYPES[i % 4],
+        "qc": {"min": 0.0, "max": float(i)} if i % 2 else None,
+    }
+
+
+def measure(build) -> int:
+    """Returns the bytes still allocated by the result of build()."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    """Compares both representations over a range of table widths."""
+    print(f"{'fields':>7} {'pydantic (kB)':>14} {'compact (kB)':>13} {'ratio':>6}")
+    for n_fields in (100, 1000, 10000):
+        rows = [field(i) for i in range(n_fields)]
+        entries = [FieldEntry(**row) for row in rows]
+        models = measure(lambda: [FieldEntry(**row) for row in rows])
+        compact = measure(lambda: CompactFields(entries))
+        print(
+            f"{n_fields:>7} {models / 1024:>14.1f} {compact / 1024:>13.1f} "
+            f"{models / compact:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark for detect_version compared with valid_for, which validates against every model.
+
+Run with: python benchmarks/bench_detect_version.py
+"""
+
+import os
+import tempfile
+import timeit
+
+import yaml
+
+from pymaml import detect_version, valid_for
+
+FIELD = {
+    "name": "RA",
+    "unit": "deg",
+    "ucd": "pos.eq.ra;meta.main",
+    "data_type": "float64",
+    "qc": {"min": 0.0, "max": 360.0},
+}
+
+
+def write_file(directory: str, n_fields: int) -> str:
+    """Writes a maml file with n_fields fields declaring its version at the end."""
+    data = {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "fields": [dict(FIELD, name=f"col_{i}") for i in range(n_fields)],
+        "MAML_version": 1.1,
+    }
+    file_name = os.path.join(directory, f"bench_{n_fields}.maml")
+    with open(file_name, "w", encoding="utf8") as file:
+        yaml.safe_dump(data, file, sort_keys=False)
+    return file_name
+
+
+def main() -> None:
+    """Times both over a range of file sizes."""
+    print(f"{'fields':>7} {'valid_for (s)':>14} {'detect (s)':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_fields in (10, 100, 1000, 5000):
+            file_name = write_file(directory, n_fields)
+            t_valid = min(timeit.repeat(lambda: valid_for(file_name), number=1, repeat=3))
+            t_detect = min(
+                timeit.repeat(lambda: detect_version(file_name), number=1, repeat=3)
+            )
+            print(
+                f"{n_fields:>7} {t_valid:>14.4f} {t_detect:>11.4f} "
+                f"{t_valid / t_detect:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
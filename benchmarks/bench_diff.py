@@ -0,0 +1,69 @@
+"""
+Benchmark of diffing and patching wide tables, showing that the time grows linearly with
+the number of fields.
+
+Run with: python benchmarks/bench_diff.py
+"""
+
+import random
+import time
+
+from pymaml.diff import apply_patch, make_patch
+
+
+def table(n_fields: int) -> dict:
+    """A wide table with a unit, ucd and qc on every field."""
+    return {
+        "table": "wide",
+        "fields": [
+            {
+                "name": f"col_{i}",
+                "unit": "deg",
+                "ucd": "pos.eq.ra",
+                "data_type": "float64",
+                "qc": {"min": 0.0, "max": float(i)},
+            }
+            for i in range(n_fields)
+        ],
+    }
+
+
+def release(old: dict) -> dict:
+    """The next release: fields shuffled, 1% changed, 1% removed and 1% added."""
+    rng = random.Random(0)
+    fields = [dict(field, qc=dict(field["qc"])) for field in old["fields"]]
+    rng.shuffle(fields)
+    n = len(fields) // 100
+    for field in fields[:n]:
+        field["unit"] = "rad"
+        field["qc"]["max"] += 1
+    fields = fields[n:]
+    fields += [{"name": f"new_{i}", "data_type": "int32"} for i in range(n)]
+    return {"table": "wide", "fields": fields}
+
+
+def best(func, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    print(f"{'fields':>7} {'diff (ms)':>10} {'patch (ms)':>11} {'us/field':>9}")
+    for n_fields in (1_000, 10_000, 100_000):
+        old = table(n_fields)
+        new = release(old)
+        patch = make_patch(old, new)
+        diff_time = best(lambda: make_patch(old, new))
+        patch_time = best(lambda: apply_patch(old, patch))
+        print(
+            f"{n_fields:>7} {diff_time * 1e3:>10.1f} {patch_time * 1e3:>11.1f} "
+            f"{(diff_time + patch_time) / n_fields * 1e6:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
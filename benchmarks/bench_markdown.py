@@ -0,0 +1,54 @@
+"""
+Benchmark of the native markdown renderer against yaml_to_markdown's MDConverter.
+
+Run with: python benchmarks/bench_markdown.py
+"""
+
+import io
+import timeit
+
+from yaml_to_markdown.md_converter import MDConverter
+
+from pymaml.maml import MAML
+from pymaml.markdown import render_markdown
+
+FIELD = {
+    "name": "RA",
+    "unit": "deg",
+    "ucd": "pos.eq.ra;meta.main",
+    "data_type": "float64",
+    "qc": {"min": 0.0, "max": 360.0},
+}
+
+
+def wide_dict(n_fields: int) -> dict:
+    """The to_dict() of a maml with n_fields fields."""
+    data = {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "fields": [dict(FIELD, name=f"col_{i}") for i in range(n_fields)],
+    }
+    return MAML(data, "v1.1").to_dict()
+
+
+def main() -> None:
+    """Times both renderers over a range of table widths."""
+    print(f"{'fields':>7} {'MDConverter (s)':>16} {'native (s)':>11} {'speedup':>8}")
+    for n_fields in (10, 100, 1000, 10000):
+        data = wide_dict(n_fields)
+        t_converter = min(
+            timeit.repeat(lambda: MDConverter().convert(data, io.StringIO()), number=3, repeat=3)
+        )
+        t_native = min(
+            timeit.repeat(lambda: render_markdown(data, io.StringIO()), number=3, repeat=3)
+        )
+        print(
+            f"{n_fields:>7} {t_converter:>16.4f} {t_native:>11.4f} "
+            f"{t_converter / t_native:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
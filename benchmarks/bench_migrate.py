@@ -0,0 +1,62 @@
+"""
+Benchmark of migrating a v1.0 maml to v1.1 with the migration steps compared with
+writing it to yaml and validating it again as v1.1.
+
+Run with: python benchmarks/bench_migrate.py
+"""
+
+import time
+
+from pymaml import MAML, read_maml_buffer
+
+
+def table(n_fields: int) -> dict:
+    """A v1.0 table with a unit, ucd and qc on every field."""
+    return {
+        "table": "wide",
+        "version": 1,
+        "date": "2025-01-01",
+        "author": "me",
+        "MAML_version": 1.0,
+        "fields": [
+            {
+                "name": f"col_{i}",
+                "unit": "deg",
+                "ucd": "pos.eq.ra",
+                "data_type": "float64",
+                "qc": {"min": 0.0, "max": float(i)},
+            }
+            for i in range(n_fields)
+        ],
+    }
+
+
+def round_trip(maml: MAML) -> MAML:
+    data = read_maml_buffer(maml.to_yaml())
+    data["MAML_version"] = 1.1
+    return MAML(data, "v1.1")
+
+
+def best(func, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    print(f"{'fields':>7} {'yaml (ms)':>10} {'migrate (ms)':>13} {'speedup':>8}")
+    for n_fields in (10, 1_000, 10_000):
+        maml = MAML(table(n_fields), "v1.0")
+        yaml_time = best(lambda: round_trip(maml))
+        migrate_time = best(lambda: maml.migrate("v1.1"))
+        print(
+            f"{n_fields:>7} {yaml_time * 1e3:>10.2f} {migrate_time * 1e3:>13.2f} "
+            f"{yaml_time / migrate_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark for reading maml files with the pure python and libyaml loaders.
+
+Run with: python benchmarks/bench_read.py
+"""
+
+import os
+import tempfile
+import timeit
+
+import yaml
+
+from pymaml.read import YAML_BACKEND
+
+FIELD = {
+    "name": "RA",
+    "unit": "deg",
+    "info": "Right ascension",
+    "ucd": "pos.eq.ra;meta.main",
+    "data_type": "float64",
+    "qc": {"min": 0.0, "max": 360.0, "miss": "Null"},
+}
+
+
+def write_file(directory: str, n_fields: int) -> str:
+    """Writes a maml file with n_fields fields."""
+    data = {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "fields": [dict(FIELD, name=f"col_{i}") for i in range(n_fields)],
+    }
+    file_name = os.path.join(directory, f"bench_{n_fields}.maml")
+    with open(file_name, "w", encoding="utf8") as file:
+        yaml.safe_dump(data, file, sort_keys=False)
+    return file_name
+
+
+def load(file_name: str, loader) -> dict:
+    """Loads a file with the given loader."""
+    with open(file_name, encoding="utf8") as file:
+        return yaml.load(file, Loader=loader)
+
+
+def main() -> None:
+    """Times both loaders over a range of file sizes."""
+    print(f"read_maml backend: {YAML_BACKEND}")
+    if not yaml.__with_libyaml__:
+        print("PyYAML was built without libyaml, nothing to compare.")
+        return
+    print(f"{'fields':>7} {'python (s)':>11} {'libyaml (s)':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for n_fields in (10, 100, 1000, 5000):
+            file_name = write_file(directory, n_fields)
+            t_python = min(
+                timeit.repeat(lambda: load(file_name, yaml.SafeLoader), number=1, repeat=3)
+            )
+            t_libyaml = min(
+                timeit.repeat(lambda: load(file_name, yaml.CSafeLoader), number=1, repeat=3)
+            )
+            print(
+                f"{n_fields:>7} {t_python:>11.4f} {t_libyaml:>12.4f} "
+                f"{t_python / t_libyaml:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
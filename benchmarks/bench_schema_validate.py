@@ -0,0 +1,63 @@
+"""
+Benchmark of the validate-only mode (schema_validate) against validating with the pydantic
+model, for valid documents of growing width. The UCD cache is warm in every case.
+
+Run with: python benchmarks/bench_schema_validate.py
+"""
+
+import timeit
+
+from pymaml.parse import MODELS
+from pymaml.schema_validate import is_valid, quick_validate
+
+UCDS = ["pos.eq.ra;meta.main", "pos.eq.dec;meta.main", "phot.mag;em.opt.R", "meta.id"]
+
+
+def wide_document(n_fields: int) -> dict:
+    """A valid v1.1 document with n_fields fields, as read from yaml."""
+    return {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "MAML_version": 1.1,
+        "fields": [
+            {
+                "name": f"col_{i}",
+                "unit": "deg",
+                "info": "A column",
+                "ucd": UCDS[i % len(UCDS)],
+                "data_type": "float64",
+                "qc": {"min": 0, "max": 360.5},
+            }
+            for i in range(n_fields)
+        ],
+    }
+
+
+def best(func, data: dict) -> float:
+    return min(timeit.repeat(lambda: func(data), number=10, repeat=5)) / 10
+
+
+def main() -> None:
+    """Times the model, is_valid and quick_validate on the same documents."""
+    model = MODELS["v1.1"]
+    print(
+        f"{'fields':>7} {'model (ms)':>11} {'is_valid (ms)':>14} {'quick (ms)':>11} "
+        f"{'speedup':>8}"
+    )
+    for n_fields in (100, 1_000, 2_000):
+        data = wide_document(n_fields)
+        model.model_validate(data)
+        assert is_valid(data, "v1.1") and quick_validate(data, "v1.1") == []
+        t_model = best(model.model_validate, data)
+        t_valid = best(lambda d: is_valid(d, "v1.1"), data)
+        t_quick = best(lambda d: quick_validate(d, "v1.1"), data)
+        print(
+            f"{n_fields:>7} {t_model * 1e3:>11.2f} {t_valid * 1e3:>14.2f} {t_quick * 1e3:>11.2f} "
+            f"{t_model / t_valid:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
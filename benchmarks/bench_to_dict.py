@@ -0,0 +1,53 @@
+"""
+Benchmark for MAML.to_dict(include_none=False) on wide tables, compared with removing
+the Nones from the full dump in python.
+
+Run with: python benchmarks/bench_to_dict.py
+"""
+
+import timeit
+
+from pymaml.maml import MAML, _remove_nones
+
+FIELD = {
+    "name": "RA",
+    "unit": "deg",
+    "ucd": "pos.eq.ra;meta.main",
+    "data_type": "float64",
+    "qc": {"min": 0.0, "max": 360.0},
+}
+
+
+def wide_maml(n_fields: int) -> MAML:
+    """A maml with n_fields fields."""
+    data = {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "fields": [dict(FIELD, name=f"col_{i}") for i in range(n_fields)],
+    }
+    return MAML(data, "v1.1")
+
+
+def main() -> None:
+    """Times both approaches over a range of table widths."""
+    print(f"{'fields':>7} {'python (s)':>11} {'native (s)':>11} {'speedup':>8}")
+    for n_fields in (10, 100, 1000, 10000):
+        maml = wide_maml(n_fields)
+        t_python = min(
+            timeit.repeat(
+                lambda: _remove_nones(maml.meta.model_dump(mode="json")), number=5, repeat=3
+            )
+        )
+        t_native = min(
+            timeit.repeat(lambda: maml.to_dict(include_none=False), number=5, repeat=3)
+        )
+        print(
+            f"{n_fields:>7} {t_python:>11.4f} {t_native:>11.4f} "
+            f"{t_python / t_native:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
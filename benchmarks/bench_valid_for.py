@@ -0,0 +1,106 @@
+"""
+Benchmark of what the UCD cache saves when validating a document against every version.
+
+Without the cache (the behaviour before ucd_funcs.is_valid_ucd) astropy's check_ucd runs
+for every field of every version. validation_report is timed with a cold cache, cleared
+with clear_ucd_cache() before each run, where each unique ucd is checked once for the
+whole document, and with a warm cache, as for every later file in the same process.
+
+Only the ucd results are shared between versions, through the process wide LRU cache.
+validation_report still runs a full model_validate of the document for every version, so
+the second table (extra versions registered as copies of V1P1) grows linearly with the
+number of versions, while the astropy checks saved grow with it.
+
+Run with: python benchmarks/bench_valid_for.py
+"""
+
+import timeit
+from unittest.mock import patch
+
+from pymaml.parse import MODELS, validation_report
+from pymaml.ucd_funcs import clear_ucd_cache, is_valid_ucd
+
+UCDS = ["pos.eq.ra;meta.main", "pos.eq.dec;meta.main", "phot.mag;em.opt.R", "meta.id"]
+
+
+def wide_document(n_fields: int) -> dict:
+    """A valid document with n_fields fields cycling through a handful of ucds."""
+    return {
+        "table": "bench",
+        "version": 1,
+        "date": "2025-09-12",
+        "author": "me",
+        "fields": [
+            {"name": f"col_{i}", "data_type": "float64", "ucd": UCDS[i % len(UCDS)]}
+            for i in range(n_fields)
+        ],
+    }
+
+
+def uncached(data: dict) -> dict:
+    """validation_report with every ucd checked by astropy, as before the cache."""
+    with patch("pymaml.model_v1p0.is_valid_ucd", is_valid_ucd.__wrapped__), patch(
+        "pymaml.model_v1p1.is_valid_ucd", is_valid_ucd.__wrapped__
+    ):
+        return validation_report(data)
+
+
+def cold(data: dict) -> dict:
+    clear_ucd_cache()
+    return validation_report(data)
+
+
+def best(func, data: dict) -> float:
+    return min(timeit.repeat(lambda: func(data), number=1, repeat=3))
+
+
+def by_width() -> None:
+    """Times validating documents of growing width in the three ways."""
+    print(f"{'fields':>7} {'uncached (s)':>13} {'cold (s)':>9} {'warm (s)':>9} {'speedup':>8}")
+    for n_fields in (100, 1_000, 2_000):
+        data = wide_document(n_fields)
+        assert uncached(data) == cold(data)
+        t_uncached = best(uncached, data)
+        t_cold = best(cold, data)
+        t_warm = best(validation_report, data)
+        print(
+            f"{n_fields:>7} {t_uncached:>13.4f} {t_cold:>9.4f} {t_warm:>9.4f} "
+            f"{t_uncached / t_cold:>7.1f}x"
+        )
+
+
+def by_versions() -> None:
+    """Times a 2000 field document while adding copies of the latest model to MODELS."""
+    data = wide_document(2000)
+    original = dict(MODELS)
+    try:
+        print(
+            f"{'versions':>8} {'uncached (s)':>13} {'cold (s)':>9} {'warm (s)':>9} "
+            f"{'speedup':>8}"
+        )
+        for n_extra in range(0, 7, 2):
+            MODELS.clear()
+            MODELS.update(original)
+            for i in range(n_extra):
+                MODELS[f"v9.{i}"] = original["v1.1"]
+            t_uncached = best(uncached, data)
+            t_cold = best(cold, data)
+            t_warm = best(validation_report, data)
+            print(
+                f"{len(MODELS):>8} {t_uncached:>13.4f} {t_cold:>9.4f} {t_warm:>9.4f} "
+                f"{t_uncached / t_cold:>7.1f}x"
+            )
+    finally:
+        MODELS.clear()
+        MODELS.update(original)
+
+
+def main() -> None:
+    cold(wide_document(1))  # imports astropy
+    by_width()
+    print()
+    by_versions()
+
+
+if __name__ == "__main__":
+    main()
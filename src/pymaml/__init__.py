@@ -1,10 +1,39 @@
 # src/pymaml/__init__.py
 
-from .maml import MAML
-from .parse import valid_for
+from .maml import MAML, iter_maml
+from .parse import detect_version, valid_for, validation_report
 from .date_funcs import is_iso8601, today
-from .read import read_maml
+from .read import read_maml, read_maml_buffer, YAML_BACKEND
+from .aio import aread_maml, afrom_files
 from .model_v1p0 import V1P0
 from .model_v1p1 import V1P1
+from .batch import validate_tree
+from .parquet import scan_parquet_maml
+from .cache import ValidationCache
+from .catalogue import Catalogue
+from .migrate import migrate_dict, migrate_tree
+from .cli import main
 
-__all__ = ["MAML", "read_maml", "is_iso8601", "V1P0", "V1P1", "valid_for", "today"]
+__all__ = [
+    "MAML",
+    "iter_maml",
+    "read_maml",
+    "read_maml_buffer",
+    "aread_maml",
+    "afrom_files",
+    "YAML_BACKEND",
+    "is_iso8601",
+    "V1P0",
+    "V1P1",
+    "valid_for",
+    "detect_version",
+    "validation_report",
+    "validate_tree",
+    "scan_parquet_maml",
+    "ValidationCache",
+    "Catalogue",
+    "migrate_dict",
+    "migrate_tree",
+    "today",
+    "main",
+]
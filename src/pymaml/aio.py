@@ -0,0 +1,84 @@
+"""
+Helper module for using pymaml from asyncio without blocking the event loop.
+
+All file access, parsing and validation is run in an executor: the one passed in, else the
+one set with set_default_executor, else the event loop's default thread pool. A process
+pool can be used to spread parsing and validation over several cpus.
+"""
+
+import contextvars
+import functools
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+from .read import read_maml
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .maml import MAML
+
+_default_executor: "Executor | None" = None
+
+
+def set_default_executor(executor: "Executor | None") -> None:
+    """
+    Sets the executor used when none is passed. None uses the event loop's default.
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+async def run(func: Callable, *args, executor: "Executor | None" = None, **kwargs) -> Any:
+    """
+    Runs func(*args, **kwargs) in the executor and waits for the result.
+    """
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = executor or _default_executor
+    call = functools.partial(func, *args, **kwargs)
+    if not isinstance(executor, ProcessPoolExecutor):
+        # Run in a copy of the caller's context, e.g. so instrument.collect_timings sees it.
+        call = functools.partial(contextvars.copy_context().run, call)
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+async def gather_limited(awaitables: Iterable[Awaitable], limit: int) -> list:
+    """
+    Awaits every awaitable with at most `limit` running at once. Results are in order.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(awaitable: Awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(limited(awaitable) for awaitable in awaitables))
+
+
+async def aread_maml(file_name: str, executor: "Executor | None" = None) -> dict | None:
+    """
+    Async version of read_maml.
+    """
+    return await run(read_maml, file_name, executor=executor)
+
+
+async def afrom_files(
+    file_names: Iterable[str],
+    version: str,
+    limit: int = 8,
+    executor: "Executor | None" = None,
+) -> list["MAML"]:
+    """
+    Loads many files with MAML.afrom_file, at most `limit` at once, in the given order.
+    The first file that fails raises; the files still being loaded are left to finish.
+    """
+    from .maml import MAML
+
+    return await gather_limited(
+        (MAML.afrom_file(file_name, version, executor) for file_name in file_names), limit
+    )
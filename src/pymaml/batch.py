@@ -0,0 +1,209 @@
+"""
+Module for validating many maml files at once.
+"""
+
+import os
+import warnings
+from typing import TYPE_CHECKING, Iterator
+
+from .parse import MODELS, _assert_mapping, _assert_version, order_error, validation_report
+from .read import read_maml
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .cache import ValidationCache
+
+
+def _find_files(path: str, extensions: tuple[str, ...]) -> list[str]:
+    """
+    Returns every file with one of the extensions under the given directory (or the file
+    itself), sorted.
+    """
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        files.extend(
+            os.path.join(root, name) for name in sorted(names) if name.endswith(extensions)
+        )
+    return files
+
+
+def _output_path(file_name: str, root: str, out_dir: str | None, extension: str) -> str:
+    """
+    Where to write the output for a file found under root: next to the file, or at the same
+    relative path under out_dir (whose directories are created).
+    """
+    if out_dir is None:
+        return os.path.splitext(file_name)[0] + extension
+    if os.path.isdir(root):
+        relative = os.path.relpath(file_name, root)
+    else:
+        relative = os.path.basename(file_name)
+    outfile = os.path.join(out_dir, os.path.splitext(relative)[0] + extension)
+    os.makedirs(os.path.dirname(outfile), exist_ok=True)
+    return outfile
+
+
+def find_maml_files(path: str) -> list[str]:
+    """
+    Returns every .maml file under the given directory (or the file itself), sorted.
+    """
+    return _find_files(path, (".maml",))
+
+
+def check_file(file_name: str, versions: list[str] | None = None) -> dict:
+    """
+    Reads and validates a single file, never raising. Returns the error message if the
+    file could not be read, the validation report of every version, the path of the first
+    out of order key for every valid version and any warnings raised while reading.
+    The result only depends on the contents of the file, so it can be cached.
+    """
+    if versions is None:
+        versions = list(MODELS)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            data = read_maml(file_name)
+            _assert_mapping(data)
+        except (OSError, ValueError) as exc:
+            read_error = str(exc)
+            error = {"loc": "", "msg": read_error, "type": "read_error"}
+            report = {v: [error] for v in versions}
+            order = {}
+        else:
+            read_error = None
+            report = validation_report(data, versions)
+            order = {v: order_error(data, v) for v, errors in report.items() if not errors}
+    return {
+        "read_error": read_error,
+        "report": report,
+        "order": order,
+        "warnings": [str(warning.message).strip() for warning in caught],
+    }
+
+
+def cached_check(file_name: str, cache: "ValidationCache") -> dict:
+    """
+    check_file for every version, looked up in (and stored to) the cache by content hash.
+    """
+    from .cache import hash_file
+
+    content_hash = hash_file(file_name)
+    checked = cache.get(content_hash)
+    if checked is None:
+        checked = check_file(file_name)
+        cache.put(content_hash, checked)
+    return checked
+
+
+def _result(file_name: str, checked: dict, version: str | None) -> dict:
+    """
+    The result of validate_file from the result of check_file.
+    """
+    report = checked["report"] if version is None else {version: checked["report"][version]}
+    file_warnings = list(checked["warnings"])
+    if version is not None and checked["order"].get(version) is not None:
+        file_warnings.append(f"Ordering is not correct at '{checked['order'][version]}'.")
+    return {
+        "file": file_name,
+        "valid_for": [v for v, errors in report.items() if not errors],
+        "errors": {v: errors for v, errors in report.items() if errors},
+        "warnings": file_warnings,
+    }
+
+
+def validate_file(
+    file_name: str, version: str | None = None, cache: "ValidationCache | None" = None
+) -> dict:
+    """
+    Reads and validates a single file, never raising.
+    Returns a dictionary with the file name, the versions it is valid for, the errors for
+    every version that was checked, and any warnings raised while reading.
+    Results are looked up in and stored to the cache, if one is given.
+    """
+    if cache is not None:
+        checked = cached_check(file_name, cache)
+    else:
+        checked = check_file(file_name, None if version is None else [version])
+    return _result(file_name, checked, version)
+
+
+def _process_pool(workers: int | None) -> "ProcessPoolExecutor":
+    """
+    Returns a process pool that does not fork the (possibly multi-threaded) parent process.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context(method)
+    )
+
+
+def _check_chunk(file_names: list[str], versions: list[str] | None) -> list[dict]:
+    """
+    Checks a chunk of files inside a worker process.
+    """
+    return [check_file(file_name, versions) for file_name in file_names]
+
+
+def validate_tree(
+    path: str,
+    version: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 64,
+    cache: "ValidationCache | None" = None,
+) -> Iterator[dict]:
+    """
+    Validates every .maml file under `path`, yielding the result of each file (see
+    validate_file) as soon as it is available. Files are spread in chunks over a pool of
+    `workers` processes (default: one per cpu). With workers=1 everything runs in this process.
+    If no version is given each file is checked against every version.
+    With a cache, unchanged files are answered from it and only the rest are validated.
+    """
+    if version is not None:
+        _assert_version(version)
+    files = find_maml_files(path)
+    if cache is not None:
+        from .cache import hash_file
+
+        pending = {}
+        for file_name in files:
+            content_hash = hash_file(file_name)
+            checked = cache.get(content_hash)
+            if checked is None:
+                pending[file_name] = content_hash
+            else:
+                yield _result(file_name, checked, version)
+        files = list(pending)
+    versions = None if version is None or cache is not None else [version]
+
+    def results(file_names: list[str], chunk: list[dict]) -> Iterator[dict]:
+        for file_name, checked in zip(file_names, chunk):
+            if cache is not None:
+                cache.put(pending[file_name], checked)
+            yield _result(file_name, checked, version)
+
+    if workers == 1:
+        for file_name in files:
+            yield from results([file_name], [check_file(file_name, versions)])
+        return
+
+    from concurrent.futures import as_completed
+
+    executor = _process_pool(workers)
+    try:
+        futures = {
+            executor.submit(_check_chunk, files[i : i + chunk_size], versions): files[
+                i : i + chunk_size
+            ]
+            for i in range(0, len(files), chunk_size)
+        }
+        for future in as_completed(futures):
+            yield from results(futures[future], future.result())
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,166 @@
+"""
+Persistent on-disk cache of validation results.
+
+Results are stored in a local SQLite file keyed by the sha256 of the file contents, the
+pymaml version and a fingerprint of the models, so a file is only parsed and validated
+again when its contents, pymaml or the MAML schemas change.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from importlib.metadata import PackageNotFoundError, version as package_version
+
+from .parse import MODELS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    content_hash TEXT NOT NULL,
+    pymaml_version TEXT NOT NULL,
+    models_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (content_hash, pymaml_version, models_hash)
+)
+"""
+
+
+def pymaml_version() -> str:
+    """
+    Returns the installed version of pymaml.
+    """
+    try:
+        return package_version("pymaml")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def models_fingerprint() -> str:
+    """
+    Returns a hash of the json schema of every model in MODELS. Changes whenever MODELS does.
+    """
+    schemas = {name: model.model_json_schema() for name, model in MODELS.items()}
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True).encode("utf8")).hexdigest()
+
+
+def hash_file(file_name: str) -> str:
+    """
+    Returns the sha256 of the contents of a file.
+    """
+    with open(file_name, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+class ValidationCache:
+    """
+    SQLite backed cache of validation results (see batch.validate_tree and parse.valid_for).
+    Entries older than max_age seconds are evicted, as are the least recently used entries
+    beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1_000_000,
+        max_age: float = 30 * 24 * 60 * 60,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._key = (pymaml_version(), models_fingerprint())
+        self._connection = sqlite3.connect(path)
+        # Every write is committed, so results survive a crash or a missing close(). With a
+        # write-ahead log and synchronous=NORMAL a commit does not wait for the disk.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    def get(self, content_hash: str) -> dict | None:
+        """
+        Returns the cached result for the content hash, or None.
+        """
+        row = self._connection.execute(
+            "SELECT result, created FROM results "
+            "WHERE content_hash = ? AND pymaml_version = ? AND models_hash = ?",
+            (content_hash, *self._key),
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._connection.execute(
+            "UPDATE results SET accessed = ? "
+            "WHERE content_hash = ? AND pymaml_version = ? AND models_hash = ?",
+            (time.time(), content_hash, *self._key),
+        )
+        self._connection.commit()
+        return json.loads(row[0])
+
+    def put(self, content_hash: str, result: dict) -> None:
+        """
+        Stores the result for the content hash.
+        """
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (content_hash, *self._key, json.dumps(result), now, now),
+        )
+        self._connection.commit()
+
+    def evict(self) -> int:
+        """
+        Removes expired entries, entries from other pymaml versions or models, and the least
+        recently used entries beyond max_entries. Returns the number of entries removed.
+        """
+        cursor = self._connection.execute(
+            "DELETE FROM results WHERE created < ? OR pymaml_version != ? OR models_hash != ?",
+            (time.time() - self.max_age, *self._key),
+        )
+        removed = cursor.rowcount
+        cursor = self._connection.execute(
+            "DELETE FROM results WHERE rowid IN "
+            "(SELECT rowid FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        removed += cursor.rowcount
+        self._connection.commit()
+        return removed
+
+    def invalidate(self) -> None:
+        """
+        Removes every entry.
+        """
+        self._connection.execute("DELETE FROM results")
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Returns the hits, misses and hit rate since the cache was opened.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """
+        Evicts old entries and closes the database.
+        """
+        self.evict()
+        self._connection.close()
+
+    def __enter__(self) -> "ValidationCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
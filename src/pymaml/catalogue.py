@@ -0,0 +1,315 @@
+"""
+Module for indexing many maml files and the dependencies between their tables.
+
+A Catalogue holds one small entry per file (its survey, dataset, table, version and
+depends) rather than the whole metadata, indexes them by each of those and resolves every
+`depends` entry to the files it refers to. Catalogues can be saved as a json snapshot, and
+scanning again with the snapshot only re-reads the files that changed.
+"""
+
+import json
+import os
+import warnings
+from typing import Iterable, Iterator, NamedTuple
+
+from .batch import _process_pool, find_maml_files
+from .read import read_maml
+
+SNAPSHOT_FORMAT = 1
+
+
+class TableKey(NamedTuple):
+    """
+    The survey, dataset, table and version of a table (as given in `depends`, where
+    everything but the table may be missing).
+    """
+
+    survey: str | None
+    dataset: str | None
+    table: str | None
+    version: str | None
+
+    def matches(self, key: "TableKey") -> bool:
+        """
+        True if every part given here equals that part of the key.
+        """
+        return all(mine is None or mine == theirs for mine, theirs in zip(self, key))
+
+
+class CatalogueEntry(NamedTuple):
+    """
+    What the catalogue keeps of one file. mtime_ns and size tell if the file changed.
+    """
+
+    file: str
+    key: TableKey
+    depends: tuple[TableKey, ...]
+    mtime_ns: int
+    size: int
+    error: str | None = None
+
+
+def _text(value) -> str | None:
+    """
+    Versions may be numbers or strings; they are compared as strings, with whole numbers
+    written without a decimal point (so 2 and 2.0 match).
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return None if value is None else str(value)
+
+
+def _table_key(data: dict) -> TableKey:
+    return TableKey(
+        _text(data.get("survey")),
+        _text(data.get("dataset")),
+        _text(data.get("table")),
+        _text(data.get("version")),
+    )
+
+
+def read_entry(file_name: str) -> CatalogueEntry:
+    """
+    Reads the catalogue entry of one file, never raising. The metadata is not validated.
+    """
+    stat = os.stat(file_name)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            data = read_maml(file_name)
+        if not isinstance(data, dict):
+            raise ValueError("File is not a yaml mapping.")
+        depends = data.get("depends") or []
+        if not isinstance(depends, list) or not all(isinstance(d, dict) for d in depends):
+            raise ValueError("depends is not a list of tables.")
+    except (OSError, ValueError) as exc:
+        no_key = TableKey(None, None, None, None)
+        return CatalogueEntry(file_name, no_key, (), stat.st_mtime_ns, stat.st_size, str(exc))
+    return CatalogueEntry(
+        file_name,
+        _table_key(data),
+        tuple(_table_key(depend) for depend in depends),
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
+
+def _read_chunk(file_names: list[str]) -> list[CatalogueEntry]:
+    """
+    Reads a chunk of files inside a worker process.
+    """
+    return [read_entry(file_name) for file_name in file_names]
+
+
+class Catalogue:
+    """
+    Index of the tables in many maml files and the dependency graph between them.
+    Entries are numbered in file order; the graph is built once, when the catalogue is made.
+    """
+
+    def __init__(self, entries: Iterable[CatalogueEntry]):
+        self.entries: list[CatalogueEntry] = list(entries)
+        self._by_file = {entry.file: i for i, entry in enumerate(self.entries)}
+        self._by_key: dict[TableKey, list[int]] = {}
+        self._by_part: tuple[dict[str, list[int]], ...] = ({}, {}, {}, {})
+        for i, entry in enumerate(self.entries):
+            if entry.error is not None:
+                continue
+            self._by_key.setdefault(entry.key, []).append(i)
+            for part, index in zip(entry.key, self._by_part):
+                if part is not None:
+                    index.setdefault(part, []).append(i)
+        # depends[i]: the entries i depends on; dependents[i]: the entries depending on i.
+        self._depends: list[list[int]] = [[] for _ in self.entries]
+        self._dependents: list[list[int]] = [[] for _ in self.entries]
+        self._dangling: list[tuple[int, TableKey]] = []
+        for i, entry in enumerate(self.entries):
+            for depend in entry.depends:
+                targets = self._find(depend) if depend.table is not None else []
+                if not targets:
+                    self._dangling.append((i, depend))
+                for target in targets:
+                    self._depends[i].append(target)
+                    self._dependents[target].append(i)
+
+    @classmethod
+    def scan(
+        cls,
+        path: str,
+        workers: int | None = None,
+        chunk_size: int = 64,
+        previous: "Catalogue | None" = None,
+    ) -> "Catalogue":
+        """
+        Catalogues every .maml file under `path`, reading them in chunks with a pool of
+        `workers` processes (workers=1 reads in this process). Files in the previous
+        catalogue (e.g. a loaded snapshot) with the same size and mtime are not read again.
+        """
+        files = find_maml_files(path)
+        entries: dict[str, CatalogueEntry] = {}
+        if previous is not None:
+            for file_name in files:
+                old = previous.entry(file_name)
+                if old is None:
+                    continue
+                stat = os.stat(file_name)
+                if (old.mtime_ns, old.size) == (stat.st_mtime_ns, stat.st_size):
+                    entries[file_name] = old
+        pending = [file_name for file_name in files if file_name not in entries]
+        if workers == 1 or len(pending) <= chunk_size:
+            entries.update((entry.file, entry) for entry in _read_chunk(pending))
+        else:
+            executor = _process_pool(workers)
+            try:
+                chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+                for chunk in executor.map(_read_chunk, chunks):
+                    entries.update((entry.file, entry) for entry in chunk)
+            finally:
+                executor.shutdown(cancel_futures=True)
+        return cls(entries[file_name] for file_name in files)
+
+    def save(self, file_name: str) -> None:
+        """
+        Writes the catalogue to a json snapshot (see load).
+        """
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "entries": [
+                [e.file, list(e.key), [list(d) for d in e.depends], e.mtime_ns, e.size, e.error]
+                for e in self.entries
+            ],
+        }
+        with open(file_name, "w", encoding="utf8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, file_name: str) -> "Catalogue":
+        """
+        Reads a catalogue back from a json snapshot without reading any maml file.
+        """
+        with open(file_name, encoding="utf8") as file:
+            snapshot = json.load(file)
+        if snapshot.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported catalogue snapshot format: {snapshot.get('format')}")
+        return cls(
+            CatalogueEntry(
+                file, TableKey(*key), tuple(TableKey(*d) for d in depends), mtime_ns, size, error
+            )
+            for file, key, depends, mtime_ns, size, error in snapshot["entries"]
+        )
+
+    def _find(self, key: TableKey) -> list[int]:
+        """
+        Numbers of the entries matching every given part of the key.
+        """
+        if None not in key:
+            return self._by_key.get(key, [])
+        candidates = [
+            index.get(part, []) for part, index in zip(key, self._by_part) if part is not None
+        ]
+        if not candidates:
+            return [i for i, entry in enumerate(self.entries) if entry.error is None]
+        smallest = min(candidates, key=len)
+        return [i for i in smallest if key.matches(self.entries[i].key)]
+
+    def find(
+        self,
+        table: str | None = None,
+        survey: str | None = None,
+        dataset: str | None = None,
+        version: str | float | None = None,
+    ) -> list[CatalogueEntry]:
+        """
+        Returns the entries of every file matching all of the given parts.
+        """
+        key = TableKey(survey, dataset, table, _text(version))
+        return [self.entries[i] for i in self._find(key)]
+
+    def entry(self, file_name: str) -> CatalogueEntry | None:
+        """
+        Returns the entry of a file, or None if it is not in the catalogue.
+        """
+        i = self._by_file.get(file_name)
+        return None if i is None else self.entries[i]
+
+    def dependencies(self, file_name: str) -> list[CatalogueEntry]:
+        """
+        Returns the entries that the file's table depends on.
+        """
+        return [self.entries[i] for i in self._depends[self._by_file[file_name]]]
+
+    def dependents(
+        self,
+        table: str,
+        survey: str | None = None,
+        dataset: str | None = None,
+        version: str | float | None = None,
+    ) -> list[CatalogueEntry]:
+        """
+        Returns the entries of the files that depend on the given table (on any of the
+        files matching it). Each matching file's dependents are looked up directly.
+        """
+        found = {}
+        for target in self._find(TableKey(survey, dataset, table, _text(version))):
+            found.update(dict.fromkeys(self._dependents[target]))
+        return [self.entries[i] for i in found]
+
+    def dangling(self) -> list[tuple[CatalogueEntry, TableKey]]:
+        """
+        Returns every depends entry that no file in the catalogue matches, with its file.
+        """
+        return [(self.entries[i], depend) for i, depend in self._dangling]
+
+    def cycles(self) -> list[list[CatalogueEntry]]:
+        """
+        Returns every group of files that depend on each other in a cycle (strongly
+        connected components of the graph, found with an iterative Tarjan's algorithm).
+        """
+        index, low, on_stack, stack, groups = {}, {}, set(), [], []
+        for root in range(len(self.entries)):
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    index[node] = low[node] = len(index)
+                    stack.append(node)
+                    on_stack.add(node)
+                targets = self._depends[node]
+                while edge < len(targets):
+                    target = targets[edge]
+                    edge += 1
+                    if target not in index:
+                        work.append((node, edge))
+                        work.append((target, 0))
+                        break
+                    if target in on_stack:
+                        low[node] = min(low[node], index[target])
+                else:
+                    if low[node] == index[node]:
+                        group = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            group.append(member)
+                            if member == node:
+                                break
+                        if len(group) > 1 or node in targets:
+                            groups.append(sorted(group))
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+        return [[self.entries[i] for i in group] for group in sorted(groups)]
+
+    def errors(self) -> list[CatalogueEntry]:
+        """
+        Returns the entries of the files that could not be read.
+        """
+        return [entry for entry in self.entries if entry.error is not None]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[CatalogueEntry]:
+        return iter(self.entries)
@@ -0,0 +1,169 @@
+"""
+Command line interface for pymaml.
+"""
+
+import argparse
+import time
+
+from .batch import validate_tree
+from .cache import ValidationCache
+from .markdown import render_tree
+from .migrate import migrate_tree
+
+
+def _validate(args: argparse.Namespace) -> int:
+    """
+    Validates a directory tree of maml files and prints a summary.
+    """
+    start = time.perf_counter()
+    cache = None if args.cache is None else ValidationCache(args.cache)
+    n_valid = n_invalid = 0
+    for result in validate_tree(args.path, args.version, args.workers, cache=cache):
+        if result["valid_for"]:
+            n_valid += 1
+            if not args.quiet:
+                print(f"OK   {result['file']} ({', '.join(result['valid_for'])})")
+        else:
+            n_invalid += 1
+            print(f"FAIL {result['file']}")
+            for version, errors in result["errors"].items():
+                for error in errors:
+                    print(f"     {version}: {error['loc']}: {error['msg']}")
+        if not args.quiet:
+            for warning in result["warnings"]:
+                print(f"     warning: {warning}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"Checked {n_valid + n_invalid} files in {elapsed:.2f}s: "
+        f"{n_valid} valid, {n_invalid} invalid."
+    )
+    if cache is not None:
+        stats = cache.stats()
+        cache.close()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}).")
+    return 1 if n_invalid else 0
+
+
+def _markdown(args: argparse.Namespace) -> int:
+    """
+    Renders a directory tree of maml files to markdown and prints a summary.
+    """
+    start = time.perf_counter()
+    n_done = n_failed = 0
+    for result in render_tree(
+        args.path, args.out, args.version, args.compact, args.workers
+    ):
+        if result["error"] is None:
+            n_done += 1
+            if not args.quiet:
+                print(f"OK   {result['file']} -> {result['markdown']}")
+        else:
+            n_failed += 1
+            print(f"FAIL {result['file']}")
+            print(f"     {result['error']}")
+    elapsed = time.perf_counter() - start
+    print(
+        f"Rendered {n_done} of {n_done + n_failed} files in {elapsed:.2f}s: "
+        f"{n_failed} failed."
+    )
+    return 1 if n_failed else 0
+
+
+def _migrate(args: argparse.Namespace) -> int:
+    """
+    Migrates a directory tree of maml files to another version and prints a summary.
+    """
+    start = time.perf_counter()
+    n_changed = n_unchanged = n_failed = 0
+    for result in migrate_tree(args.path, args.to, args.out, args.dry_run, args.workers):
+        if result["error"] is not None:
+            n_failed += 1
+            print(f"FAIL {result['file']}")
+            print(f"     {result['error']}")
+            continue
+        if result["changes"]:
+            n_changed += 1
+        else:
+            n_unchanged += 1
+        if not args.quiet:
+            print(f"OK   {result['file']} ({result['source']} -> {result['target']})")
+            for key, (old, new) in result["changes"].get("changed", {}).items():
+                print(f"     {key}: {old!r} -> {new!r}")
+    elapsed = time.perf_counter() - start
+    action = "Would change" if args.dry_run else "Changed"
+    print(
+        f"{action} {n_changed} of {n_changed + n_unchanged + n_failed} files in "
+        f"{elapsed:.2f}s: {n_unchanged} unchanged, {n_failed} failed."
+    )
+    return 1 if n_failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point for the pymaml command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pymaml", description="Read, write and validate MAML files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser(
+        "validate", help="Validate every .maml file in a directory."
+    )
+    validate.add_argument("path", help="A .maml file or a directory to search.")
+    validate.add_argument(
+        "--version", default=None, help="MAML version to validate against (default: all)."
+    )
+    validate.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    validate.add_argument(
+        "--quiet", action="store_true", help="Only print failures and the summary."
+    )
+    validate.add_argument(
+        "--cache", default=None, help="SQLite file caching results of unchanged files."
+    )
+    validate.set_defaults(func=_validate)
+
+    markdown = commands.add_parser(
+        "markdown", help="Render every .maml file in a directory to markdown."
+    )
+    markdown.add_argument("path", help="A .maml file or a directory to search.")
+    markdown.add_argument(
+        "--out", default=None, help="Directory to write to (default: next to each file)."
+    )
+    markdown.add_argument(
+        "--version", default=None, help="MAML version of the files (default: detected)."
+    )
+    markdown.add_argument(
+        "--compact", action="store_true", help="Render the fields as one compact table."
+    )
+    markdown.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    markdown.add_argument(
+        "--quiet", action="store_true", help="Only print failures and the summary."
+    )
+    markdown.set_defaults(func=_markdown)
+
+    migrate = commands.add_parser(
+        "migrate", help="Migrate every .maml file in a directory to another MAML version."
+    )
+    migrate.add_argument("path", help="A .maml file or a directory to search.")
+    migrate.add_argument("--to", required=True, help="MAML version to migrate to.")
+    migrate.add_argument(
+        "--out", default=None, help="Directory to write to (default: overwrite each file)."
+    )
+    migrate.add_argument(
+        "--dry-run", action="store_true", help="Only report what would change."
+    )
+    migrate.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes."
+    )
+    migrate.add_argument(
+        "--quiet", action="store_true", help="Only print failures and the summary."
+    )
+    migrate.set_defaults(func=_migrate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
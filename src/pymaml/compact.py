@@ -0,0 +1,211 @@
+"""
+Compact, read-only representation of the fields of a maml.
+
+Instead of one pydantic FieldEntry (and QCEntry) per column the values are stored as one
+tuple per key (struct of arrays) with interned strings, so repeated units, ucds and data
+types are only stored once. Keys that are never set take no space at all.
+"""
+
+import sys
+from typing import Iterator
+
+COLUMNS = ("name", "unit", "info", "ucd", "data_type", "array_size")
+QC_COLUMNS = ("min", "max", "miss")
+_KEYS = COLUMNS + tuple(f"qc_{key}" for key in QC_COLUMNS)
+
+
+def _intern(value):
+    """Interns strings (and lists of strings) so that repeated values are shared."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_intern(item) for item in value)
+    return value
+
+
+def _column(values: list) -> tuple | None:
+    """A column of interned values, or None if no value is set."""
+    if all(value is None for value in values):
+        return None
+    return tuple(_intern(value) for value in values)
+
+
+def _json(value):
+    """The json form of a stored value, as model_dump(mode="json") gives it."""
+    return list(value) if isinstance(value, tuple) else value
+
+
+class QCView:
+    """
+    Read-only view of the qc of one field.
+    """
+
+    __slots__ = ("_fields", "_index")
+
+    def __init__(self, fields: "CompactFields", index: int):
+        self._fields = fields
+        self._index = index
+
+    @property
+    def min(self):
+        return self._fields._value("qc_min", self._index)
+
+    @property
+    def max(self):
+        return self._fields._value("qc_max", self._index)
+
+    @property
+    def miss(self):
+        return self._fields._value("qc_miss", self._index)
+
+    def __repr__(self) -> str:
+        return f"QCView(min={self.min!r}, max={self.max!r}, miss={self.miss!r})"
+
+
+class FieldView:
+    """
+    Read-only view of one field with the same attributes as FieldEntry.
+    """
+
+    __slots__ = ("_fields", "_index")
+
+    def __init__(self, fields: "CompactFields", index: int):
+        self._fields = fields
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._fields._value("name", self._index)
+
+    @property
+    def unit(self) -> str | None:
+        return self._fields._value("unit", self._index)
+
+    @property
+    def info(self) -> str | None:
+        return self._fields._value("info", self._index)
+
+    @property
+    def ucd(self) -> str | list[str] | None:
+        return _json(self._fields._value("ucd", self._index))
+
+    @property
+    def data_type(self) -> str:
+        return self._fields._value("data_type", self._index)
+
+    @property
+    def array_size(self) -> int | str | None:
+        return self._fields._value("array_size", self._index)
+
+    @property
+    def qc(self) -> QCView | None:
+        has_qc = self._fields._has_qc
+        if has_qc is None or not has_qc[self._index]:
+            return None
+        return QCView(self._fields, self._index)
+
+    def to_dict(self, include_none: bool = True) -> dict:
+        """
+        Returns the field as a dictionary, the same as FieldEntry.model_dump(mode="json").
+        """
+        return self._fields._field_dict(self._index, include_none)
+
+    def __repr__(self) -> str:
+        return f"FieldView({self.to_dict(include_none=False)!r})"
+
+
+class CompactFields:
+    """
+    The fields of a maml stored column by column. Supports len(), indexing, iteration and
+    lookup by name, and converts back to exactly the dictionaries of the pydantic models.
+    """
+
+    __slots__ = (
+        "_length",
+        "_name",
+        "_unit",
+        "_info",
+        "_ucd",
+        "_data_type",
+        "_array_size",
+        "_has_qc",
+        "_qc_min",
+        "_qc_max",
+        "_qc_miss",
+    )
+
+    def __init__(self, fields: list):
+        """
+        Builds the columns from a list of FieldEntry models or field dictionaries.
+        """
+        rows = [
+            field if isinstance(field, dict) else field.model_dump(mode="json")
+            for field in fields
+        ]
+        self._length = len(rows)
+        for key in COLUMNS:
+            setattr(self, f"_{key}", _column([row.get(key) for row in rows]))
+        qcs = [row.get("qc") for row in rows]
+        self._has_qc = (
+            None if all(qc is None for qc in qcs) else bytes(qc is not None for qc in qcs)
+        )
+        for key in QC_COLUMNS:
+            setattr(self, f"_qc_{key}", _column([qc.get(key) if qc else None for qc in qcs]))
+
+    def _value(self, key: str, index: int):
+        column = getattr(self, f"_{key}")
+        return None if column is None else column[index]
+
+    def column(self, key: str) -> tuple:
+        """
+        Returns every value of a key (e.g. "unit" or "qc_min") as a tuple.
+        """
+        if key not in _KEYS:
+            raise KeyError(key)
+        values = getattr(self, f"_{key}")
+        return (None,) * self._length if values is None else values
+
+    def _field_dict(self, index: int, include_none: bool) -> dict:
+        field = {key: _json(self._value(key, index)) for key in COLUMNS}
+        if self._has_qc is not None and self._has_qc[index]:
+            field["qc"] = {key: self._value(f"qc_{key}", index) for key in QC_COLUMNS}
+        else:
+            field["qc"] = None
+        if not include_none:
+            field = {key: value for key, value in field.items() if value is not None}
+            if "qc" in field:
+                field["qc"] = {
+                    key: value for key, value in field["qc"].items() if value is not None
+                }
+        return field
+
+    def to_dict(self, include_none: bool = True) -> list[dict]:
+        """
+        Returns the fields as the list of dictionaries MAML.to_dict() gives for "fields".
+        """
+        return [self._field_dict(index, include_none) for index in range(self._length)]
+
+    def get(self, name: str) -> FieldView | None:
+        """
+        Returns the first field with the given name, or None.
+        """
+        try:
+            return FieldView(self, self._name.index(name))
+        except (AttributeError, ValueError):
+            return None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> FieldView:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("field index out of range")
+        return FieldView(self, index)
+
+    def __iter__(self) -> Iterator[FieldView]:
+        return (FieldView(self, index) for index in range(self._length))
+
+    def __repr__(self) -> str:
+        return f"CompactFields({self._length} fields)"
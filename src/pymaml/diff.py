@@ -0,0 +1,159 @@
+"""
+Module for finding what changed between two versions of a table's metadata and for
+applying those changes.
+
+Fields are matched by name (through a dictionary, so large tables take linear time), not
+by their position. A patch is a json-compatible dictionary with only the parts that changed:
+
+    {
+        "changed": {key: [old, new]},              # top level keys, None if absent
+        "fields": {
+            "removed": [name, ...],
+            "added": [field, ...],
+            "changed": {name: {attribute: [old, new]}},  # qc bounds as "qc.min" etc.
+            "order": [name, ...],                  # only if the order changed
+        },
+    }
+"""
+
+from typing import Any
+
+
+def _field_names(fields: list[dict], which: str) -> dict[str, dict]:
+    """
+    The fields by name. Names must be unique to be matched.
+    """
+    by_name = {field["name"]: field for field in fields}
+    if len(by_name) != len(fields):
+        raise ValueError(f"The {which} fields have repeated names, so cannot be matched.")
+    return by_name
+
+
+def _flatten(field: dict) -> dict[str, Any]:
+    """
+    The attributes of a field, with those of nested dictionaries (qc) as "qc.min" etc.
+    """
+    flat = {}
+    for key, value in field.items():
+        if isinstance(value, dict):
+            flat.update((f"{key}.{sub_key}", sub_value) for sub_key, sub_value in value.items())
+        else:
+            flat[key] = value
+    return flat
+
+
+def _changes(old: dict, new: dict) -> dict[str, list]:
+    """
+    {key: [old, new]} for every key whose value differs (None for missing or None values).
+    """
+    return {
+        key: [old.get(key), new.get(key)]
+        for key in {**old, **new}
+        if old.get(key) != new.get(key)
+    }
+
+
+def _diff_fields(old: list[dict], new: list[dict]) -> dict:
+    old_names = _field_names(old, "old")
+    new_names = _field_names(new, "new")
+    fields_patch = {
+        "removed": [name for name in old_names if name not in new_names],
+        "added": [field for name, field in new_names.items() if name not in old_names],
+        "changed": {},
+        "order": None,
+    }
+    for name, field in new_names.items():
+        old_field = old_names.get(name)
+        if old_field is not None and old_field != field:
+            changes = _changes(_flatten(old_field), _flatten(field))
+            if changes:  # not only None values left out on one side
+                fields_patch["changed"][name] = changes
+    kept = [name for name in old_names if name in new_names]
+    patched_order = kept + [field["name"] for field in fields_patch["added"]]
+    if patched_order != list(new_names):
+        fields_patch["order"] = list(new_names)
+    return {key: value for key, value in fields_patch.items() if value}
+
+
+def make_patch(old: dict, new: dict) -> dict:
+    """
+    Returns the patch turning one maml dictionary (as MAML.to_dict gives) into another.
+    An empty dictionary means there is no difference.
+    """
+    patch = {}
+    changed = _changes(
+        {key: value for key, value in old.items() if key != "fields"},
+        {key: value for key, value in new.items() if key != "fields"},
+    )
+    if changed:
+        patch["changed"] = changed
+    fields_patch = _diff_fields(old.get("fields") or [], new.get("fields") or [])
+    if fields_patch:
+        patch["fields"] = fields_patch
+    return patch
+
+
+def _apply_field_changes(field: dict, changes: dict, name: str, conflicts: list) -> dict:
+    field = {
+        key: dict(value) if isinstance(value, dict) else value for key, value in field.items()
+    }
+    for attribute, (old, new) in changes.items():
+        key, _, sub_key = attribute.partition(".")
+        if sub_key:
+            target = field[key] = field.get(key) or {}
+        else:
+            target = field
+        current_key = sub_key or key
+        if target.get(current_key) != old:
+            conflicts.append(f"fields.{name}.{attribute}")
+        if new is None:
+            target.pop(current_key, None)
+        else:
+            target[current_key] = new
+        if sub_key and not target:
+            del field[key]
+    return field
+
+
+def apply_patch(data: dict, patch: dict, strict: bool = True) -> dict:
+    """
+    Returns a new maml dictionary with the patch applied (values the patch does not touch
+    are shared with `data`). With strict, a ValueError is raised if the dictionary does not
+    hold the old values the patch was made from.
+    """
+    conflicts = []
+    patched = dict(data)
+    for key, (old, new) in patch.get("changed", {}).items():
+        if patched.get(key) != old:
+            conflicts.append(key)
+        if new is None:
+            patched.pop(key, None)
+        else:
+            patched[key] = new
+
+    fields_patch = patch.get("fields")
+    if fields_patch:
+        fields = _field_names(data.get("fields") or [], "patched")
+        for name in fields_patch.get("removed", []):
+            if fields.pop(name, None) is None:
+                conflicts.append(f"fields.{name}")
+        for name, changes in fields_patch.get("changed", {}).items():
+            if name not in fields:
+                conflicts.append(f"fields.{name}")
+                continue
+            fields[name] = _apply_field_changes(fields[name], changes, name, conflicts)
+        for field in fields_patch.get("added", []):
+            if field["name"] in fields:
+                conflicts.append(f"fields.{field['name']}")
+            fields[field["name"]] = field
+        order = fields_patch.get("order")
+        if order is not None:
+            if set(order) != set(fields):
+                conflicts.append("fields order")
+            else:
+                fields = {name: fields[name] for name in order}
+        patched["fields"] = list(fields.values())
+
+    if strict and conflicts:
+        raise ValueError(f"Patch does not apply cleanly at: {', '.join(conflicts)}")
+    return patched
@@ -0,0 +1,78 @@
+"""
+Helper module mapping pandas, polars and arrow data types to maml data types.
+"""
+
+# Keys are normalised dtype names (see normalize_dtype). Extend or copy this to customise.
+DTYPE_MAP = {
+    "int8": "int8",
+    "int16": "int16",
+    "int32": "int32",
+    "int64": "int64",
+    "uint8": "uint8",
+    "uint16": "uint16",
+    "uint32": "uint32",
+    "uint64": "uint64",
+    "float16": "float16",
+    "halffloat": "float16",
+    "float32": "float32",
+    "float": "float32",
+    "float64": "float64",
+    "double": "float64",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "object": "string",
+    "str": "string",
+    "string": "string",
+    "utf8": "string",
+    "large_string": "string",
+    "large_utf8": "string",
+    "category": "string",
+    "categorical": "string",
+    "enum": "string",
+    "date": "date",
+    "date32": "date",
+    "date64": "date",
+    "datetime": "datetime",
+    "datetime64": "datetime",
+    "timestamp": "datetime",
+    "time": "time",
+    "time32": "time",
+    "time64": "time",
+    "duration": "duration",
+    "timedelta64": "duration",
+}
+
+
+def normalize_dtype(dtype) -> str:
+    """
+    Returns the lower case name of a dtype without its parameters.
+    e.g. "datetime64[ns, UTC]" -> "datetime64", Datetime(time_unit='us') -> "datetime".
+    """
+    name = str(dtype).lower()
+    for separator in ("[", "("):
+        name = name.split(separator, 1)[0]
+    return name.strip()
+
+
+def maml_data_type(dtype, dtype_map: dict[str, str] | None = None) -> str:
+    """
+    Returns the maml data type of a pandas, polars or arrow dtype.
+    Unknown dtypes are returned as their string representation.
+    """
+    if dtype_map is None:
+        dtype_map = DTYPE_MAP
+    return dtype_map.get(normalize_dtype(dtype), str(dtype))
+
+
+def fields_from_dtypes(
+    names: list[str], dtypes: list, dtype_map: dict[str, str] | None = None
+) -> list[dict]:
+    """
+    Builds the maml fields entries for a list of column names and dtypes in one pass.
+    """
+    if dtype_map is None:
+        dtype_map = DTYPE_MAP
+    return [
+        {"name": name, "data_type": maml_data_type(dtype, dtype_map)}
+        for name, dtype in zip(names, dtypes)
+    ]
@@ -0,0 +1,59 @@
+"""
+Helper module for looking up fields by name or by UCD word in constant time.
+"""
+
+from .ucd_funcs import join_ucd
+
+
+def ucd_words(ucd) -> list[str]:
+    """
+    Returns the lower case words of a UCD string or list, e.g. ["pos.eq.ra", "meta.main"].
+    """
+    ucd_string = join_ucd(ucd)
+    if not ucd_string:
+        return []
+    return [word.strip().lower() for word in ucd_string.split(";") if word.strip()]
+
+
+class FieldIndex:
+    """
+    Lazily built name -> position and UCD word -> positions maps of a list of fields.
+    An index belongs to one list object of a given length; see matches.
+    """
+
+    __slots__ = ("fields", "length", "_names", "_ucds")
+
+    def __init__(self, fields: list):
+        self.fields = fields
+        self.length = len(fields)
+        self._names: dict[str, int] | None = None
+        self._ucds: dict[str, list[int]] | None = None
+
+    def matches(self, fields: list) -> bool:
+        """
+        True if the index was built for this list and nothing was added or removed since.
+        """
+        return fields is self.fields and len(fields) == self.length
+
+    def names(self) -> dict[str, int]:
+        """
+        Position of every field name (the first, if names repeat).
+        """
+        if self._names is None:
+            names = {}
+            for position, field in enumerate(self.fields):
+                names.setdefault(field.name, position)
+            self._names = names
+        return self._names
+
+    def ucds(self) -> dict[str, list[int]]:
+        """
+        Positions of the fields using every (lower case) UCD word.
+        """
+        if self._ucds is None:
+            ucds = {}
+            for position, field in enumerate(self.fields):
+                for word in dict.fromkeys(ucd_words(field.ucd)):
+                    ucds.setdefault(word, []).append(position)
+            self._ucds = ucds
+        return self._ucds
@@ -0,0 +1,129 @@
+"""
+Opt-in timing of the stages of loading, validating and writing maml.
+
+Inside `with collect_timings() as timings:` every stage run by this thread or task (and
+by the async api's executor) adds its duration to `timings`, along with counts of the
+files, fields and UCDs processed. Outside of it each stage costs a single context
+variable lookup.
+
+Stages: read (yaml parsing), order (key order check), validate (pydantic, which includes
+ucd), ucd (astropy checks of UCDs not yet in the cache), dump (to yaml), write (to file)
+and markdown.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Iterator
+
+_current: ContextVar["Timings | None"] = ContextVar("pymaml_timings", default=None)
+_DISABLED = nullcontext()
+
+
+class Timings:
+    """
+    Total duration, number of calls and longest call of every stage, and item counts.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, list] = {}  # name: [calls, total seconds, max seconds]
+        self.counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Adds one call of a stage."""
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                self.stages[name] = [1, seconds, seconds]
+            else:
+                stage[0] += 1
+                stage[1] += seconds
+                if seconds > stage[2]:
+                    stage[2] = seconds
+
+    def add(self, name: str, n: int = 1) -> None:
+        """Adds to an item count."""
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def to_dict(self) -> dict:
+        """
+        Returns {"stages": {name: {"calls", "seconds", "max_seconds"}}, "counts": {name: n}}.
+        """
+        with self._lock:
+            return {
+                "stages": {
+                    name: {"calls": calls, "seconds": total, "max_seconds": longest}
+                    for name, (calls, total, longest) in self.stages.items()
+                },
+                "counts": dict(self.counts),
+            }
+
+    def to_prometheus(self, prefix: str = "pymaml") -> str:
+        """
+        Returns the timings in the Prometheus text exposition format.
+        """
+        data = self.to_dict()
+        lines = [f"# TYPE {prefix}_stage_seconds_total counter"]
+        lines += [
+            f'{prefix}_stage_seconds_total{{stage="{name}"}} {stage["seconds"]!r}'
+            for name, stage in data["stages"].items()
+        ]
+        lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+        lines += [
+            f'{prefix}_stage_calls_total{{stage="{name}"}} {stage["calls"]}'
+            for name, stage in data["stages"].items()
+        ]
+        lines.append(f"# TYPE {prefix}_items_total counter")
+        lines += [
+            f'{prefix}_items_total{{item="{name}"}} {n}' for name, n in data["counts"].items()
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class _Stage:
+    __slots__ = ("_timings", "_name", "_start")
+
+    def __init__(self, timings: Timings, name: str):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self._timings.record(self._name, time.perf_counter() - self._start)
+
+
+def stage(name: str):
+    """
+    Context manager timing a stage when timings are being collected.
+    """
+    timings = _current.get()
+    return _DISABLED if timings is None else _Stage(timings, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Adds n to an item count when timings are being collected.
+    """
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, n)
+
+
+@contextmanager
+def collect_timings(timings: Timings | None = None) -> Iterator[Timings]:
+    """
+    Collects the timings of everything run inside the block. Pass a Timings to keep
+    adding to it (e.g. one per process for a metrics endpoint).
+    """
+    if timings is None:
+        timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
@@ -2,18 +2,50 @@
 Main maml object.
 """
 
+import copy
 import os
 import warnings
+from functools import cache
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, NamedTuple
 
 import yaml
-from yaml import SafeDumper
+from pydantic import BaseModel, ValidationError
 
-import pandas as pd
-import polars as pl
-from yaml_to_markdown.md_converter import MDConverter
+from .compact import CompactFields
+from .dtypes import fields_from_dtypes
+from .field_index import FieldIndex, ucd_words
+from .instrument import count, stage
+from .read import iter_maml_documents, read_maml, read_maml_buffer
+from .parse import (
+    MODELS,
+    _assert_mapping,
+    _assert_version,
+    _key_adapters,
+    detect_version,
+    order_error,
+)
 
-from .read import read_maml
-from .parse import MODELS, _assert_version, check_order
+if TYPE_CHECKING:  # only needed for type hints; imported lazily where they are used.
+    from concurrent.futures import Executor
+
+    from .model_v1p1 import FieldEntry
+
+    import pandas as pd
+    import polars as pl
+    import pyarrow as pa
+
+
+class MAMLDumper(yaml.SafeDumper):
+    """
+    Safe dumper writing None as an empty value. Subclassed so the global SafeDumper is untouched.
+    Not based on CSafeDumper, as libyaml wraps long quoted scalars differently.
+    """
+
+
+MAMLDumper.add_representer(
+    type(None),
+    lambda dumper, _: dumper.represent_scalar("tag:yaml.org,2002:null", ""),
+)
 
 
 def _remove_nones(obj):
@@ -35,63 +67,385 @@ class MAML:
         """
         _assert_version(version)
         self.version = version
-        self.meta = MODELS[version](**data)
+        fields = data.get("fields")
+        count("fields", len(fields) if isinstance(fields, list) else 0)
+        with stage("validate"):
+            self.meta = MODELS[version](**data)
 
     @classmethod
-    def from_file(cls, file_name: str, version: str) -> "MAML":
+    def _from_meta(cls, meta, version: str) -> "MAML":
+        """
+        Wraps an already validated model without validating it again.
+        """
+        maml = cls.__new__(cls)
+        maml.version = version
+        maml.meta = meta
+        return maml
+
+    @classmethod
+    def from_file(cls, file_name: str, version: str | None = None) -> "MAML":
         """
         Creates a new maml object from file. Checks that order of keys is in the correct order.
+        Without a version, the version is detected from the file (see parse.detect_version).
         """
-        _assert_version(version)
-        data = read_maml(file_name)
-        if not check_order(data, version):
+        if version is not None:
+            _assert_version(version)
+        return cls._from_data(read_maml(file_name), version)
+
+    @classmethod
+    def from_buffer(cls, buffer, version: str | None = None) -> "MAML":
+        """
+        Creates a new maml object from maml already in memory (bytes, memoryview, mmap or a
+        file-like object, see read.read_maml_buffer). Otherwise the same as from_file.
+        """
+        if version is not None:
+            _assert_version(version)
+        return cls._from_data(read_maml_buffer(buffer), version)
+
+    @classmethod
+    def from_parquet(cls, file_name: str, version: str | None = None) -> "MAML":
+        """
+        Creates a new maml object from the metadata of a parquet file, reading only the footer.
+        """
+        from .parquet import read_parquet_metadata
+
+        return cls.from_parquet_metadata(read_parquet_metadata(file_name), version)
+
+    @classmethod
+    def from_parquet_metadata(cls, metadata: dict, version: str | None = None) -> "MAML":
+        """
+        Creates a new maml object from parquet/arrow key-value metadata (e.g. the result of
+        polars.read_parquet_metadata or a pyarrow Schema.metadata).
+        """
+        from .parquet import METADATA_KEY, maml_text
+
+        text = maml_text(metadata)
+        if text is None:
+            raise ValueError(f"No '{METADATA_KEY}' key in the metadata.")
+        return cls.from_buffer(text, version)
+
+    @classmethod
+    def _from_data(cls, data: dict, version: str | None) -> "MAML":
+        """
+        Validates read in data, detecting the version if needed and warning for bad ordering.
+        """
+        _assert_mapping(data)
+        if version is None:
+            version = detect_version(data)
+        out_of_order = order_error(data, version)
+        if out_of_order is not None:
             warnings.warn(
-                "Ordering is not correct. See (https://github.com/asgr/MAML-Format)"
+                f"Ordering is not correct at '{out_of_order}'. "
+                "See (https://github.com/asgr/MAML-Format)"
             )
         return cls(data, version)
 
+    @classmethod
+    async def afrom_file(
+        cls, file_name: str, version: str | None = None, executor: "Executor | None" = None
+    ) -> "MAML":
+        """
+        Async version of from_file. Reading and validating run in the executor
+        (default: see aio.set_default_executor) so the event loop is not blocked.
+        """
+        from .aio import run
+
+        return await run(cls.from_file, file_name, version, executor=executor)
+
     def to_dict(self, include_none: bool = True) -> dict:
         """
         Returns dictionary represenation of the model base class.
         """
-        raw = self.meta.model_dump(mode="json")
-        if not include_none:
-            return _remove_nones(raw)
+        if include_none:
+            return self.meta.model_dump(mode="json")
+        raw = self.meta.model_dump(mode="json", exclude_none=True)
+        if "extra" in raw:  # free form, so may hold Nones inside lists and dicts
+            raw["extra"] = _remove_nones(raw["extra"])
         return raw
 
-    def to_file(self, file_name: str, include_none: bool = False) -> dict:
+    def compact_fields(self) -> CompactFields:
         """
-        Creates a dictionary representation of the base model.
+        Returns a compact, read-only copy of the fields (see compact.CompactFields).
+        """
+        return CompactFields(self.meta.fields)
+
+    def _field_index(self) -> FieldIndex:
+        """
+        The cached index of meta.fields, rebuilt if meta or its fields list was replaced or
+        fields were added or removed.
+        """
+        fields = self.meta.fields
+        index = self.__dict__.get("_index")
+        if index is None or not index.matches(fields):
+            index = self._index = FieldIndex(fields)
+        return index
+
+    def invalidate_field_index(self) -> None:
         """
-        SafeDumper.add_representer(
-            type(None),
-            lambda dumper, _: dumper.represent_scalar("tag:yaml.org,2002:null", ""),
+        Drops the cached field index. Only needed after renaming fields or changing their
+        ucds in place; replacing meta or adding and removing fields is noticed.
+        """
+        self.__dict__.pop("_index", None)
+
+    def _lookup(self, name: str):
+        index = self._field_index()
+        position = index.names().get(name)
+        if position is None:
+            return None
+        field = index.fields[position]
+        if field.name != name:  # swapped or renamed in place
+            self.invalidate_field_index()
+            return self._lookup(name)
+        return field
+
+    def field(self, name: str) -> "FieldEntry":
+        """
+        Returns the field with the given name in constant time. Raises KeyError if missing.
+        """
+        field = self._lookup(name)
+        if field is None:
+            raise KeyError(name)
+        return field
+
+    def select(self, names: Iterable[str]) -> list["FieldEntry"]:
+        """
+        Returns the fields with the given names, in that order. Raises KeyError listing
+        every missing name.
+        """
+        fields = [(name, self._lookup(name)) for name in names]
+        missing = [name for name, field in fields if field is None]
+        if missing:
+            raise KeyError(f"Fields not found: {missing}")
+        return [field for _, field in fields]
+
+    def fields_with_ucd(self, word: str) -> list["FieldEntry"]:
+        """
+        Returns the fields whose ucd contains the given word (e.g. "pos.eq.ra"; case is
+        ignored), in field order.
+        """
+        word = word.strip().lower()
+        index = self._field_index()
+        fields = [index.fields[position] for position in index.ucds().get(word, ())]
+        if not all(word in ucd_words(field.ucd) for field in fields):  # changed in place
+            self.invalidate_field_index()
+            index = self._field_index()
+            fields = [index.fields[position] for position in index.ucds().get(word, ())]
+        return fields
+
+    def to_yaml(self, include_none: bool = False) -> str:
+        """
+        Returns the maml as a yaml string.
+        """
+        return yaml.dump(
+            self.to_dict(include_none),
+            Dumper=MAMLDumper,
+            sort_keys=False,
+            default_flow_style=False,
         )
+
+    def to_file(self, file_name: str, include_none: bool = False) -> None:
+        """
+        Writes the maml to a .maml file.
+        """
         root, ext = os.path.splitext(file_name)
         if ext != ".maml":
             raise ValueError(f"Extension '{ext}' is not a valid maml extension.")
-        with open(f"{root}.maml", "w", encoding="utf8") as file:
-            yaml.safe_dump(
-                self.to_dict(include_none),
-                file,
-                sort_keys=False,
-                default_flow_style=False,
-            )
+        with stage("dump"):
+            text = self.to_yaml(include_none)
+        with stage("write"), open(f"{root}.maml", "w", encoding="utf8") as file:
+            file.write(text)
+
+    async def ato_file(
+        self, file_name: str, include_none: bool = False, executor: "Executor | None" = None
+    ) -> None:
+        """
+        Async version of to_file, writing in the executor.
+        """
+        from .aio import run
+
+        await run(self.to_file, file_name, include_none, executor=executor)
+
+    def to_parquet_metadata(self, include_none: bool = False) -> dict[str, str]:
+        """
+        Returns the maml as key-value metadata for a parquet file or arrow schema, e.g.
+        frame.write_parquet(file_name, metadata=maml.to_parquet_metadata()) with polars.
+        """
+        from .parquet import METADATA_KEY
+
+        return {METADATA_KEY: self.to_yaml(include_none)}
+
+    def to_markdown(self, outfile: str, compact: bool = False) -> None:
+        """
+        Dumps the maml as a markdown file. The default layout is the same as yaml_to_markdown's;
+        compact renders the fields as one table with the qc in columns (see markdown.py).
+        """
+        from .markdown import render_markdown
+
+        with stage("markdown"):
+            data = self.to_dict(include_none=not compact)
+            with open(outfile, "w", encoding="utf8") as f:
+                render_markdown(data, f, compact)
+
+    async def ato_markdown(
+        self, outfile: str, compact: bool = False, executor: "Executor | None" = None
+    ) -> None:
+        """
+        Async version of to_markdown, converting and writing in the executor.
+        """
+        from .aio import run
+
+        await run(self.to_markdown, outfile, compact, executor=executor)
+
+    def diff(self, other: "MAML") -> dict:
+        """
+        Returns the patch turning this maml into the other, matching fields by name.
+        See diff.make_patch for the format.
+        """
+        from .diff import make_patch
+
+        return make_patch(self.to_dict(include_none=False), other.to_dict(include_none=False))
+
+    def patch(self, patch: dict, strict: bool = True) -> "MAML":
+        """
+        Returns a new maml with the patch (from diff) applied and validated again. With
+        strict, a ValueError is raised if this maml does not hold the values it was made from.
+        """
+        from .diff import apply_patch
+
+        return MAML(apply_patch(self.to_dict(include_none=False), patch, strict), self.version)
+
+    def migrate(self, version: str) -> "MAML":
+        """
+        Returns the maml migrated to another version of the schema and validated against it
+        (see migrate.register_step).
+        """
+        from .migrate import migrate
+
+        return migrate(self, version)
 
-    def to_markdown(self, outfile: str) -> None:
+    def validate_data(self, data, sample_size: int = 5) -> dict[str, dict]:
         """
-        Dumps the maml as a markdown file.
+        Checks a table (pandas/polars frame, polars lazyframe, parquet/csv file name or an
+        iterable of frame chunks) against the data_type, array_size and qc of every field.
+        See qc.validate_data for the returned counts.
         """
-        data = self.to_dict()
-        converter = MDConverter()
-        with open(outfile, "w", encoding="utf8") as f:
-            converter.convert(data, f)
+        from .qc import validate_data
+
+        return validate_data(self.meta.fields, data, sample_size)
 
     def __str__(self) -> str:
         data = self.meta.model_dump(mode="json")
         return f"MAML(version = {self.version}, metadata = {data})"
 
 
+class MAMLDocument(NamedTuple):
+    """
+    A single validated document of a multi-document maml stream and where it was found.
+    """
+
+    index: int
+    line: int
+    offset: int
+    maml: MAML
+
+
+def iter_maml(source: str | IO, version: str) -> Iterator[MAMLDocument]:
+    """
+    Lazily reads and validates every document of a multi-document maml file or stream.
+    Validation errors are annotated with the index, line and byte offset of the failing document.
+    """
+    _assert_version(version)
+    for index, line, offset, data in iter_maml_documents(source):
+        try:
+            maml = MAML(data, version)
+        except ValidationError as exc:
+            exc.add_note(f"In document {index} (line {line}, byte offset {offset}).")
+            raise
+        yield MAMLDocument(index, line, offset, maml)
+
+
+_INVALID = object()
+
+
+class _FrozenList(list):
+    """
+    A list inside an entry shared between built mamls, which refuses to be changed in place.
+    Copies and pickles are ordinary lists.
+    """
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("Entries of a built maml are shared, assign a new list instead.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _refuse
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _thaw(model_cls: type[BaseModel], values: dict, fields_set: set) -> BaseModel:
+    return model_cls.model_construct(fields_set, **values)
+
+
+@cache
+def _frozen_model(model_cls: type[BaseModel]) -> type[BaseModel]:
+    """
+    A frozen subclass of an entry model, equal to the model it is made from. Copies (e.g.
+    model_copy) and pickles are ordinary models, which can be changed.
+    """
+
+    def __eq__(self, other):
+        if not isinstance(other, model_cls):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    def __copy__(self):
+        return _thaw(model_cls, dict(self.__dict__), set(self.model_fields_set))
+
+    def __deepcopy__(self, memo=None):
+        values = copy.deepcopy(self.__dict__, memo)
+        return _thaw(model_cls, values, set(self.model_fields_set))
+
+    def __reduce__(self):
+        return _thaw, (model_cls, self.__dict__, self.model_fields_set)
+
+    namespace = {
+        "__module__": model_cls.__module__,
+        "__qualname__": model_cls.__qualname__,
+        "model_config": {**model_cls.model_config, "frozen": True},
+        "__eq__": __eq__,
+        "__hash__": None,
+        "__copy__": __copy__,
+        "__deepcopy__": __deepcopy__,
+        "__reduce__": __reduce__,
+    }
+    return type(model_cls.__name__, (model_cls,), namespace)
+
+
+def _freeze(value):
+    """
+    Validated entries are frozen once, so every build can share them.
+    """
+    if isinstance(value, BaseModel):
+        values = {key: _freeze(item) for key, item in value.__dict__.items()}
+        return _frozen_model(type(value)).model_construct(value.model_fields_set, **values)
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _own(part):
+    """
+    The copy of a validated part given to one build: lists are shallow copies of shared
+    frozen entries, dictionaries (extra) are copied whole.
+    """
+    if isinstance(part, list):
+        return list(part)
+    if isinstance(part, dict):
+        return copy.deepcopy(part)
+    return part
+
+
 class MAMLBuilder:
     """
     Builder pattern for constructing the MAML format based on whatever version is decided.
@@ -104,35 +458,83 @@ class MAMLBuilder:
         _assert_version(version)
         self.version: str = version
         self._model_cls = MODELS[version]
+        # Validated value of every key, or _INVALID. build() only has to assemble these.
+        # Entries are frozen, so builds only need their own copies of the lists.
+        self._parts: dict = {}
         if defaults:
             self._data = self._model_cls.with_defaults().model_dump(mode="json")
+            for field in self._data:
+                self._validate_key(field)
         elif not defaults:
             self._data: dict = {}
         else:
             raise ValueError("defaults must be True or False")
 
+    def _validate_key(self, field: str) -> None:
+        """
+        Validates the whole value of a key. Invalid values are only reported by build().
+        """
+        value = self._data[field]
+        adapters = _key_adapters(self._model_cls).get(field)
+        if adapters is None or value is None:  # unknown keys and explicit Nones are rejected
+            self._parts[field] = _INVALID
+            return
+        try:
+            validated = adapters[0].validate_python(value)
+        except ValidationError:
+            self._parts[field] = _INVALID
+            return
+        if isinstance(validated, list):
+            self._parts[field] = [_freeze(item) for item in validated]
+        else:
+            self._parts[field] = _freeze(validated)
+
+    def _validate_items(self, field: str, values: list) -> None:
+        """
+        Validates values that were just appended to the list of a key.
+        """
+        current = self._parts.get(field)
+        if current is _INVALID:
+            return  # appending can't fix an invalid list
+        item_adapter = _key_adapters(self._model_cls).get(field, (None, None))[1]
+        if not isinstance(current, list) or item_adapter is None:
+            self._validate_key(field)
+            return
+        try:
+            current.extend([_freeze(item_adapter.validate_python(value)) for value in values])
+        except ValidationError:
+            self._parts[field] = _INVALID
+
     def set(self, field: str, value):
         """
         For setting scalar values
         """
-        self._data[field] = value
+        self._data[field] = copy.deepcopy(value)
+        self._validate_key(field)
         return self
 
     def add(self, field: str, value):
         """
         For adding vector values
         """
-        try:
-            self._data.setdefault(field, []).append(value)
-        except AttributeError:
-            self._data[field] = [value]
-        return self
+        return self._extend(field, [copy.deepcopy(value)])
 
     def build(self):
         """
-        Attempts to build the class for the current version
+        Attempts to build the class for the current version.
+        Only the validated parts are assembled if everything is valid. Otherwise the whole
+        document is validated so that the errors are reported. Built mamls have their own
+        lists, and share entries (e.g. fields) that are frozen.
         """
-        return MAML(self._data, self.version)
+        required = self._model_cls.model_fields
+        if _INVALID in self._parts.values() or any(
+            field.is_required() and name not in self._parts for name, field in required.items()
+        ):
+            return MAML(self._data, self.version)
+        meta = self._model_cls.model_construct(
+            **{name: _own(part) for name, part in self._parts.items()}
+        )
+        return MAML._from_meta(meta, self.version)
 
     def __str__(self) -> str:
         """
@@ -147,22 +549,113 @@ class MAMLBuilder:
         all_values = self._model_cls.with_defaults().model_dump(mode="json").keys()
         return list(all_values)
 
-    def fields_from_pandas(self, pandas_dataframe: pd.DataFrame) -> "MAMLBuilder":
+    def _extend(self, field: str, values: list):
         """
-        Fills in the fields from a pandas dataframe using the column names and types.
+        For adding many vector values at once. The values are kept, so must not be the caller's.
         """
-        field_names = list(pandas_dataframe.columns)
-        data_types = [str(dtype) for dtype in list(pandas_dataframe.dtypes)]
-        for field_name, dtype in zip(field_names, data_types):
-            self.add("fields", {"name": field_name, "data_type": dtype})
+        try:
+            self._data.setdefault(field, []).extend(values)
+        except AttributeError:
+            self._data[field] = list(values)
+            self._validate_key(field)
+        else:
+            self._validate_items(field, values)
         return self
 
-    def fields_from_polars(self, polars_dataframe: pl.DataFrame) -> "MAMLBuilder":
+    def fields_from_pandas(
+        self,
+        pandas_dataframe: "pd.DataFrame",
+        dtype_map: dict[str, str] | None = None,
+        infer_qc: bool = False,
+    ) -> "MAMLBuilder":
         """
-        Fills in the fields from a polars dataframe using the column names and types.
+        Fills in the fields from a pandas dataframe using the column names and types.
+        Types are converted with dtype_map (default: dtypes.DTYPE_MAP). If infer_qc is True
+        the qc min/max of every numeric column is found with one vectorized reduction each.
         """
-        field_names = list(polars_dataframe.columns)
-        data_types = [str(dtype) for dtype in list(polars_dataframe.dtypes)]
-        for field_name, dtype in zip(field_names, data_types):
-            self.add("fields", {"name": field_name, "data_type": dtype})
-        return self
+        from pandas import isna
+        from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+        dtypes = list(pandas_dataframe.dtypes)
+        fields = fields_from_dtypes(list(pandas_dataframe.columns), dtypes, dtype_map)
+        if infer_qc:
+            positions = [
+                i
+                for i, dtype in enumerate(dtypes)
+                if is_numeric_dtype(dtype) and not is_bool_dtype(dtype)
+            ]
+            numeric = pandas_dataframe.iloc[:, positions]
+            # pd.NA (all missing nullable columns) can't be compared, so it becomes None.
+            minimums = [None if isna(value) else value for value in numeric.min().tolist()]
+            maximums = [None if isna(value) else value for value in numeric.max().tolist()]
+            _set_qc(fields, positions, minimums, maximums)
+        return self._extend("fields", fields)
+
+    def fields_from_polars(
+        self,
+        polars_dataframe: "pl.DataFrame | pl.LazyFrame",
+        dtype_map: dict[str, str] | None = None,
+        infer_qc: bool = False,
+    ) -> "MAMLBuilder":
+        """
+        Fills in the fields from a polars dataframe or lazyframe using the column names and types.
+        Only the schema is read unless infer_qc is True, in which case the qc min/max of every
+        numeric column is computed in a single aggregation.
+        """
+        import polars as pl
+
+        schema = polars_dataframe.collect_schema()
+        names, dtypes = schema.names(), schema.dtypes()
+        fields = fields_from_dtypes(names, dtypes, dtype_map)
+        if infer_qc:
+            positions = [i for i, dtype in enumerate(dtypes) if dtype.is_numeric()]
+            bounds = (
+                polars_dataframe.lazy()
+                .select(
+                    [pl.col(names[i]).min().alias(f"min_{i}") for i in positions]
+                    + [pl.col(names[i]).max().alias(f"max_{i}") for i in positions]
+                )
+                .collect()
+                .row(0)
+                if positions
+                else ()
+            )
+            _set_qc(fields, positions, bounds[: len(positions)], bounds[len(positions) :])
+        return self._extend("fields", fields)
+
+    def fields_from_parquet(
+        self,
+        file_name: str,
+        dtype_map: dict[str, str] | None = None,
+        infer_qc: bool = False,
+    ) -> "MAMLBuilder":
+        """
+        Fills in the fields from the schema of a parquet file (see fields_from_polars).
+        Only the footer is read unless infer_qc is True.
+        """
+        import polars as pl
+
+        return self.fields_from_polars(pl.scan_parquet(file_name), dtype_map, infer_qc)
+
+    def fields_from_arrow(
+        self, arrow_schema: "pa.Schema", dtype_map: dict[str, str] | None = None
+    ) -> "MAMLBuilder":
+        """
+        Fills in the fields from a pyarrow schema (e.g. of a parquet file) without reading any data.
+        """
+        fields = fields_from_dtypes(arrow_schema.names, arrow_schema.types, dtype_map)
+        return self._extend("fields", fields)
+
+
+def _set_qc(fields: list[dict], positions: list[int], minimums, maximums) -> None:
+    """
+    Sets the qc min/max of the fields at the given positions, skipping missing values.
+    """
+    for position, minimum, maximum in zip(positions, minimums, maximums):
+        qc = {
+            key: value
+            for key, value in (("min", minimum), ("max", maximum))
+            if value is not None and value == value  # NaN is missing
+        }
+        if qc:
+            fields[position]["qc"] = qc
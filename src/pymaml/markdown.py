@@ -0,0 +1,215 @@
+"""
+Markdown rendering of maml written for the maml schema.
+
+The default layout reproduces yaml_to_markdown's MDConverter output exactly (including
+its link and image detection), but writes straight to the stream. The compact layout
+renders the fields as one table with the qc split into columns, skips empty columns and
+escapes table cells.
+"""
+
+from typing import IO, Any, Iterator
+
+import yaml
+
+from .batch import _find_files, _output_path
+from .ucd_funcs import join_ucd
+
+_IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "svg"}
+_FIELD_COLUMNS = ("name", "unit", "info", "ucd", "data_type", "array_size", "min", "max", "miss")
+
+
+def _title(key: str) -> str:
+    return " ".join(key.split("-")).title()
+
+
+def _value(key: str, value: Any, level: int) -> str:
+    """A scalar (with its heading if level > 0) or a table cell (level -1)."""
+    if isinstance(value, list):
+        return "<ul>" + "".join(f"<li>{item}</li>" for item in value) + "</ul>"
+    text = str(value)
+    prefix = "\n" if level > 0 else ""
+    _, dot, extension = text.rpartition(".")
+    if extension.lower() in _IMAGE_EXTENSIONS:
+        return f"{prefix}![{_title(key)}]({text})"
+    lower = text.lower()
+    if (dot and len(extension) in (3, 4) and "\n" not in text) or lower.startswith(
+        ("http", "./", "/")
+    ):
+        return f"{prefix}[{_title(key)}]({text})"
+    text = text.replace("\n", "<br/>")
+    if level > 0:
+        return f"{'#' * level} {_title(key)}\n{text}"
+    return text
+
+
+def _columns(rows: list[dict]) -> list[str]:
+    columns = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return list(columns)
+
+
+def _table(stream: IO[str], rows: list[dict]) -> None:
+    columns = _columns(rows)
+    stream.write(f"| {' | '.join(_title(column) for column in columns)} |\n")
+    stream.write(f"| {' | '.join('---' for _ in columns)} |")
+    # Cells only depend on the column and the text, and most columns repeat their values.
+    caches = [{} for _ in columns]
+    for row in rows:
+        cells = []
+        for column, cache in zip(columns, caches):
+            value = row.get(column, "")
+            if isinstance(value, list):
+                cells.append(_value(column, value, -1))
+                continue
+            text = value if type(value) is str else str(value)
+            cell = cache.get(text)
+            if cell is None:
+                cell = cache[text] = _value(column, text, -1)
+            cells.append(cell)
+        stream.write(f"\n| {' | '.join(cells)} |")
+
+
+def _list(stream: IO[str], items: list) -> None:
+    if not items:
+        return  # MDConverter fails on empty lists; render an empty section instead.
+    if isinstance(items[0], dict):
+        _table(stream, items)
+    elif isinstance(items[0], list):
+        for item in items:
+            _list(stream, item)
+            stream.write("\n")
+    else:
+        stream.write("\n".join(f"* {item}" for item in items))
+
+
+def _section(stream: IO[str], key: str, value: Any, level: int) -> None:
+    if isinstance(value, list):
+        stream.write(f"{'#' * level} {_title(key)}\n")
+        _list(stream, value)
+    elif isinstance(value, dict):
+        stream.write(f"{'#' * level} {_title(key)}\n")
+        for sub_key, sub_value in value.items():
+            _section(stream, sub_key, sub_value, level + 1)
+    else:
+        stream.write(_value(key, value, level))
+    stream.write("\n")
+
+
+def _cell(value: Any) -> str:
+    """A compact table cell: lists joined, pipes escaped and no line breaks."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = ", ".join(str(item) for item in value)
+    return str(value).replace("|", "\\|").replace("\n", "<br/>")
+
+
+def _compact_table(stream: IO[str], rows: list[dict], order: tuple = ()) -> None:
+    columns = [c for c in _columns(rows) if any(row.get(c) is not None for row in rows)]
+    columns.sort(key=lambda column: order.index(column) if column in order else len(order))
+    stream.write(f"| {' | '.join(_title(column) for column in columns)} |\n")
+    stream.write(f"| {' | '.join('---' for _ in columns)} |\n")
+    for row in rows:
+        stream.write(f"| {' | '.join(_cell(row.get(column)) for column in columns)} |\n")
+
+
+def _field_rows(fields: list[dict]) -> Iterator[dict]:
+    """Fields with the ucds joined and the qc split into min/max/miss columns."""
+    for field in fields:
+        row = {key: value for key, value in field.items() if key != "qc"}
+        if field.get("ucd") is not None:
+            row["ucd"] = join_ucd(field["ucd"])
+        for key, value in (field.get("qc") or {}).items():
+            row[key] = value
+        yield row
+
+
+def _compact_section(stream: IO[str], key: str, value: Any) -> None:
+    if value is None:
+        return
+    stream.write(f"## {_title(key)}\n\n")
+    if key == "fields":
+        _compact_table(stream, list(_field_rows(value)), _FIELD_COLUMNS)
+    elif isinstance(value, list) and value and isinstance(value[0], dict):
+        _compact_table(stream, value)
+    elif isinstance(value, list):
+        stream.writelines(f"* {_cell(item)}\n" for item in value)
+    elif isinstance(value, dict):
+        stream.write("```yaml\n")
+        yaml.safe_dump(value, stream, sort_keys=False, default_flow_style=False)
+        stream.write("```\n")
+    else:
+        stream.write(f"{value}\n")
+    stream.write("\n")
+
+
+def render_markdown(data: dict, stream: IO[str], compact: bool = False) -> None:
+    """
+    Writes a maml dictionary (as MAML.to_dict gives) to the stream as markdown, section by
+    section. The default layout is identical to yaml_to_markdown's MDConverter.
+    """
+    for key, value in data.items():
+        if compact:
+            _compact_section(stream, key, value)
+        else:
+            _section(stream, key, value, 2)
+
+
+def _render_file(
+    file_name: str, out_dir: str | None, root: str, version: str | None, compact: bool
+) -> dict:
+    """
+    Renders one maml file to markdown, never raising.
+    """
+    from .maml import MAML
+
+    outfile = _output_path(file_name, root, out_dir, ".md")
+    try:
+        MAML.from_file(file_name, version).to_markdown(outfile, compact=compact)
+    except (OSError, ValueError) as exc:  # pydantic's ValidationError is a ValueError
+        return {"file": file_name, "markdown": None, "error": str(exc)}
+    return {"file": file_name, "markdown": outfile, "error": None}
+
+
+def _render_chunk(
+    file_names: list[str], out_dir: str | None, root: str, version: str | None, compact: bool
+) -> list[dict]:
+    return [_render_file(name, out_dir, root, version, compact) for name in file_names]
+
+
+def render_tree(
+    path: str,
+    out_dir: str | None = None,
+    version: str | None = None,
+    compact: bool = False,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> Iterator[dict]:
+    """
+    Renders every .maml file under `path` to markdown with a pool of `workers` processes,
+    yielding {"file", "markdown" (the written file), "error"} as each file is done.
+    Markdown is written next to each file, or to the same relative path under out_dir.
+    """
+    from .batch import _process_pool
+
+    files = _find_files(path, (".maml",))
+    if workers == 1:
+        for file_name in files:
+            yield _render_file(file_name, out_dir, path, version, compact)
+        return
+
+    from concurrent.futures import as_completed
+
+    executor = _process_pool(workers)
+    try:
+        futures = [
+            executor.submit(
+                _render_chunk, files[i : i + chunk_size], out_dir, path, version, compact
+            )
+            for i in range(0, len(files), chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
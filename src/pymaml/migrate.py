@@ -0,0 +1,240 @@
+"""
+Module for migrating maml between versions of the schema.
+
+Migrations are a chain of registered steps, each turning a dictionary of one version into
+a dictionary of another; the shortest chain between two versions is used. The result is
+always validated against the target model. Steps are registered with:
+
+    @register_step("v1.1", "v1.2")
+    def _v1p1_to_v1p2(data: dict) -> dict:
+        ...
+"""
+
+import os
+import warnings
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from pydantic import BaseModel
+
+from .batch import _output_path, _process_pool, find_maml_files
+from .parse import MODELS, _assert_version, detect_version
+from .read import read_maml
+
+if TYPE_CHECKING:
+    from .maml import MAML
+
+Step = Callable[[dict], dict]
+_STEPS: dict[str, dict[str, Step]] = {}  # source version: {target version: step}
+
+
+def register_step(source: str, target: str) -> Callable[[Step], Step]:
+    """
+    Decorator registering a migration step between two versions. The step is given a
+    shallow copy of the dictionary, which it may change, and returns the migrated dictionary.
+    """
+    _assert_version(source)
+    _assert_version(target)
+
+    def register(step: Step) -> Step:
+        _STEPS.setdefault(source, {})[target] = step
+        return step
+
+    return register
+
+
+def migration_path(source: str, target: str) -> list[tuple[str, str]]:
+    """
+    Returns the shortest chain of registered steps from source to target as
+    (source, target) pairs. Raises ValueError if the versions are not connected.
+    """
+    _assert_version(source)
+    _assert_version(target)
+    previous = {source: None}
+    queue = deque([source])
+    while queue:
+        version = queue.popleft()
+        if version == target:
+            break
+        for following in _STEPS.get(version, {}):
+            if following not in previous:
+                previous[following] = version
+                queue.append(following)
+    if target not in previous:
+        raise ValueError(f"No migration from {source} to {target}.")
+    path = []
+    version = target
+    while previous[version] is not None:
+        path.append((previous[version], version))
+        version = previous[version]
+    return path[::-1]
+
+
+@register_step("v1.0", "v1.1")
+def _v1p0_to_v1p1(data: dict) -> dict:
+    """
+    v1.1 only adds the optional keyarray and extra keys.
+    """
+    data["MAML_version"] = 1.1
+    return data
+
+
+@register_step("v1.1", "v1.0")
+def _v1p1_to_v1p0(data: dict) -> dict:
+    """
+    Only possible without keyarray and extra, which v1.0 does not have.
+    """
+    lost = [key for key in ("keyarray", "extra") if key in data]
+    if lost:
+        raise ValueError(f"Migrating to v1.0 would lose {', '.join(lost)}.")
+    data["MAML_version"] = 1.0
+    return data
+
+
+def _migrate(data: dict, target: str, source: str | None) -> tuple[dict, BaseModel]:
+    """
+    Runs the steps from source (detected if None) to target, puts the keys in the target's
+    order and validates the result. Returns the dictionary and the validated model.
+    """
+    if source is None:
+        source = detect_version(data)
+    for step_source, step_target in migration_path(source, target):
+        data = _STEPS[step_source][step_target](dict(data))
+    model = MODELS[target]
+    ordered = {key: data[key] for key in model.model_fields if key in data}
+    ordered.update(data)  # unknown keys stay at the end, for validation to report
+    return ordered, model(**ordered)
+
+
+def migrate_dict(data: dict, target: str, source: str | None = None) -> dict:
+    """
+    Returns a maml dictionary migrated to the target version (the source version is
+    detected if not given). Raises a ValidationError if the result is not a valid target.
+    """
+    return _migrate(data, target, source)[0]
+
+
+def migrate(maml: "MAML", target: str) -> "MAML":
+    """
+    Returns the maml migrated to the target version, without going through yaml.
+    """
+    from .maml import MAML
+
+    _, meta = _migrate(maml.to_dict(include_none=False), target, maml.version)
+    return MAML._from_meta(meta, target)
+
+
+def _write(data: dict, file_name: str) -> None:
+    """
+    Writes the migrated dictionary as it is, so that only the changes reported are made.
+    Writes to a temporary file first, so that a failed write never leaves half a file.
+    """
+    import yaml
+
+    from .maml import MAMLDumper
+
+    root, ext = os.path.splitext(file_name)
+    if ext != ".maml":
+        raise ValueError(f"Extension '{ext}' is not a valid maml extension.")
+    temporary = f"{root}.migrating.maml"
+    try:
+        with open(temporary, "w", encoding="utf8") as file:
+            yaml.dump(data, file, Dumper=MAMLDumper, sort_keys=False, default_flow_style=False)
+        os.replace(temporary, file_name)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def _report(data: dict, migrated: dict) -> dict:
+    """
+    The changes made by a migration as a patch. Fields with repeated names cannot be matched
+    by make_patch, so then only the top level keys are compared, with "fields" as a whole.
+    """
+    from .diff import _changes, make_patch
+
+    try:
+        return make_patch(data, migrated)
+    except ValueError:
+        changed = _changes(data, migrated)
+        return {"changed": changed} if changed else {}
+
+
+def migrate_file(
+    file_name: str, target: str, out_file: str | None = None, dry_run: bool = False
+) -> dict:
+    """
+    Migrates one file, never raising. The file is overwritten unless out_file is given and
+    is left alone if nothing changed. Returns the file, its source version, the target,
+    the changes made (a patch, see diff.make_patch), the file written (None for a dry run
+    or no change) and the error message if there was one.
+    """
+    result = {
+        "file": file_name,
+        "source": None,
+        "target": target,
+        "changes": None,
+        "output": None,
+        "error": None,
+    }
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            data = read_maml(file_name)
+        result["source"] = detect_version(data)
+        migrated, _ = _migrate(data, target, result["source"])
+        result["changes"] = _report(data, migrated)
+        out_file = file_name if out_file is None else out_file
+        if not dry_run and (out_file != file_name or result["changes"]):
+            _write(migrated, out_file)
+            result["output"] = out_file
+    except (OSError, ValueError) as exc:  # pydantic's ValidationError is a ValueError
+        result["error"] = str(exc)
+    return result
+
+
+def _migrate_chunk(
+    file_names: list[str], root: str, target: str, out_dir: str | None, dry_run: bool
+) -> list[dict]:
+    results = []
+    for file_name in file_names:
+        out_file = None
+        if out_dir is not None and not dry_run:
+            out_file = _output_path(file_name, root, out_dir, ".maml")
+        results.append(migrate_file(file_name, target, out_file, dry_run))
+    return results
+
+
+def migrate_tree(
+    path: str,
+    target: str,
+    out_dir: str | None = None,
+    dry_run: bool = False,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> Iterator[dict]:
+    """
+    Migrates every .maml file under `path` with a pool of `workers` processes, yielding
+    the result of each file (see migrate_file) as it is done. Files are migrated in place,
+    or written to the same relative path under out_dir. A dry run only reports the changes.
+    """
+    _assert_version(target)
+    files = find_maml_files(path)
+    if workers == 1:
+        yield from _migrate_chunk(files, path, target, out_dir, dry_run)
+        return
+
+    from concurrent.futures import as_completed
+
+    executor = _process_pool(workers)
+    try:
+        futures = [
+            executor.submit(
+                _migrate_chunk, files[i : i + chunk_size], path, target, out_dir, dry_run
+            )
+            for i in range(0, len(files), chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -13,9 +13,9 @@ from datetime import date as date_aliased
 from typing import List, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator, model_validator
-from astropy.io.votable.ucd import check_ucd
 
 from .date_funcs import today
+from .ucd_funcs import is_valid_ucd, join_ucd
 
 
 class DOIEntry(BaseModel):
@@ -77,13 +77,8 @@ class FieldEntry(BaseModel):
     @classmethod
     def validate_ucd(cls, value, info):
         """Checks that the ucds are valid ucds."""
-        if isinstance(value, list):
-            ucd_string = ";".join(value)
-        else:
-            ucd_string = value
-        if value is not None and not check_ucd(
-            ucd_string, check_controlled_vocabulary=True
-        ):
+        ucd_string = join_ucd(value)
+        if value is not None and not is_valid_ucd(ucd_string):
             raise ValueError(
                 f"{ucd_string} is not valid UCD in field {info.data['name']}"
             )
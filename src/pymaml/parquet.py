@@ -0,0 +1,83 @@
+"""
+Helper module for storing maml in the key-value metadata of parquet files (and arrow schemas).
+
+The maml is kept as yaml under the METADATA_KEY key. Reading uses polars to fetch only the
+parquet footer, so no data pages are ever read.
+"""
+
+import os
+from typing import TYPE_CHECKING, Iterator
+
+from .batch import _find_files
+
+if TYPE_CHECKING:
+    from .maml import MAML
+
+METADATA_KEY = "maml"
+
+
+def _text(value: str | bytes) -> str:
+    return value.decode("utf8") if isinstance(value, bytes) else value
+
+
+def maml_text(metadata: dict | None) -> str | None:
+    """
+    Returns the maml yaml stored in key-value metadata (str or bytes keys, e.g. from
+    polars.read_parquet_metadata or pyarrow's Schema.metadata), or None.
+    """
+    for key, value in (metadata or {}).items():
+        if _text(key) == METADATA_KEY:
+            return _text(value)
+    return None
+
+
+def read_parquet_metadata(file_name: str | os.PathLike) -> dict[str, str]:
+    """
+    Returns the key-value metadata of a parquet file, reading only its footer.
+    """
+    import polars as pl
+
+    return pl.read_parquet_metadata(file_name)
+
+
+def find_parquet_files(path: str) -> list[str]:
+    """
+    Returns every .parquet file under the given directory (or the file itself), sorted.
+    """
+    return _find_files(path, (".parquet", ".pq"))
+
+
+def _load(file_name: str, version: str | None) -> dict:
+    """
+    Reads the maml of one parquet file, never raising.
+    """
+    from .maml import MAML
+
+    try:
+        return {
+            "file": file_name,
+            "maml": MAML.from_parquet(file_name, version),
+            "error": None,
+        }
+    except Exception as exc:  # polars raises its own errors for broken files
+        return {"file": file_name, "maml": None, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def scan_parquet_maml(
+    path: str, version: str | None = None, workers: int | None = None
+) -> Iterator[dict]:
+    """
+    Reads the maml embedded in every parquet file under `path` using a pool of `workers`
+    threads (reading footers is mostly waiting on storage). Yields, in file order, a
+    dictionary with the file name, the MAML object (None if it could not be read) and
+    the error message if there was one.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    files = find_parquet_files(path)
+    if workers == 1:
+        for file_name in files:
+            yield _load(file_name, version)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_load, files, [version] * len(files))
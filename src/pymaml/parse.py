@@ -2,12 +2,20 @@
 Helper module to parse and check valid maml data structures.
 """
 
+import os
+from functools import cache
+from typing import TYPE_CHECKING, Annotated, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
 from pydantic_core import ValidationError
 
 from .model_v1p0 import V1P0
 from .model_v1p1 import V1P1
-from .read import read_maml
+from .instrument import stage
+from .read import iter_top_level, read_maml
 
+if TYPE_CHECKING:
+    from .cache import ValidationCache
 
 MODELS = {
     "v1.0": V1P0,
@@ -15,10 +23,98 @@ MODELS = {
 }
 
 
-def _is_subsequence(sub: list, full: list) -> bool:
-    """Check if `sub` is a subsequence of `full` (relative order preserved)."""
-    it = iter(full)
-    return all(any(s == f for f in it) for s in sub)
+def _nested_model(annotation):
+    """
+    Returns the pydantic model nested inside a type annotation (e.g. Optional[List[Model]]) if any.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+@cache
+def _key_order(model: type[BaseModel]) -> dict:
+    """
+    Builds the key order tree of a model: {key: (position, key order tree of nested model or None)}.
+    Cached per model since the order never changes.
+    """
+    order = {}
+    for position, (name, field) in enumerate(model.model_fields.items()):
+        nested = _nested_model(field.annotation)
+        order[name] = (position, _key_order(nested) if nested is not None else None)
+    return order
+
+
+def _list_item(annotation):
+    """
+    Returns the item type of the list inside a type annotation (e.g. Optional[List[str]]) if any.
+    """
+    if get_origin(annotation) is list:
+        return get_args(annotation)[0]
+    for arg in get_args(annotation):
+        item = _list_item(arg)
+        if item is not None:
+            return item
+    return None
+
+
+@cache
+def _key_adapters(model: type[BaseModel]) -> dict:
+    """
+    Builds validators for the top level keys of a model: {key: (adapter of the value, adapter of
+    a single list item or None)}. Used by MAMLBuilder to validate each entry as it is added.
+    """
+    adapters = {}
+    for name, field in model.model_fields.items():
+        item = _list_item(field.annotation)
+        adapters[name] = (
+            TypeAdapter(Annotated[field.annotation, field]),
+            TypeAdapter(item) if item is not None else None,
+        )
+    return adapters
+
+
+def _first_out_of_order(data, order: dict, path: str) -> str | None:
+    """
+    Walks the data once and returns the path of the first key that is out of order.
+    """
+    if not isinstance(data, dict):
+        return None
+    last_position = -1
+    for key, value in data.items():
+        if key not in order:
+            continue  # ignore unknown keys. Will crash when read in anyways.
+        position, nested_order = order[key]
+        key_path = f"{path}.{key}" if path else str(key)
+        if position < last_position:
+            return key_path
+        last_position = position
+        if nested_order is None:
+            continue
+        if isinstance(value, dict):
+            error = _first_out_of_order(value, nested_order, key_path)
+            if error is not None:
+                return error
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                error = _first_out_of_order(item, nested_order, f"{key_path}.{i}")
+                if error is not None:
+                    return error
+    return None
+
+
+def order_error(data: dict, version: str) -> str | None:
+    """
+    Returns the path (e.g. "fields.0.unit") of the first key in `data` that is not in
+    the schema order of the given model version, or None if the order is correct.
+    """
+    _assert_version(version)
+    with stage("order"):
+        return _first_out_of_order(data, _key_order(MODELS[version]), "")
 
 
 def check_order(data: dict, version: str) -> bool:
@@ -26,33 +122,44 @@ def check_order(data: dict, version: str) -> bool:
     Recursively check that the order of keys in `data` is a subsequence
     of the schema order defined by the given model version.
     """
-    _assert_version(version)
-    schema = MODELS[version].with_defaults().model_dump(mode="json")
-
-    def _check_recursive(d: dict, s: dict) -> bool:
-        if not isinstance(d, dict) or not isinstance(s, dict):
-            return True  # nothing to check here
-
-        d_keys = list(d.keys())
-        s_keys = list(s.keys())
-        if not _is_subsequence(d_keys, s_keys):
-            return False
-
-        for k, dv in d.items():
-            if k not in s:
-                continue  # ignore unknown keys. Will crash when read in anyways.
-            sv = s[k]
-            if isinstance(dv, dict) and isinstance(sv, dict):
-                if not _check_recursive(dv, sv):
-                    return False
-            elif isinstance(dv, list) and isinstance(sv, list):
-                for d_item, s_item in zip(dv, sv):
-                    if isinstance(d_item, dict) and isinstance(s_item, dict):
-                        if not _check_recursive(d_item, s_item):
-                            return False
-        return True
-
-    return _check_recursive(data, schema)
+    return order_error(data, version) is None
+
+
+def _declared_version(value) -> str | None:
+    """
+    Returns the version in MODELS matching a MAML_version value (e.g. 1.1 or "1.1"), if any.
+    """
+    try:
+        version = f"v{float(value)}"
+    except (TypeError, ValueError):
+        return None
+    return version if version in MODELS else None
+
+
+def detect_version(source: str | os.PathLike | dict) -> str:
+    """
+    Returns the probable version of a maml file (or dictionary) without validating it.
+    Files are scanned for their top level keys without being loaded.
+    A declared MAML_version is used if it is known. Otherwise the result is the first
+    version whose keys cover all of the document's keys, or the latest version if none do.
+    Raises ValueError for anything else, e.g. a document that was read in as a list.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        items = iter_top_level(source)
+    else:
+        _assert_mapping(source)
+        items = source.items()
+    keys = set()
+    for key, value in items:
+        if key == "MAML_version":
+            declared = _declared_version(value)
+            if declared is not None:
+                return declared
+        keys.add(key)
+    for version, model in MODELS.items():
+        if keys <= model.model_fields.keys():
+            return version
+    return list(MODELS)[-1]
 
 
 def _assert_version(version: str) -> None:
@@ -65,18 +172,65 @@ def _assert_version(version: str) -> None:
         )
 
 
-def valid_for(file_name: str) -> list[str]:
+def _assert_mapping(data) -> None:
     """
-    Reads in a file and determines if it is valid for versions of maml.
+    Crashes with a ValueError if read in data is not a mapping (e.g. a list or a scalar).
     """
-    dictionary = read_maml(file_name)
-    valid = []
-    for version, model in MODELS.items():
+    if not isinstance(data, dict):
+        raise ValueError(f"A maml document must be a mapping, not {type(data).__name__}.")
+
+
+def _error_report(exc: ValidationError) -> list[dict]:
+    """
+    Converts a pydantic ValidationError into a list of plain dictionaries.
+    """
+    return [
+        {
+            "loc": ".".join(str(part) for part in error["loc"]),
+            "msg": error["msg"],
+            "type": error["type"],
+        }
+        for error in exc.errors(include_url=False)
+    ]
+
+
+def validation_report(data: dict, versions: list[str] | None = None) -> dict[str, list[dict]]:
+    """
+    Validates a maml dictionary against the given versions (default: every version in MODELS).
+    Returns the errors found for each version (an empty list means valid for that version).
+    Each version validates the whole document, only the UCD checks are shared through the
+    process wide cache (see ucd_funcs), so each unique ucd is only checked once.
+    """
+    if versions is None:
+        versions = list(MODELS)
+    report = {}
+    for version in versions:
+        _assert_version(version)
         try:
-            model(**dictionary)
-            valid.append(version)
-        except ValidationError:
-            pass
+            MODELS[version].model_validate(data)
+            report[version] = []
+        except ValidationError as exc:
+            report[version] = _error_report(exc)
+    return report
+
+
+def valid_for(file_name: str, cache: "ValidationCache | None" = None) -> list[str]:
+    """
+    Reads in a file and determines if it is valid for versions of maml.
+    If a cache is given, files whose contents have not changed are not read again.
+    """
+    if cache is not None:
+        from .batch import cached_check
+
+        checked = cached_check(file_name, cache)
+        if checked["read_error"] is not None:
+            raise ValueError(checked["read_error"])
+        report = checked["report"]
+    else:
+        data = read_maml(file_name)
+        _assert_mapping(data)
+        report = validation_report(data)
+    valid = [version for version, errors in report.items() if not errors]
     if not valid:
         return ["Not valid for any version of MAML"]
     return valid
@@ -0,0 +1,278 @@
+"""
+Module for checking table data against the data_type, array_size and qc of maml fields.
+
+Every check is a vectorized column expression. Polars frames, lazyframes and files
+(scanned with polars) are checked in a single streaming, multi-threaded pass. Pandas
+frames are checked with numpy vectorized comparisons, and iterables of frames (e.g.
+pd.read_csv(..., chunksize=...)) are checked chunk by chunk.
+"""
+
+import datetime
+import os
+from typing import Any, Iterable
+
+import numpy as np
+
+from .dtypes import maml_data_type
+
+_NUMERIC = {
+    "int8",
+    "int16",
+    "int32",
+    "int64",
+    "uint8",
+    "uint16",
+    "uint32",
+    "uint64",
+    "float16",
+    "float32",
+    "float64",
+}
+
+CHECKS = ("below_min", "above_max", "too_long")
+
+
+def _kind(maml_type: str) -> str | None:
+    """The kind of comparison a maml data type supports."""
+    if maml_type in _NUMERIC:
+        return "numeric"
+    if maml_type in ("string", "date", "datetime"):
+        return maml_type
+    return None
+
+
+def _bound(value, kind: str | None):
+    """Converts a qc value to something comparable with a column of the given kind, or None."""
+    if value is None or kind is None:
+        return None
+    if kind == "numeric":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        return None
+    if not isinstance(value, str):
+        return None
+    if kind == "string":
+        return value
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return moment.date() if kind == "date" else moment
+
+
+def _array_size(field, kind: str | None) -> int | None:
+    """The maximum string length of a field, if it has one."""
+    size = field.array_size
+    if kind != "string" or size is None:
+        return None
+    if isinstance(size, str):
+        return int(size) if size.isdigit() else None
+    return size
+
+
+def _plan(field, dtype) -> dict:
+    """Works out which checks apply to a field given the dtype of its column."""
+    actual = maml_data_type(dtype)
+    kind = _kind(actual)
+    qc = field.qc
+    return {
+        "data_type": None if actual == maml_data_type(field.data_type) else actual,
+        "min": _bound(qc.min, kind) if qc else None,
+        "max": _bound(qc.max, kind) if qc else None,
+        "miss": _bound(qc.miss, kind) if qc else None,
+        "array_size": _array_size(field, kind),
+    }
+
+
+def _result(plan: dict | None) -> dict:
+    """The (empty) result of a field. Checks that do not apply are None."""
+    if plan is None:
+        return {"missing": True, "data_type": None, **dict.fromkeys(CHECKS), "rows": []}
+    return {
+        "missing": False,
+        "data_type": plan["data_type"],
+        "below_min": 0 if plan["min"] is not None else None,
+        "above_max": 0 if plan["max"] is not None else None,
+        "too_long": 0 if plan["array_size"] is not None else None,
+        "rows": [],
+    }
+
+
+def _polars_literal(value, dtype):
+    """A polars literal of a bound, in the time zone of the column for naive datetimes."""
+    import polars as pl
+
+    time_zone = getattr(dtype, "time_zone", None)
+    if time_zone is not None and isinstance(value, datetime.datetime) and value.tzinfo is None:
+        return pl.lit(value).dt.replace_time_zone(time_zone)
+    return pl.lit(value)
+
+
+def _validate_polars(fields: list, lazy_frame, sample_size: int) -> dict[str, dict]:
+    """Checks every field with one select over the (lazy) frame."""
+    import polars as pl
+
+    schema = lazy_frame.collect_schema()
+    results = {}
+    expressions = []
+    for i, field in enumerate(fields):
+        if field.name not in schema:
+            results[field.name] = _result(None)
+            continue
+        dtype = schema[field.name]
+        plan = _plan(field, dtype)
+        results[field.name] = _result(plan)
+
+        column = pl.col(field.name)
+        if isinstance(dtype, (pl.Categorical, pl.Enum)):
+            column = column.cast(pl.String)  # compared and measured as text
+        valid = column.is_not_null()
+        if dtype.is_float():
+            valid = valid & column.is_not_nan()
+        if plan["miss"] is not None:
+            valid = valid & (column != plan["miss"])
+        masks = {}
+        if plan["min"] is not None:
+            masks["below_min"] = valid & (column < _polars_literal(plan["min"], dtype))
+        if plan["max"] is not None:
+            masks["above_max"] = valid & (column > _polars_literal(plan["max"], dtype))
+        if plan["array_size"] is not None:
+            masks["too_long"] = valid & (column.str.len_chars() > plan["array_size"])
+        for check, mask in masks.items():
+            expressions.append(mask.fill_null(False).sum().alias(f"{i}:{check}"))
+        if masks:
+            bad = pl.any_horizontal(list(masks.values())).fill_null(False)
+            expressions.append(bad.arg_true().head(sample_size).implode().alias(f"{i}:rows"))
+
+    if not expressions:
+        return results
+    row = lazy_frame.select(expressions).collect(engine="streaming").row(0, named=True)
+    for key, value in row.items():
+        i, check = key.split(":")
+        results[fields[int(i)].name][check] = value if check != "rows" else list(value)
+    return results
+
+
+def _mask(series, compare) -> np.ndarray:
+    """Evaluates a comparison as a plain boolean array, treating missing values as False."""
+    result = compare(series)
+    if hasattr(result, "fillna"):
+        result = result.fillna(False)
+    return np.asarray(result, dtype=bool)
+
+
+def _validate_pandas(
+    fields: list, frame, offset: int, sample_size: int
+) -> dict[str, dict]:
+    """Checks every field of a pandas dataframe with vectorized comparisons."""
+    import pandas as pd
+
+    positions = {}
+    for position, name in enumerate(frame.columns):
+        positions.setdefault(name, position)
+    results = {}
+    for field in fields:
+        if field.name not in positions:
+            results[field.name] = _result(None)
+            continue
+        series = frame.iloc[:, positions[field.name]]
+        plan = _plan(field, series.dtype)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(series.dtype.categories.dtype)  # compared as the values
+        if isinstance(plan["min"], datetime.date) or isinstance(plan["max"], datetime.date):
+            for key in ("min", "max", "miss"):
+                if plan[key] is not None:
+                    plan[key] = pd.Timestamp(plan[key])
+        result = _result(plan)
+
+        valid = _mask(series, lambda s: s.notna())
+        if plan["miss"] is not None:
+            valid &= _mask(series, lambda s: s != plan["miss"])
+        masks = []
+        for check, key, compare in (
+            ("below_min", "min", lambda s, v: s < v),
+            ("above_max", "max", lambda s, v: s > v),
+        ):
+            if plan[key] is None:
+                continue
+            try:
+                mask = valid & _mask(series, lambda s: compare(s, plan[key]))
+            except TypeError:  # e.g. timezone aware column and naive bound
+                result[check] = None
+                continue
+            result[check] = int(mask.sum())
+            masks.append(mask)
+        if plan["array_size"] is not None:
+            mask = valid & _mask(series, lambda s: s.str.len() > plan["array_size"])
+            result["too_long"] = int(mask.sum())
+            masks.append(mask)
+        if masks:
+            rows = np.flatnonzero(np.logical_or.reduce(masks))[:sample_size] + offset
+            result["rows"] = rows.tolist()
+        results[field.name] = result
+    return results
+
+
+def _merge(total: dict[str, dict], chunk: dict[str, dict], sample_size: int) -> None:
+    """Adds the results of a chunk to the running total."""
+    for name, result in chunk.items():
+        current = total[name]
+        for check in CHECKS:
+            if current[check] is not None and result[check] is not None:
+                current[check] += result[check]
+        current["rows"] = (current["rows"] + result["rows"])[:sample_size]
+
+
+def _scan(file_name: str | os.PathLike):
+    """Lazily scans a parquet or csv file with polars."""
+    import polars as pl
+
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in (".parquet", ".pq"):
+        return pl.scan_parquet(file_name)
+    if extension in (".csv", ".tsv"):
+        return pl.scan_csv(file_name, separator="\t" if extension == ".tsv" else ",")
+    raise ValueError(f"Extension '{extension}' is not a supported table format.")
+
+
+def validate_data(fields: list, data: Any, sample_size: int = 5) -> dict[str, dict]:
+    """
+    Checks table data against the maml fields. `data` can be a pandas or polars dataframe,
+    a polars lazyframe, the name of a parquet/csv file, or an iterable of dataframe chunks.
+
+    Returns for every field: whether its column is missing, the actual data type if it does
+    not match the field's data_type, the number of rows below qc.min, above qc.max and longer
+    than array_size (None when the check does not apply) and up to sample_size offending row
+    numbers. Missing values (null/NaN) and values equal to qc.miss are never counted.
+    """
+    if isinstance(data, (str, os.PathLike)):
+        data = _scan(data)
+    module = type(data).__module__
+    if module.startswith("polars"):
+        return _validate_polars(fields, data.lazy(), sample_size)
+    if module.startswith("pandas"):
+        return _validate_pandas(fields, data, 0, sample_size)
+    if isinstance(data, Iterable):
+        return _validate_chunks(fields, data, sample_size)
+    raise TypeError(f"Cannot validate data of type {type(data).__name__}.")
+
+
+def _validate_chunks(fields: list, chunks: Iterable, sample_size: int) -> dict[str, dict]:
+    """Checks an iterable of dataframes, keeping row numbers relative to the whole table."""
+    total = None
+    offset = 0
+    for chunk in chunks:
+        if type(chunk).__module__.startswith("polars"):
+            result = _validate_polars(fields, chunk.lazy(), sample_size)
+            for field_result in result.values():
+                field_result["rows"] = [row + offset for row in field_result["rows"]]
+        else:
+            result = _validate_pandas(fields, chunk, offset, sample_size)
+        offset += len(chunk)
+        if total is None:
+            total = result
+        else:
+            _merge(total, result, sample_size)
+    if total is None:
+        return {field.name: _result(None) for field in fields}
+    return total
@@ -4,9 +4,20 @@ Main module for reading maml files.
 
 import warnings
 import os
+from typing import IO, Iterator
 
 import yaml
-from yaml.parser import ParserError
+
+from .instrument import count, stage
+
+try:
+    from yaml import CSafeLoader as MAMLLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:  # PyYAML was built without libyaml
+    from yaml import SafeLoader as MAMLLoader
+
+    YAML_BACKEND = "python"
 
 warnings.formatwarning = lambda msg, *args, **kwargs: f"{msg}\n"
 
@@ -14,6 +25,7 @@ warnings.formatwarning = lambda msg, *args, **kwargs: f"{msg}\n"
 def read_maml(file_name: str) -> dict:
     """
     Reads in a maml file and warns for strange extensions.
+    Uses the libyaml C loader when PyYAML was built with it (see YAML_BACKEND).
     """
     _, extension = os.path.splitext(file_name)
     match extension:
@@ -26,11 +38,159 @@ def read_maml(file_name: str) -> dict:
                 "WARNING: Attempting to read in file but extension is not valid."
             )
     with open(file_name, encoding="utf8") as file:
-        try:
-            maml_dict = yaml.safe_load(file)
-        except ParserError as exc:
-            raise ValueError("File is not even valid YAML. Failed to read.") from exc
+        return _load(file)
+
+
+def _load(stream) -> dict:
+    """
+    Parses a stream (or bytes) into a dictionary. Empty documents give an empty dictionary.
+    """
+    count("files")
+    try:
+        with stage("read"):
+            maml_dict = yaml.load(stream, Loader=MAMLLoader)
+    except yaml.YAMLError as exc:
+        raise ValueError("File is not even valid YAML. Failed to read.") from exc
     if not maml_dict:
         warnings.warn("FILE IS EMPTY!")
         maml_dict = {}
     return maml_dict
+
+
+class _BufferReader:
+    """
+    Minimal file-like object reading a memoryview in chunks, so that the yaml parser never
+    needs a copy of the whole buffer.
+    """
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Returns the next `size` bytes (everything that is left if size is negative)."""
+        start = self._position
+        end = len(self._view) if size < 0 else min(start + size, len(self._view))
+        self._position = end
+        return self._view[start:end].tobytes()
+
+
+def read_maml_buffer(buffer) -> dict:
+    """
+    Reads maml that is already in memory: str, bytes, bytearray, memoryview, mmap or any
+    object supporting the buffer protocol, or a file-like object with a read method. Bytes are
+    parsed in place and other buffers in chunks, without copying the whole buffer.
+    There is no file name, so no extension checks are done.
+    """
+    if isinstance(buffer, (bytes, str)):
+        return _load(buffer)
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        if not hasattr(buffer, "read"):
+            raise TypeError(f"Cannot read maml from {type(buffer).__name__}.") from None
+        return _load(buffer)
+    with view, view.cast("B") as flat:
+        return _load(_BufferReader(flat))
+
+
+class _LineOffsets:
+    """
+    Wraps a stream and records the byte offset at which every line starts.
+    Lines before the document currently being read are dropped, so memory stays flat.
+    """
+
+    def __init__(self, stream: IO):
+        self._stream = stream
+        self._first_line = 0
+        self._starts = [0]
+        self._n_bytes = 0
+        self.name = getattr(stream, "name", "<stream>")
+
+    def read(self, size: int = -1):
+        """Reads from the wrapped stream, recording where new lines start."""
+        chunk = self._stream.read(size)
+        data = chunk.encode("utf8") if isinstance(chunk, str) else chunk
+        position = data.find(b"\n")
+        while position != -1:
+            self._starts.append(self._n_bytes + position + 1)
+            position = data.find(b"\n", position + 1)
+        self._n_bytes += len(data)
+        return chunk
+
+    def offset(self, mark) -> int:
+        """Returns the byte offset of a yaml mark and forgets every earlier line."""
+        del self._starts[: mark.line - self._first_line]
+        self._first_line = mark.line
+        return self._starts[0] + mark.column
+
+
+def iter_top_level(file_name: str) -> Iterator[tuple[str, str | None]]:
+    """
+    Lazily yields (key, value) for the top level keys of the first document of a file by
+    scanning yaml events, without building any python objects. Values are the raw scalar
+    text, or None when the value is a list or mapping. Nothing is yielded if the document
+    is not a mapping.
+    """
+    with open(file_name, "rb") as file:
+        loader = MAMLLoader(file)
+        try:
+            depth = 0
+            key = None
+            while loader.check_event():
+                event = loader.get_event()
+                if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                    if depth == 0 and isinstance(event, yaml.SequenceStartEvent):
+                        return
+                    if depth == 1 and key is not None:
+                        yield key, None
+                        key = None
+                    depth += 1
+                elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                    depth -= 1
+                    if depth == 0:
+                        return
+                elif depth == 1 and isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+                    value = getattr(event, "value", None)
+                    if key is None:
+                        key = value
+                    else:
+                        yield key, value
+                        key = None
+        except yaml.YAMLError as exc:
+            raise ValueError("File is not even valid YAML. Failed to read.") from exc
+        finally:
+            loader.dispose()
+
+
+def iter_maml_documents(source: str | IO) -> Iterator[tuple[int, int, int, dict]]:
+    """
+    Lazily reads every document of a multi-document (--- separated) maml file or stream.
+    Yields (document index, line number, byte offset, dictionary) for each non-empty document,
+    where the line number and byte offset locate the start of the document's content.
+    Only one document is held in memory at a time.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            yield from iter_maml_documents(file)
+        return
+
+    stream = _LineOffsets(source)
+    loader = MAMLLoader(stream)
+    index = 0
+    try:
+        while True:
+            try:
+                if not loader.check_node():
+                    break
+                node = loader.get_node()
+                data = loader.construct_document(node)
+            except yaml.YAMLError as exc:
+                raise ValueError(
+                    f"Document {index} of {stream.name} is not valid YAML. Failed to read."
+                ) from exc
+            if data:
+                yield index, node.start_mark.line + 1, stream.offset(node.start_mark), data
+            index += 1
+    finally:
+        loader.dispose()
@@ -0,0 +1,374 @@
+"""
+Validate-only mode using the json schemas bundled with pymaml.
+
+Each schema is compiled once into nested python closures which check a parsed maml
+dictionary without building any of the pydantic models. The UCD check and the rejection
+of explicit None values are layered on top so the results agree with the models.
+"""
+
+import datetime
+import json
+from functools import cache
+from importlib.resources import files
+from typing import Any, Callable, Iterator, Sequence
+
+from pydantic import TypeAdapter, ValidationError
+
+from .parse import MODELS, _assert_version
+from .ucd_funcs import is_valid_ucd, join_ucd
+
+# A compiled check returns (path, message, error type) for everything wrong with a value,
+# with paths relative to the value. Valid values give the shared empty tuple, so checking
+# a valid document allocates (almost) nothing.
+Error = tuple[tuple, str, str]
+Check = Callable[[Any], Sequence[Error]]
+_VALID: tuple[Error, ...] = ()
+
+# Keywords that are not checked. `const` only appears on MAML_version, which the models
+# do not enforce so that files written for earlier versions stay valid for later ones.
+_IGNORED_KEYWORDS = {"$schema", "title", "description", "const"}
+
+# Top level keys that may be omitted but not explicitly set to None (see check_explicit_nones).
+_NOT_NONE = {
+    "survey",
+    "dataset",
+    "description",
+    "comments",
+    "license",
+    "keywords",
+    "coauthors",
+    "DOIs",
+    "depends",
+    "keyarray",
+    "extra",
+}
+
+
+# The python types the models use for the json schema types. Other values are accepted if
+# pydantic's lax mode coerces them, e.g. "1.1" or True as a float or a datetime at midnight
+# as a date, so the two always agree.
+_MODEL_TYPES = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": bool,
+    "null": type(None),
+    "object": dict,
+    "array": list,
+}
+
+# Values of these types are only valid for their own json schema type.
+_NEVER_COERCED = frozenset({type(None), dict, list})
+
+# Keywords checking the contents of objects and arrays, which ignore values of other types.
+_STRUCTURE_KEYWORDS = {"properties", "required", "additionalProperties", "items"}
+
+
+@cache
+def _adapter(python_type) -> TypeAdapter:
+    return TypeAdapter(python_type)
+
+
+def _coerces(value, python_type) -> bool:
+    try:
+        _adapter(python_type).validate_python(value)
+    except ValidationError:
+        return False
+    return True
+
+
+def _declared_types(schema: dict) -> frozenset | None:
+    """
+    The python types of the schema's type keyword, None if it has none.
+    """
+    if "type" not in schema:
+        return None
+    types = schema["type"]
+    types = [types] if isinstance(types, str) else types
+    return frozenset(_MODEL_TYPES[name] for name in types)
+
+
+def _rejects(schema: dict, value_type: type) -> bool:
+    """
+    Whether the type keyword of the schema fails every value of the given type.
+    """
+    declared = _declared_types(schema)
+    if declared is None or value_type in declared:
+        return False
+    # Otherwise only a value pydantic coerces (e.g. an int to a float) could pass.
+    return value_type in _NEVER_COERCED or declared <= _NEVER_COERCED
+
+
+def _exact_types(schema: dict) -> frozenset:
+    """
+    The python types whose values are always valid for the schema, so that containers can
+    accept their items without a call, e.g. str and None for a ucd or None for a qc.
+    """
+    keywords = set(schema) - _IGNORED_KEYWORDS
+    if keywords == {"oneOf"}:
+        # Valid if exactly one option takes the type as it is and the others refuse it.
+        options = schema["oneOf"]
+        return frozenset(
+            value_type
+            for option in options
+            for value_type in _exact_types(option)
+            if all(_rejects(other, value_type) for other in options if other is not option)
+        )
+    if "type" not in keywords or keywords - {"type", *_STRUCTURE_KEYWORDS}:
+        return frozenset()
+    types = _declared_types(schema)
+    if keywords & {"properties", "required", "additionalProperties"}:
+        types -= {dict}  # other types are not checked by properties etc.
+    if "items" in keywords:
+        types -= {list}
+    return types
+
+
+def _compile_type(types: str | list[str], date: bool) -> Check:
+    types = [types] if isinstance(types, str) else types
+    exact = frozenset({datetime.date} if date else {_MODEL_TYPES[name] for name in types})
+    containers = tuple(exact & _NEVER_COERCED)
+    coerced = [python_type for python_type in exact if python_type not in containers]
+    number = float in exact
+    if date:
+        errors = (((), "Input should be a valid date", "date_type"),)
+    else:
+        errors = (((), f"Input should be of type {' or '.join(types)}", "type_error"),)
+
+    def check(value):
+        value_type = type(value)
+        if value_type in exact:
+            return _VALID
+        if value_type is int and number and value.bit_length() <= 53:  # exactly a float
+            return _VALID
+        if value is None or isinstance(value, (dict, list)):
+            return _VALID if isinstance(value, containers) else errors
+        if any(_coerces(value, python_type) for python_type in coerced):
+            return _VALID
+        return errors
+
+    return check
+
+
+def _compile_object(
+    properties: dict, required: list[str], additional: bool, first: bool
+) -> Check:
+    exact_types = {name: _exact_types(sub_schema) for name, sub_schema in properties.items()}
+    checks = {name: compile_schema(sub_schema, first) for name, sub_schema in properties.items()}
+    required_keys = frozenset(required)
+    known_keys = frozenset(properties)
+
+    def report(value: dict) -> Sequence[Error]:
+        errors = []
+        if not value.keys() >= required_keys:
+            missing = [name for name in required if name not in value]
+            errors = [((name,), "Field required", "missing") for name in missing]
+            if first:
+                return errors[:1]
+        for name, item in value.items():
+            item_check = checks.get(name)
+            if item_check is None:
+                if not additional:
+                    errors.append(((name,), "Extra inputs are not permitted", "extra_forbidden"))
+                    if first:
+                        return errors
+                continue
+            if type(item) in exact_types[name]:
+                continue
+            item_errors = item_check(item)
+            if item_errors:
+                errors.extend(((name,) + loc, msg, kind) for loc, msg, kind in item_errors)
+                if first:
+                    return errors
+        return errors or _VALID
+
+    def check(value):
+        if not isinstance(value, dict):
+            return _VALID
+        keys = value.keys()
+        if not (keys >= required_keys and (additional or keys <= known_keys)):
+            return report(value)
+        # Valid values (the usual case) are checked without building any errors.
+        for name, item in value.items():
+            types = exact_types.get(name)
+            if types is not None and type(item) not in types and checks[name](item):
+                return report(value)
+        return _VALID
+
+    return check
+
+
+def _compile_items(items: dict, first: bool) -> Check:
+    exact = _exact_types(items)
+    item_check = compile_schema(items, first)
+
+    def check(value):
+        if not isinstance(value, list):
+            return _VALID
+        errors = []
+        for i, item in enumerate(value):
+            if type(item) in exact:
+                continue
+            item_errors = item_check(item)
+            if item_errors:
+                errors.extend(((i,) + loc, msg, kind) for loc, msg, kind in item_errors)
+                if first:
+                    return errors
+        return errors or _VALID
+
+    return check
+
+
+def _compile_one_of(options: list[dict]) -> Check:
+    option_checks = [
+        (_exact_types(option), compile_schema(option, first=True)) for option in options
+    ]
+    valid_types = _exact_types({"oneOf": options})
+    errors = (((), "Input should match exactly one of the allowed types", "one_of"),)
+
+    def check(value):
+        value_type = type(value)
+        if value_type in valid_types:
+            return _VALID
+        n_matches = 0
+        for exact, option_check in option_checks:
+            if value_type in exact:
+                n_matches += 1
+            elif not (exact and value_type in _NEVER_COERCED) and not option_check(value):
+                n_matches += 1
+        return _VALID if n_matches == 1 else errors
+
+    return check
+
+
+def compile_schema(schema: dict, first: bool = False) -> Check:
+    """
+    Compiles a (sub) json schema into a single check function.
+    With first, checking stops at the first error, which is all a yes/no answer needs.
+    Only the keywords used by the maml schemas are supported.
+    """
+    unknown = set(schema) - _IGNORED_KEYWORDS - {
+        "type",
+        "format",
+        "properties",
+        "required",
+        "additionalProperties",
+        "items",
+        "oneOf",
+    }
+    if unknown:
+        raise NotImplementedError(f"Unsupported json schema keywords: {sorted(unknown)}")
+
+    checks = []
+    if "type" in schema:
+        checks.append(_compile_type(schema["type"], schema.get("format") == "date"))
+    if "properties" in schema or "required" in schema:
+        checks.append(
+            _compile_object(
+                schema.get("properties", {}),
+                schema.get("required", []),
+                schema.get("additionalProperties", True),
+                first,
+            )
+        )
+    if "items" in schema:
+        checks.append(_compile_items(schema["items"], first))
+    if "oneOf" in schema:
+        checks.append(_compile_one_of(schema["oneOf"]))
+    if len(checks) == 1:
+        return checks[0]
+    # Values of an exact type skip the type check (the first one, if there is one).
+    exact = frozenset() if "format" in schema else _exact_types({"type": schema.get("type", [])})
+    rest = checks[1:]
+    if len(rest) == 1:  # the usual type and properties or items, without the loop
+        first_check, last_check = checks
+
+        def check(value):
+            if type(value) in exact:
+                return last_check(value)
+            return first_check(value) or last_check(value)
+
+        return check
+
+    def check(value):
+        for sub_check in rest if type(value) in exact else checks:
+            errors = sub_check(value)
+            if errors:
+                return errors  # a value of the wrong type has nothing more worth reporting
+        return _VALID
+
+    return check
+
+
+def compile_predicate(schema: dict) -> Callable[[Any], bool]:
+    """
+    Compiles a (sub) json schema into a function returning only whether a value is valid.
+    """
+    check = compile_schema(schema, first=True)
+    return lambda value: not check(value)
+
+
+def load_schema(version: str) -> dict:
+    """
+    Returns the bundled json schema of the given maml version.
+    """
+    _assert_version(version)
+    schema_file = files("pymaml") / "schemas" / f"{version.replace('.', 'p')}.json"
+    return json.loads(schema_file.read_text(encoding="utf8"))
+
+
+@cache
+def _compiled(version: str, first: bool = False) -> Check:
+    return compile_schema(load_schema(version), first)
+
+
+def _model_rules(data: dict) -> Iterator[tuple[tuple, str, str]]:
+    """
+    Checks done by the pydantic models which the json schemas can't express.
+    """
+    for name in _NOT_NONE:
+        if name in data and data[name] is None:
+            yield (name,), f"{name} cannot be explicitly set to None.", "value_error"
+    fields = data.get("fields")
+    if not isinstance(fields, list):
+        return
+    for i, field in enumerate(fields):
+        if not isinstance(field, dict) or field.get("ucd") is None:
+            continue
+        ucd_string = join_ucd(field["ucd"])
+        if isinstance(ucd_string, str) and not is_valid_ucd(ucd_string):
+            yield (
+                ("fields", i, "ucd"),
+                f"{ucd_string} is not valid UCD in field {field.get('name')}",
+                "value_error",
+            )
+
+
+def quick_validate(data, version: str) -> list[dict]:
+    """
+    Validates a parsed maml dictionary against the bundled json schema of the version.
+    Returns a list of errors (loc/msg/type) in the same form as validation_report.
+    """
+    _assert_version(version)
+    errors = _compiled(version)(data) or list(_model_rules(data))
+    return [
+        {"loc": ".".join(str(part) for part in loc), "msg": msg, "type": error_type}
+        for loc, msg, error_type in errors
+    ]
+
+
+def is_valid(data, version: str) -> bool:
+    """
+    Returns True if the data is valid for the version.
+    """
+    _assert_version(version)
+    return not _compiled(version, first=True)(data) and next(_model_rules(data), None) is None
+
+
+def quick_validation_report(data, versions: list[str] | None = None) -> dict[str, list[dict]]:
+    """
+    The validate-only equivalent of parse.validation_report.
+    """
+    if versions is None:
+        versions = list(MODELS)
+    return {version: quick_validate(data, version) for version in versions}
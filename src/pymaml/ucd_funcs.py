@@ -0,0 +1,84 @@
+"""
+Helper module for UCD (Unified Content Descriptor) checks.
+
+Catalogues repeat the same handful of ucds across many columns so the results of the
+(relatively slow) astropy vocabulary check are kept in a bounded LRU cache.
+Astropy is only imported once a ucd is actually checked.
+"""
+
+from functools import lru_cache
+
+from .instrument import count, stage
+
+UCD_CACHE_SIZE = 4096
+
+
+def join_ucd(value: str | list[str]) -> str:
+    """
+    Returns the single ucd string for a ucd given as either a string or a list of words.
+    """
+    if isinstance(value, list):
+        return ";".join(value)
+    return value
+
+
+@lru_cache(maxsize=UCD_CACHE_SIZE)
+def is_valid_ucd(ucd_string: str) -> bool:
+    """
+    Checks the ucd string against the IVOA controlled vocabulary. Results are cached.
+    """
+    from astropy.io.votable.ucd import check_ucd
+
+    count("ucd_checks")
+    with stage("ucd"):
+        return check_ucd(ucd_string, check_controlled_vocabulary=True)
+
+
+def ucd_cache_info() -> dict:
+    """
+    Returns the hit/miss statistics of the ucd cache.
+    """
+    info = is_valid_ucd.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxsize": info.maxsize,
+        "currsize": info.currsize,
+    }
+
+
+def clear_ucd_cache() -> None:
+    """
+    Empties the ucd cache and resets its statistics.
+    """
+    is_valid_ucd.cache_clear()
+
+
+def controlled_vocabulary() -> list[str]:
+    """
+    Returns every word in the IVOA UCD1+ controlled vocabulary shipped with astropy.
+    """
+    from astropy.utils.data import get_pkg_data_fileobj
+
+    words = []
+    with get_pkg_data_fileobj(
+        "data/ucd1p-words.txt", package="astropy.io.votable", encoding="ascii"
+    ) as file:
+        for line in file:
+            if line.startswith("#") or not line.strip():
+                continue
+            _, word, _ = (part.strip() for part in line.split("|"))
+            words.append(word)
+    return words
+
+
+def warm_ucd_cache(ucds: list[str] | None = None) -> int:
+    """
+    Pre-fills the ucd cache. Defaults to every word of the controlled vocabulary.
+    Returns the number of ucds checked.
+    """
+    if ucds is None:
+        ucds = controlled_vocabulary()
+    for ucd in ucds:
+        is_valid_ucd(ucd)
+    return len(ucds)
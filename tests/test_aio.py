@@ -0,0 +1,89 @@
+"""
+Tests for the asyncio api.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pymaml import MAML, aread_maml, afrom_files, read_maml
+from pymaml import aio
+
+
+def thread_name() -> str:
+    return threading.current_thread().name
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    """Testing that the async functions give the same results as the sync ones."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        aio.set_default_executor(None)
+        self.test_dir.cleanup()
+
+    async def test_aread_maml(self):
+        """Reading gives the same dictionary."""
+        data = await aread_maml("tests/example_v1p1.maml")
+        self.assertEqual(data, read_maml("tests/example_v1p1.maml"))
+
+    async def test_afrom_file(self):
+        """Loading gives the same model, and errors are raised in the caller."""
+        maml = await MAML.afrom_file("tests/example_v1p1.maml", "v1.1")
+        self.assertEqual(maml.meta, MAML.from_file("tests/example_v1p1.maml", "v1.1").meta)
+        with self.assertRaises(ValueError):
+            await MAML.afrom_file("tests/invalid.maml", "v1.1")
+
+    async def test_ato_file_and_markdown(self):
+        """Writing gives the same files."""
+        maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        file_name = os.path.join(self.test_dir.name, "out.maml")
+        await maml.ato_file(file_name)
+        with open(file_name, encoding="utf8") as file:
+            self.assertEqual(file.read(), maml.to_yaml())
+        with self.assertRaises(ValueError):
+            await maml.ato_file(os.path.join(self.test_dir.name, "out.yaml"))
+
+        markdown = os.path.join(self.test_dir.name, "out.md")
+        await maml.ato_markdown(markdown)
+        with open(markdown, encoding="utf8") as file:
+            result = file.read()
+        with open("tests/example_markdown_v1p1.md", encoding="utf8") as file:
+            self.assertEqual(result.strip(), file.read().strip())
+
+    async def test_executor(self):
+        """The given or default executor is used."""
+        with ThreadPoolExecutor(1, thread_name_prefix="pymaml-test") as executor:
+            name = await aio.run(thread_name, executor=executor)
+            self.assertTrue(name.startswith("pymaml-test"))
+            aio.set_default_executor(executor)
+            name = await aio.run(thread_name)
+            self.assertTrue(name.startswith("pymaml-test"))
+
+    async def test_afrom_files(self):
+        """Bulk loads keep the order and never run more than the limit at once."""
+        files = ["tests/example_v1p0.maml", "tests/example_v1p1.maml"] * 5
+        mamls = await afrom_files(files, "v1.1", limit=3)
+        self.assertEqual([m.meta.MAML_version for m in mamls], [1.0, 1.1] * 5)
+
+        running = peak = 0
+
+        async def task():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await aio.run(lambda: None)
+            running -= 1
+
+        await aio.gather_limited([task() for _ in range(20)], limit=4)
+        self.assertEqual(peak, 4)
+        with self.assertRaises(ValueError):
+            await aio.gather_limited([], limit=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
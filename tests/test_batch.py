@@ -0,0 +1,102 @@
+"""
+Tests for the batch validation module and the command line interface.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from pymaml import main, validate_tree
+from pymaml.batch import find_maml_files, validate_file
+
+
+class TestValidateTree(unittest.TestCase):
+    """Testing that a directory of maml files is validated correctly."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        nested = os.path.join(self.test_dir.name, "nested")
+        os.mkdir(nested)
+        shutil.copy("tests/example_v1p0.maml", self.test_dir.name)
+        shutil.copy("tests/example_v1p1.maml", nested)
+        shutil.copy("tests/invalid.maml", nested)
+        shutil.copy("tests/example_markdown_v1p0.md", nested)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def _results(self, **kwargs) -> dict:
+        results = validate_tree(self.test_dir.name, **kwargs)
+        return {os.path.basename(result["file"]): result for result in results}
+
+    def test_find_files(self):
+        """Only .maml files are found, including in sub directories."""
+        files = [os.path.basename(f) for f in find_maml_files(self.test_dir.name)]
+        self.assertEqual(files, ["example_v1p0.maml", "example_v1p1.maml", "invalid.maml"])
+
+    def test_all_versions(self):
+        """Without a version every version is checked."""
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = self._results(workers=workers)
+                self.assertEqual(len(results), 3)
+                self.assertEqual(results["example_v1p0.maml"]["valid_for"], ["v1.0", "v1.1"])
+                self.assertEqual(results["example_v1p1.maml"]["valid_for"], ["v1.1"])
+                self.assertEqual(results["invalid.maml"]["valid_for"], [])
+                self.assertIn("v1.0", results["invalid.maml"]["errors"])
+
+    def test_single_version(self):
+        """Only the requested version is checked."""
+        results = self._results(version="v1.0", workers=1)
+        self.assertEqual(results["example_v1p1.maml"]["valid_for"], [])
+        self.assertEqual(list(results["example_v1p1.maml"]["errors"]), ["v1.0"])
+        self.assertEqual(results["example_v1p0.maml"]["valid_for"], ["v1.0"])
+
+    def test_bad_version(self):
+        """Unknown versions crash straight away."""
+        with self.assertRaises(ValueError):
+            list(validate_tree(self.test_dir.name, version="v9"))
+
+    def test_unreadable_file(self):
+        """Files that are not yaml are reported instead of raising."""
+        path = os.path.join(self.test_dir.name, "broken.maml")
+        with open(path, "w", encoding="utf8") as file:
+            file.write("not: [valid_yaml")
+        result = validate_file(path)
+        self.assertEqual(result["valid_for"], [])
+        self.assertEqual(result["errors"]["v1.1"][0]["type"], "read_error")
+
+    def test_not_a_mapping(self):
+        """Documents that are only a scalar or a list are reported instead of raising."""
+        for name, text in (("number.maml", "5"), ("word.maml", "survey"), ("list.maml", "- a")):
+            with open(os.path.join(self.test_dir.name, name), "w", encoding="utf8") as file:
+                file.write(text)
+        results = self._results(workers=1)
+        for name in ("number.maml", "word.maml", "list.maml"):
+            with self.subTest(name=name):
+                self.assertEqual(results[name]["valid_for"], [])
+                self.assertEqual(results[name]["errors"]["v1.0"][0]["type"], "read_error")
+        self.assertEqual(results["example_v1p1.maml"]["valid_for"], ["v1.1"])
+
+
+class TestMain(unittest.TestCase):
+    """Testing the pymaml command."""
+
+    def test_validate_command(self):
+        """The exit code reflects whether every file was valid."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main(["validate", "tests/example_v1p1.maml"]), 0)
+            self.assertEqual(main(["validate", "tests/invalid.maml", "--workers", "1"]), 1)
+        text = output.getvalue()
+        self.assertIn("OK   tests/example_v1p1.maml (v1.1)", text)
+        self.assertIn("FAIL tests/invalid.maml", text)
+        self.assertIn("author: Field required", text)
+        self.assertIn("1 valid, 0 invalid", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for the on-disk validation cache.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from contextlib import closing
+from unittest.mock import patch
+
+from pymaml import ValidationCache, valid_for, validate_tree
+from pymaml.batch import validate_file
+from pymaml.cache import hash_file
+
+
+class TestValidationCache(unittest.TestCase):
+    """Testing storing, evicting and invalidating cached results."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.test_dir.name, "cache.sqlite")
+        self.cache = ValidationCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.test_dir.cleanup()
+
+    def test_round_trip(self):
+        """Results are returned as they were stored and counted as hits."""
+        self.assertIsNone(self.cache.get("abc"))
+        self.cache.put("abc", {"report": {"v1.0": []}})
+        self.assertEqual(self.cache.get("abc"), {"report": {"v1.0": []}})
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_persistent(self):
+        """Results survive closing and reopening the cache."""
+        self.cache.put("abc", {"valid": True})
+        self.cache.close()
+        self.cache = ValidationCache(self.path)
+        self.assertEqual(self.cache.get("abc"), {"valid": True})
+
+    def test_persistent_without_close(self):
+        """Results are on disk as soon as they are stored, e.g. if the process is killed."""
+        valid_for("tests/example_v1p1.maml", cache=self.cache)
+        other = ValidationCache(self.path)
+        try:
+            self.assertEqual(len(other), 1)
+            self.assertIsNotNone(other.get(hash_file("tests/example_v1p1.maml")))
+        finally:
+            other.close()
+
+    def test_models_change(self):
+        """Results stored for different models are not used."""
+        self.cache.put("abc", {"valid": True})
+        self.cache.close()
+        with patch("pymaml.cache.models_fingerprint", return_value="changed"):
+            self.cache = ValidationCache(self.path)
+        self.assertIsNone(self.cache.get("abc"))
+        self.assertEqual(self.cache.evict(), 1)
+
+    def test_evict_by_size(self):
+        """The least recently used entries beyond max_entries are removed."""
+        self.cache.max_entries = 2
+        for key in ("a", "b", "c"):
+            self.cache.put(key, {})
+            time.sleep(0.01)
+        self.cache.get("a")
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_evict_by_age(self):
+        """Entries older than max_age are neither returned nor kept."""
+        self.cache.put("abc", {})
+        self.cache.max_age = 0
+        time.sleep(0.01)
+        self.assertIsNone(self.cache.get("abc"))
+        self.assertEqual(self.cache.evict(), 1)
+
+    def test_invalidate(self):
+        """Invalidating removes everything."""
+        self.cache.put("abc", {})
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestCachedValidation(unittest.TestCase):
+    """Testing that cached results are identical to fresh ones."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        shutil.copy("tests/example_v1p0.maml", self.test_dir.name)
+        shutil.copy("tests/example_v1p1.maml", self.test_dir.name)
+        shutil.copy("tests/invalid.maml", self.test_dir.name)
+        self.cache = ValidationCache(os.path.join(self.test_dir.name, "cache.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.test_dir.cleanup()
+
+    def _results(self, **kwargs) -> list[dict]:
+        return sorted(validate_tree(self.test_dir.name, **kwargs), key=lambda r: r["file"])
+
+    def test_validate_tree(self):
+        """The second run is answered from the cache with the same results."""
+        for version in (None, "v1.0"):
+            with self.subTest(version=version):
+                expected = self._results(version=version, workers=1)
+                self.assertEqual(self._results(version=version, workers=2, cache=self.cache), expected)
+                self.assertEqual(self._results(version=version, workers=2, cache=self.cache), expected)
+        self.assertEqual(self.cache.stats()["hits"], 9)
+
+    def test_validate_file(self):
+        """validate_file agrees with and without the cache, including read errors."""
+        path = os.path.join(self.test_dir.name, "broken.maml")
+        with open(path, "w", encoding="utf8") as file:
+            file.write("not: [valid_yaml")
+        for file_name in ("example_v1p1.maml", "invalid.maml", "broken.maml"):
+            file_name = os.path.join(self.test_dir.name, file_name)
+            for version in (None, "v1.1"):
+                with self.subTest(file_name=file_name, version=version):
+                    self.assertEqual(
+                        validate_file(file_name, version, cache=self.cache),
+                        validate_file(file_name, version),
+                    )
+
+    def test_valid_for(self):
+        """valid_for gives the same answer from the cache and raises for unreadable files."""
+        file_name = os.path.join(self.test_dir.name, "example_v1p0.maml")
+        self.assertEqual(valid_for(file_name, cache=self.cache), valid_for(file_name))
+        self.assertEqual(valid_for(file_name, cache=self.cache), ["v1.0", "v1.1"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        path = os.path.join(self.test_dir.name, "broken.maml")
+        with open(path, "w", encoding="utf8") as file:
+            file.write("not: [valid_yaml")
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                valid_for(path, cache=self.cache)
+
+    def test_changed_file(self):
+        """Changing a file changes its hash, so it is validated again."""
+        file_name = os.path.join(self.test_dir.name, "example_v1p0.maml")
+        before = hash_file(file_name)
+        valid_for(file_name, cache=self.cache)
+        shutil.copy("tests/invalid.maml", file_name)
+        self.assertNotEqual(hash_file(file_name), before)
+        self.assertEqual(valid_for(file_name, cache=self.cache), ["Not valid for any version of MAML"])
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_committed(self):
+        """Closing the cache writes results to disk."""
+        list(validate_tree(self.test_dir.name, workers=1, cache=self.cache))
+        self.cache.close()
+        with closing(sqlite3.connect(self.cache.path)) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM results").fetchone()[0], 3)
+        self.cache = ValidationCache(self.cache.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the catalogue of many maml files and their dependencies.
+"""
+
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from pymaml import Catalogue
+from pymaml.catalogue import TableKey
+
+
+def _maml(table: str, version=1, depends=(), survey="S", dataset="D") -> dict:
+    data = {"survey": survey, "dataset": dataset, "table": table, "version": version}
+    if depends:
+        data["depends"] = [{"table": d[0], **d[1]} for d in depends]
+    return data
+
+
+class TestCatalogue(unittest.TestCase):
+    """Testing the indexes and the dependency graph of a directory of maml files."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.files = {}
+        self._write("a", _maml("a"))
+        self._write("a2", _maml("a", version=2.0))
+        self._write("b", _maml("b", depends=[("a", {"version": 1})]))
+        self._write("c", _maml("c", depends=[("a", {}), ("b", {"survey": "S"})]))
+        self._write("lost", _maml("lost", depends=[("nowhere", {})]))
+        self._write("x", _maml("x", survey="T", depends=[("y", {})]))
+        self._write("y", _maml("y", survey="T", depends=[("x", {})]))
+        self._write("self", _maml("self", depends=[("self", {})]))
+        with open(os.path.join(self.test_dir.name, "broken.maml"), "w", encoding="utf8") as f:
+            f.write("table: [unclosed")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def _write(self, name: str, data: dict) -> None:
+        file_name = os.path.join(self.test_dir.name, f"{name}.maml")
+        with open(file_name, "w", encoding="utf8") as file:
+            yaml.safe_dump(data, file, sort_keys=False)
+        self.files[name] = file_name
+
+    def _names(self, entries) -> list[str]:
+        return [os.path.basename(entry.file)[:-5] for entry in entries]
+
+    def test_find(self):
+        """Entries are found by any combination of survey, dataset, table and version."""
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        self.assertEqual(len(catalogue), 9)
+        self.assertEqual(self._names(catalogue.find("a")), ["a", "a2"])
+        self.assertEqual(self._names(catalogue.find("a", version=2.0)), ["a2"])
+        self.assertEqual(self._names(catalogue.find("a", "S", "D", "1")), ["a"])
+        self.assertEqual(self._names(catalogue.find(survey="T")), ["x", "y"])
+        self.assertEqual(catalogue.entry(self.files["b"]).key, TableKey("S", "D", "b", "1"))
+
+    def test_errors(self):
+        """Unreadable files are kept, with their error, but not indexed."""
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        self.assertEqual(self._names(catalogue.errors()), ["broken"])
+        self.assertIn("YAML", catalogue.errors()[0].error)
+        self.assertEqual(len(catalogue.find(dataset="D")), 8)
+
+    def test_dependencies(self):
+        """Depends entries resolve to every file matching the parts they give."""
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        self.assertEqual(self._names(catalogue.dependencies(self.files["b"])), ["a"])
+        self.assertEqual(self._names(catalogue.dependencies(self.files["c"])), ["a", "a2", "b"])
+        self.assertEqual(self._names(catalogue.dependents("a")), ["b", "c"])
+        self.assertEqual(self._names(catalogue.dependents("a", version=2)), ["c"])
+        self.assertEqual(self._names(catalogue.dependents("b")), ["c"])
+        self.assertEqual(catalogue.dependents("c"), [])
+        self.assertEqual(catalogue.dependents("unknown"), [])
+
+    def test_dangling(self):
+        """Depends entries that match no file are reported."""
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        dangling = catalogue.dangling()
+        self.assertEqual(len(dangling), 1)
+        self.assertEqual(self._names([dangling[0][0]]), ["lost"])
+        self.assertEqual(dangling[0][1], TableKey(None, None, "nowhere", None))
+
+    def test_cycles(self):
+        """Cycles, including a table depending on itself, are found."""
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        cycles = sorted(self._names(cycle) for cycle in catalogue.cycles())
+        self.assertEqual(cycles, [["self"], ["x", "y"]])
+
+    def test_long_chain(self):
+        """Long dependency chains do not hit the recursion limit."""
+        for i in range(3000):
+            self._write(f"chain{i:04}", _maml(f"t{i}", depends=[(f"t{i + 1}", {})]))
+        self._write("chain3000", _maml("t3000", depends=[("t0", {})]))
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        sizes = sorted(len(cycle) for cycle in catalogue.cycles())
+        self.assertEqual(sizes, [1, 2, 3001])
+
+    def test_parallel_scan(self):
+        """Scanning with a process pool gives the same catalogue."""
+        serial = Catalogue.scan(self.test_dir.name, workers=1)
+        parallel = Catalogue.scan(self.test_dir.name, workers=2, chunk_size=2)
+        self.assertEqual(parallel.entries, serial.entries)
+
+    def test_snapshot(self):
+        """A saved catalogue loads back identically and rescans only changed files."""
+        catalogue = Catalogue.scan(self.test_dir.name, workers=1)
+        snapshot = os.path.join(self.test_dir.name, "catalogue.json")
+        catalogue.save(snapshot)
+        loaded = Catalogue.load(snapshot)
+        self.assertEqual(loaded.entries, catalogue.entries)
+        self.assertEqual(self._names(loaded.dependents("a")), ["b", "c"])
+
+        self._write("c", _maml("c"))
+        os.remove(self.files["b"])
+        rescanned = Catalogue.scan(self.test_dir.name, workers=1, previous=loaded)
+        self.assertIs(rescanned.entry(self.files["a"]), loaded.entry(self.files["a"]))
+        self.assertIsNone(rescanned.entry(self.files["b"]))
+        self.assertEqual(rescanned.dependents("a"), [])
+
+    def test_bad_snapshot(self):
+        """Snapshots of another format are refused."""
+        snapshot = os.path.join(self.test_dir.name, "catalogue.json")
+        with open(snapshot, "w", encoding="utf8") as file:
+            file.write('{"format": 99, "entries": []}')
+        self.assertRaises(ValueError, Catalogue.load, snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
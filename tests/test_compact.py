@@ -0,0 +1,100 @@
+"""
+Tests for the compact fields representation.
+"""
+
+import unittest
+
+from pymaml.compact import CompactFields
+from pymaml.maml import MAML
+
+FIELDS = [
+    {"name": "ra", "unit": "deg", "ucd": "pos.eq.ra", "data_type": "float64"},
+    {"name": "dec", "unit": "deg", "ucd": ["pos.eq.dec", "meta.main"], "data_type": "float64"},
+    {"name": "z", "data_type": "float32", "qc": {"min": 0, "max": 7.5, "miss": "NaN"}},
+    {"name": "flag", "data_type": "string", "array_size": 8, "qc": {}},
+]
+
+
+class TestCompactFields(unittest.TestCase):
+    """Testing that the compact fields are a lossless copy of the model's fields."""
+
+    def setUp(self):
+        self.maml = MAML(
+            {
+                "table": "t",
+                "version": 1,
+                "date": "2025-09-12",
+                "author": "me",
+                "fields": FIELDS,
+            },
+            "v1.1",
+        )
+        self.fields = self.maml.compact_fields()
+
+    def test_round_trip(self):
+        """to_dict matches MAML.to_dict exactly, with and without Nones."""
+        for include_none in (True, False):
+            with self.subTest(include_none=include_none):
+                self.assertEqual(
+                    self.fields.to_dict(include_none),
+                    self.maml.to_dict(include_none)["fields"],
+                )
+
+    def test_example_files(self):
+        """The example files round trip too."""
+        for file_name, version in (
+            ("tests/example_v1p0.maml", "v1.0"),
+            ("tests/example_v1p1.maml", "v1.1"),
+        ):
+            with self.subTest(file_name=file_name):
+                maml = MAML.from_file(file_name, version)
+                self.assertEqual(maml.compact_fields().to_dict(), maml.to_dict()["fields"])
+
+    def test_accessors(self):
+        """Fields are read with the same attributes as FieldEntry."""
+        self.assertEqual(len(self.fields), 4)
+        for view, entry in zip(self.fields, self.maml.meta.fields):
+            for key in ("name", "unit", "info", "ucd", "data_type", "array_size"):
+                self.assertEqual(getattr(view, key), getattr(entry, key))
+            self.assertEqual(view.qc is None, entry.qc is None)
+        self.assertEqual(self.fields[2].qc.max, 7.5)
+        self.assertIsNone(self.fields[-1].qc.min)
+        self.assertEqual(self.fields.get("dec").ucd, ["pos.eq.dec", "meta.main"])
+        self.assertIsNone(self.fields.get("missing"))
+        with self.assertRaises(IndexError):
+            self.fields[4]
+
+    def test_columns(self):
+        """Columns are tuples, with unset keys stored as nothing at all."""
+        self.assertEqual(self.fields.column("name"), ("ra", "dec", "z", "flag"))
+        self.assertEqual(self.fields.column("info"), (None,) * 4)
+        self.assertIsNone(self.fields._info)
+        self.assertEqual(self.fields.column("qc_min"), (None, None, 0.0, None))
+        with self.assertRaises(KeyError):
+            self.fields.column("colour")
+
+    def test_interned(self):
+        """Repeated strings are shared."""
+        fields = CompactFields(
+            [{"name": f"c{i}", "unit": "".join(["d", "eg"]), "data_type": "int"} for i in range(3)]
+        )
+        first, second, _ = fields.column("unit")
+        self.assertIs(first, second)
+
+    def test_read_only(self):
+        """Views can not be changed or given new attributes."""
+        with self.assertRaises(AttributeError):
+            self.fields[0].name = "x"
+        with self.assertRaises(AttributeError):
+            self.fields.extra = 1
+
+    def test_empty(self):
+        """A table without fields gives an empty representation."""
+        fields = CompactFields([])
+        self.assertEqual(len(fields), 0)
+        self.assertEqual(fields.to_dict(), [])
+        self.assertIsNone(fields.get("ra"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Tests for the diff and patch of maml metadata.
+"""
+
+import copy
+import json
+import unittest
+
+from pymaml import MAML
+from pymaml.diff import apply_patch, make_patch
+
+
+def _fields(n: int) -> list[dict]:
+    return [
+        {"name": f"c{i}", "unit": "deg", "data_type": "float64", "qc": {"min": 0, "max": i}}
+        for i in range(n)
+    ]
+
+
+class TestDiff(unittest.TestCase):
+    """Testing that differences are found by field name."""
+
+    def setUp(self):
+        self.old = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        self.old_dict = self.old.to_dict(include_none=False)
+
+    def _changed(self, change) -> dict:
+        new = copy.deepcopy(self.old_dict)
+        change(new)
+        return new
+
+    def test_no_difference(self):
+        """The same metadata gives an empty patch."""
+        self.assertEqual(self.old.diff(self.old), {})
+
+    def test_field_changes(self):
+        """Units, ucds and qc bounds are reported by field name with old and new values."""
+
+        def change(new):
+            new["fields"][4]["unit"] = "rad"
+            new["fields"][5]["ucd"] = "pos.eq.ra"
+            new["fields"][0]["qc"]["max"] = 10
+            del new["fields"][1]["qc"]
+
+        patch = make_patch(self.old_dict, self._changed(change))
+        self.assertEqual(
+            patch,
+            {
+                "fields": {
+                    "changed": {
+                        "ID": {"qc.max": [5, 10]},
+                        "Name": {
+                            "qc.min": ["A", None],
+                            "qc.max": ["E", None],
+                            "qc.miss": ["Null", None],
+                        },
+                        "RA": {"unit": ["deg", "rad"]},
+                        "Dec": {"ucd": ["pos.eq.dec", "pos.eq.ra"]},
+                    }
+                }
+            },
+        )
+
+    def test_added_removed_and_moved(self):
+        """Fields are matched by name, so moving one is only a change of order."""
+
+        def change(new):
+            new["fields"].insert(0, new["fields"].pop(4))
+            del new["fields"][-1]
+            new["fields"].append({"name": "PM", "data_type": "float32"})
+            new["description"] = "New description"
+
+        new = self._changed(change)
+        patch = make_patch(self.old_dict, new)
+        self.assertEqual(patch["fields"]["removed"], ["Mag"])
+        self.assertEqual(patch["fields"]["added"], [{"name": "PM", "data_type": "float32"}])
+        self.assertEqual(patch["fields"]["order"][:2], ["RA", "ID"])
+        self.assertNotIn("changed", patch["fields"])
+        self.assertEqual(
+            patch["changed"], {"description": [self.old_dict["description"], "New description"]}
+        )
+        json.dumps(patch)  # patches can be stored as json
+
+    def test_repeated_names(self):
+        """Fields with repeated names cannot be matched."""
+        new = self._changed(lambda new: new["fields"].append(new["fields"][0]))
+        self.assertRaises(ValueError, make_patch, self.old_dict, new)
+
+
+class TestPatch(unittest.TestCase):
+    """Testing that patches turn the old metadata into the new."""
+
+    def setUp(self):
+        self.old = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+
+    def _new(self) -> MAML:
+        new = self.old.to_dict(include_none=False)
+        new["fields"] = new["fields"][::-1]
+        new["fields"][0]["unit"] = "ABmag"
+        new["fields"][1]["qc"] = {"min": -90, "max": 90}
+        new["fields"].pop()
+        new["fields"].append({"name": "PM", "data_type": "float32", "ucd": "pos.pm"})
+        del new["keyarray"]
+        new["table"] = "Renamed"
+        return MAML(new, "v1.1")
+
+    def test_round_trip(self):
+        """Applying the diff of two mamls to the first gives the second."""
+        new = self._new()
+        patched = self.old.patch(self.old.diff(new))
+        self.assertEqual(patched.to_dict(), new.to_dict())
+        self.assertEqual(patched.diff(new), {})
+
+    def test_conflicts(self):
+        """Patches made from other values raise unless not strict."""
+        patch = self.old.diff(self._new())
+        other = self.old.patch({"fields": {"changed": {"Mag": {"unit": [None, "Jy"]}}}})
+        with self.assertRaises(ValueError) as error:
+            other.patch(patch)
+        self.assertIn("fields.Mag.unit", str(error.exception))
+        self.assertEqual(other.patch(patch, strict=False).field("Mag").unit, "ABmag")
+
+    def test_invalid_result(self):
+        """The patched maml is validated again."""
+        patch = {"changed": {"table": [self.old.meta.table, None]}}
+        self.assertRaises(ValueError, self.old.patch, patch)
+
+    def test_original_untouched(self):
+        """Applying a patch to a dictionary does not change it."""
+        old = {"table": "t", "fields": _fields(3)}
+        before = copy.deepcopy(old)
+        changes = {"qc.max": [1, 5], "unit": ["deg", None]}
+        apply_patch(old, {"fields": {"changed": {"c1": changes}}})
+        self.assertEqual(old, before)
+
+    def test_wide_table(self):
+        """10k field tables diff and patch by name."""
+        old = {"table": "t", "fields": _fields(10_000)}
+        new = {"table": "t", "fields": _fields(10_000)[::-1]}
+        new["fields"][0]["unit"] = "rad"
+        patch = make_patch(old, new)
+        self.assertEqual(patch["fields"]["changed"], {"c9999": {"unit": ["deg", "rad"]}})
+        self.assertEqual(apply_patch(old, patch), new)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Tests for the dtypes module.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from pymaml.dtypes import DTYPE_MAP, maml_data_type, normalize_dtype
+
+
+class TestDtypes(unittest.TestCase):
+    """Testing dtypes are converted to maml data types."""
+
+    def test_normalize(self):
+        """Parameters and case are removed."""
+        self.assertEqual(normalize_dtype("datetime64[ns, UTC]"), "datetime64")
+        self.assertEqual(normalize_dtype(pl.Datetime("us", "UTC")), "datetime")
+        self.assertEqual(normalize_dtype(pl.Int64), "int64")
+        self.assertEqual(normalize_dtype("timestamp[us, tz=UTC]"), "timestamp")
+
+    def test_pandas(self):
+        """pandas and numpy dtypes."""
+        self.assertEqual(maml_data_type(np.dtype("int32")), "int32")
+        self.assertEqual(maml_data_type(pd.Int64Dtype()), "int64")
+        self.assertEqual(maml_data_type(np.dtype("O")), "string")
+        self.assertEqual(maml_data_type(pd.StringDtype()), "string")
+        self.assertEqual(maml_data_type(pd.CategoricalDtype()), "string")
+        self.assertEqual(maml_data_type(np.dtype("bool")), "boolean")
+
+    def test_polars(self):
+        """polars dtypes."""
+        self.assertEqual(maml_data_type(pl.Float32), "float32")
+        self.assertEqual(maml_data_type(pl.String), "string")
+        self.assertEqual(maml_data_type(pl.Date), "date")
+
+    def test_arrow_names(self):
+        """arrow type names."""
+        self.assertEqual(maml_data_type("double"), "float64")
+        self.assertEqual(maml_data_type("large_string"), "string")
+        self.assertEqual(maml_data_type("date32[day]"), "date")
+
+    def test_unknown(self):
+        """Unknown dtypes are kept as strings."""
+        self.assertEqual(maml_data_type(pl.List(pl.Int64)), "List(Int64)")
+        self.assertEqual(maml_data_type("float64", {**DTYPE_MAP, "float64": "double"}), "double")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Import time regression tests.
+"""
+
+import subprocess
+import sys
+import unittest
+
+# Generous budget for `import pymaml` (microseconds) so slow CI machines don't fail.
+IMPORT_BUDGET_US = 1_000_000
+
+# Heavy dependencies (and slow standard library modules) that must only be imported when used.
+LAZY_MODULES = [
+    "pandas",
+    "polars",
+    "numpy",
+    "astropy",
+    "yaml_to_markdown",
+    "asyncio",
+    "multiprocessing",
+]
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Runs the statement with -X importtime and returns the cumulative time of every module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    """Testing that importing pymaml stays cheap."""
+
+    def test_lazy_modules(self):
+        """Heavy dependencies are not imported by `import pymaml`."""
+        times = _import_times("import pymaml")
+        for module in LAZY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, times)
+
+    def test_budget(self):
+        """Importing pymaml stays within the budget."""
+        times = _import_times("import pymaml")
+        self.assertLess(times["pymaml"], IMPORT_BUDGET_US)
+
+    def test_ucd_check_imports_astropy(self):
+        """Astropy is only imported once a ucd is checked."""
+        times = _import_times("import pymaml.ucd_funcs as u; u.is_valid_ucd('pos.eq.ra')")
+        self.assertIn("astropy", times)
+        self.assertNotIn("pandas", times)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for the timing instrumentation.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from pymaml import MAML
+from pymaml.instrument import Timings, collect_timings, count, stage
+from pymaml.ucd_funcs import clear_ucd_cache
+
+
+class TestInstrument(unittest.TestCase):
+    """Testing that stages and counts are recorded only while collecting."""
+
+    def test_disabled(self):
+        """Nothing is recorded outside of collect_timings."""
+        with collect_timings() as timings:
+            pass
+        with stage("read"):
+            count("files")
+        self.assertEqual(timings.to_dict(), {"stages": {}, "counts": {}})
+
+    def test_from_file(self):
+        """Loading records every stage and count."""
+        clear_ucd_cache()
+        with collect_timings() as timings:
+            maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        data = timings.to_dict()
+        self.assertEqual(set(data["stages"]), {"read", "order", "validate", "ucd"})
+        self.assertEqual(data["stages"]["read"]["calls"], 1)
+        self.assertEqual(data["counts"]["files"], 1)
+        self.assertEqual(data["counts"]["fields"], len(maml.meta.fields))
+        self.assertGreater(data["counts"]["ucd_checks"], 0)
+        self.assertGreaterEqual(
+            data["stages"]["validate"]["seconds"], data["stages"]["ucd"]["seconds"]
+        )
+
+    def test_writing(self):
+        """Writing records the dump, write and markdown stages."""
+        maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        with tempfile.TemporaryDirectory() as directory, collect_timings() as timings:
+            maml.to_file(os.path.join(directory, "out.maml"))
+            maml.to_markdown(os.path.join(directory, "out.md"))
+        self.assertEqual(set(timings.to_dict()["stages"]), {"dump", "write", "markdown"})
+
+    def test_async(self):
+        """Work done in the async api's executor is recorded."""
+
+        async def load():
+            with collect_timings() as timings:
+                await MAML.afrom_file("tests/example_v1p1.maml", "v1.1")
+            return timings
+
+        timings = asyncio.run(load())
+        self.assertEqual(timings.to_dict()["counts"]["files"], 1)
+
+    def test_accumulate(self):
+        """A Timings can be passed in to keep adding to it."""
+        timings = Timings()
+        for _ in range(3):
+            with collect_timings(timings):
+                with stage("read"):
+                    pass
+        self.assertEqual(timings.to_dict()["stages"]["read"]["calls"], 3)
+
+    def test_prometheus(self):
+        """The prometheus export has a line per stage and count."""
+        timings = Timings()
+        timings.record("read", 0.5)
+        timings.record("read", 0.25)
+        timings.add("files", 2)
+        text = timings.to_prometheus()
+        self.assertIn('pymaml_stage_seconds_total{stage="read"} 0.75\n', text)
+        self.assertIn('pymaml_stage_calls_total{stage="read"} 2\n', text)
+        self.assertIn('pymaml_items_total{item="files"} 2\n', text)
+        self.assertIn("# TYPE pymaml_stage_seconds_total counter", text)
+        self.assertEqual(timings.to_dict()["stages"]["read"]["max_seconds"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,22 @@
 Test maml
 """
 
+import copy
+import io
+import itertools
 import os
+import pickle
 import unittest
+import unittest.mock
 import yaml
+from pydantic import ValidationError
 
 import pandas as pd
+import polars as pl
 
-from pymaml.maml import MAML, MAMLBuilder, _assert_version
+from pymaml.maml import MAML, MAMLBuilder, _assert_version, _remove_nones, iter_maml
 from pymaml import V1P1, today
+from pymaml.model_v1p1 import FieldEntry
 
 
 class TestMAML(unittest.TestCase):
@@ -57,6 +65,40 @@ class TestMAML(unittest.TestCase):
         self.assertDictEqual(test_maml.__dict__, read_back_in.__dict__)
         os.remove("test.maml")
 
+    def test_to_file_output(self):
+        """
+        Testing the written file is byte identical to the pure python SafeDumper output
+        and that the global SafeDumper is not modified.
+        """
+
+        class ReferenceDumper(yaml.SafeDumper):
+            """Pure python dumper writing None as an empty value."""
+
+        ReferenceDumper.add_representer(
+            type(None),
+            lambda dumper, _: dumper.represent_scalar("tag:yaml.org,2002:null", ""),
+        )
+        example = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        long_text = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        long_text.meta.description = ("word " * 30 + "\n") * 3  # wrapped differently by libyaml
+        long_text.meta.author = "é" * 100
+        cases = {"example": example, "long text": long_text}
+        for (name, test_maml), include_none in itertools.product(cases.items(), (True, False)):
+            with self.subTest(name, include_none=include_none):
+                test_maml.to_file("test.maml", include_none=include_none)
+                with open("test.maml", encoding="utf8") as file:
+                    result = file.read()
+                os.remove("test.maml")
+                answer = yaml.dump(
+                    test_maml.to_dict(include_none),
+                    Dumper=ReferenceDumper,
+                    sort_keys=False,
+                    default_flow_style=False,
+                )
+                self.assertEqual(result, answer)
+                self.assertEqual(test_maml.to_yaml(include_none), answer)
+        self.assertEqual(yaml.safe_dump({"a": None}), "a: null\n")
+
     def test_to_markdown(self):
         """
         Testing that the to_markdown method creates a valid markdown file.
@@ -82,6 +124,35 @@ class TestMAML(unittest.TestCase):
         os.remove("test_markdown_v1p0.md")
         os.remove("test_markdown_v1p1.md")
 
+    def test_from_file_detects_version(self):
+        """
+        Testing that the version is detected when it is not given.
+        """
+        self.assertEqual(MAML.from_file("tests/example_v1p0.maml").version, "v1.0")
+        self.assertEqual(MAML.from_file("tests/example_v1p1.maml").version, "v1.1")
+
+    def test_from_buffer(self):
+        """
+        Testing that maml in memory gives the same object as the file.
+        """
+        with open("tests/example_v1p1.maml", "rb") as file:
+            content = file.read()
+        expected = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        for buffer in (content, memoryview(content), io.BytesIO(content)):
+            maml = MAML.from_buffer(buffer)
+            self.assertEqual(maml.version, "v1.1")
+            self.assertEqual(maml.meta, expected.meta)
+        with self.assertRaises(ValidationError):
+            MAML.from_buffer(b"table: a", "v1.0")
+
+    def test_not_a_mapping(self):
+        """
+        Testing that a document which is not a mapping raises a ValueError.
+        """
+        for version in (None, "v1.1"):
+            with self.subTest(version=version), self.assertRaises(ValueError):
+                MAML.from_buffer(b"- a\n- b\n", version)
+
     def test_to_dict(self):
         """
         Testing that the object can be represented as a dictionary
@@ -95,6 +166,69 @@ class TestMAML(unittest.TestCase):
         self.assertDictEqual(ans_dict, res_dict)
 
 
+    def test_to_dict_without_nones(self):
+        """
+        Testing that Nones are removed everywhere, including inside lists in extra,
+        exactly as removing them from the full dump does.
+        """
+        data = {
+            "table": "t",
+            "version": 1,
+            "date": "2025-09-12",
+            "author": "me",
+            "DOIs": [{"DOI": "x", "type": "y"}],
+            "depends": [{"table": "a"}],
+            "extra": {"a": None, "b": [1, None, {"c": None, "d": [None]}], "e": {}},
+            "fields": [
+                {"name": "a", "data_type": "x", "qc": {}},
+                {"name": "b", "data_type": "x", "qc": {"min": 1}, "ucd": ["pos.eq.ra"]},
+            ],
+        }
+        v1p0_data = {key: value for key, value in data.items() if key != "extra"}
+        for version, version_data in (("v1.0", v1p0_data), ("v1.1", data)):
+            with self.subTest(version=version):
+                maml = MAML(version_data, version)
+                self.assertEqual(
+                    maml.to_dict(include_none=False),
+                    _remove_nones(maml.meta.model_dump(mode="json")),
+                )
+        self.assertEqual(
+            maml.to_dict(include_none=False)["extra"], {"b": [1, {"d": []}], "e": {}}
+        )
+
+
+class TestIterMaml(unittest.TestCase):
+    """
+    Testing multi-document maml streams.
+    """
+
+    def setUp(self):
+        with open("tests/example_v1p1.maml", encoding="utf8") as file:
+            self.example = file.read()
+
+    def test_all_documents(self):
+        """Every document is validated and yielded in order."""
+        stream = io.StringIO("\n---\n".join([self.example] * 3))
+        documents = list(iter_maml(stream, "v1.1"))
+        self.assertEqual([doc.index for doc in documents], [0, 1, 2])
+        self.assertEqual(documents[0].line, 1)
+        self.assertEqual(documents[0].offset, 0)
+        self.assertEqual(documents[1].offset, len(self.example) + 5)
+        answer = MAML.from_file("tests/example_v1p1.maml", "v1.1").to_dict()
+        for doc in documents:
+            self.assertDictEqual(doc.maml.to_dict(), answer)
+
+    def test_invalid_document_located(self):
+        """Validation errors say which document failed."""
+        invalid = self.example.replace("author:", "auth:")
+        stream = io.StringIO(f"{self.example}\n---\n{invalid}")
+        documents = iter_maml(stream, "v1.1")
+        next(documents)
+        with self.assertRaises(ValidationError) as cm:
+            next(documents)
+        self.assertIn("In document 1", cm.exception.__notes__[0])
+
+
 class TestBuilder(unittest.TestCase):
     """
     Main class testing the Builder pattern is working correctly.
@@ -161,6 +295,117 @@ class TestBuilder(unittest.TestCase):
         self.assertDictEqual(maml.to_dict(include_none=False), ans_dict)
 
 
+class TestIncrementalBuild(unittest.TestCase):
+    """
+    Testing that building from validated parts is the same as validating the whole document.
+    """
+
+    def _builder(self) -> MAMLBuilder:
+        builder = MAMLBuilder("v1.1")
+        builder.set("table", "Name of Table")
+        builder.set("version", 1)
+        builder.set("date", "2025-09-11")
+        builder.set("author", "ME")
+        builder.add("coauthors", "You")
+        builder.add("fields", {"name": "ra", "ucd": "pos.eq.ra", "data_type": "float64"})
+        builder.add("keyarray", {"key": "k", "value": [1, "a"], "comment": "c"})
+        builder.set("extra", {"a": None})
+        return builder
+
+    def test_same_as_full_validation(self):
+        """The built model equals the one validated from the dictionary."""
+        builder = self._builder()
+        for i in range(5):
+            builder.add("fields", {"name": f"col_{i}", "data_type": "int32", "qc": {"min": i}})
+            maml = builder.build()
+            full = MAML(builder._data, "v1.1")
+            self.assertEqual(maml.meta, full.meta)
+            self.assertEqual(maml.to_dict(), full.to_dict())
+            self.assertEqual(maml.to_yaml(), full.to_yaml())
+
+    def test_only_new_entries_validated(self):
+        """Adding a field validates that field only, and building validates nothing."""
+        builder = self._builder()
+        with unittest.mock.patch.object(builder, "_validate_key") as key_validation:
+            builder.add("fields", {"name": "dec", "data_type": "float64"})
+        key_validation.assert_not_called()
+        with unittest.mock.patch("pymaml.maml.MAML.__init__") as full_validation:
+            builder.build()
+        full_validation.assert_not_called()
+
+    def test_builds_independent(self):
+        """Built mamls have their own lists and share only frozen entries."""
+        builder = self._builder()
+        first = builder.build()
+        first.meta.fields.append(first.meta.fields[0])
+        first.meta.coauthors.append("Them")
+        first.meta.extra["a"] = 1
+        with self.assertRaises(ValidationError):
+            first.meta.fields[0].unit = "deg"
+        with self.assertRaises(TypeError):
+            first.meta.keyarray[0].value.append(2)
+        second = builder.build()
+        self.assertEqual(second.to_dict(), MAML(builder._data, "v1.1").to_dict())
+        self.assertEqual(len(second.meta.fields), 1)
+        self.assertEqual(second.meta.extra, {"a": None})
+
+    def test_frozen_entries_copied(self):
+        """Copies and pickles of built entries are ordinary models."""
+        field = self._builder().build().meta.fields[0]
+        for copied in (field.model_copy(), copy.deepcopy(field), pickle.loads(pickle.dumps(field))):
+            copied.unit = "deg"
+            self.assertIsInstance(copied, FieldEntry)
+            self.assertIsNone(field.unit)
+        self.assertEqual(field, FieldEntry(name="ra", ucd="pos.eq.ra", data_type="float64"))
+
+    def test_values_copied(self):
+        """Changing a value after adding it changes neither the build nor the errors."""
+        builder = self._builder()
+        field = {"name": "dec", "data_type": "float64"}
+        builder.add("fields", field)
+        field["name"] = 5
+        self.assertEqual(builder.build().meta.fields[-1].name, "dec")
+        self.assertEqual(builder._data["fields"][-1]["name"], "dec")
+
+    def test_earlier_builds_unchanged(self):
+        """Adding to the builder does not change models that were already built."""
+        builder = self._builder()
+        maml = builder.build()
+        builder.add("fields", {"name": "dec", "data_type": "float64"})
+        self.assertEqual(len(maml.meta.fields), 1)
+        self.assertEqual(len(builder.build().meta.fields), 2)
+
+    def test_same_errors(self):
+        """Invalid entries raise the same errors as validating the whole document."""
+        cases = {
+            "bad ucd": lambda b: b.add("fields", {"name": "x", "ucd": "nope", "data_type": "a"}),
+            "missing name": lambda b: b.add("fields", {"data_type": "a"}),
+            "unknown key": lambda b: b.set("something", 1),
+            "explicit none": lambda b: b.set("survey", None),
+            "bad date": lambda b: b.set("date", "yesterday"),
+            "missing author": lambda b: b._data.pop("author") and b._parts.pop("author"),
+        }
+        for name, change in cases.items():
+            with self.subTest(name):
+                builder = self._builder()
+                change(builder)
+                with self.assertRaises(ValidationError) as built:
+                    builder.build()
+                with self.assertRaises(ValidationError) as full:
+                    MAML(builder._data, "v1.1")
+                self.assertEqual(
+                    built.exception.errors(include_context=False),
+                    full.exception.errors(include_context=False),
+                )
+
+    def test_fixed_by_set(self):
+        """An invalid value that is replaced no longer stops the build."""
+        builder = self._builder()
+        builder.set("date", "yesterday")
+        builder.set("date", "2025-09-12")
+        self.assertEqual(str(builder.build().meta.date), "2025-09-12")
+
+
 class TestAssertVersion(unittest.TestCase):
     """
     Testing that the _assert_version will crash correctly for wrong versions
@@ -177,6 +422,86 @@ class TestAssertVersion(unittest.TestCase):
         self.assertRaises(ValueError, _assert_version, "v1p1")
 
 
+class TestFieldIndex(unittest.TestCase):
+    """
+    Testing the cached name and ucd lookups of fields.
+    """
+
+    def setUp(self):
+        self.maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+
+    def test_field(self):
+        """Fields are found by name and missing names raise KeyError."""
+        self.assertIs(self.maml.field("RA"), self.maml.meta.fields[4])
+        self.assertRaises(KeyError, self.maml.field, "nope")
+
+    def test_select(self):
+        """Several fields in the requested order, and every missing name reported."""
+        self.assertEqual([f.name for f in self.maml.select(["Mag", "ID"])], ["Mag", "ID"])
+        with self.assertRaises(KeyError) as error:
+            self.maml.select(["ID", "a", "b"])
+        self.assertIn("['a', 'b']", str(error.exception))
+
+    def test_fields_with_ucd(self):
+        """Any word of a ucd string or list matches, ignoring case."""
+        self.assertEqual([f.name for f in self.maml.fields_with_ucd("meta.main")], ["ID"])
+        self.assertEqual([f.name for f in self.maml.fields_with_ucd("POS.EQ.RA")], ["RA"])
+        self.assertEqual(self.maml.fields_with_ucd("pos.galactic.lon"), [])
+
+    def test_index_is_cached(self):
+        """The index is only built once."""
+        self.maml.field("ID")
+        index = self.maml._field_index()
+        self.maml.select(["RA", "Dec"])
+        self.assertIs(self.maml._field_index(), index)
+
+    def test_fields_added_or_removed(self):
+        """Adding or removing fields rebuilds the index."""
+        self.maml.field("ID")
+        new = self.maml.meta.fields[0].model_copy(update={"name": "New", "ucd": "pos.eq.ra"})
+        self.maml.meta.fields.append(new)
+        self.assertIs(self.maml.field("New"), new)
+        self.assertEqual(len(self.maml.fields_with_ucd("pos.eq.ra")), 2)
+        self.maml.meta.fields.pop(0)
+        self.assertRaises(KeyError, self.maml.field, "ID")
+
+    def test_meta_replaced(self):
+        """Replacing meta or its fields rebuilds the index."""
+        self.maml.field("ID")
+        other = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        other.meta.fields[0].name = "Other"
+        self.maml.meta = other.meta
+        self.assertEqual(self.maml.field("Other").name, "Other")
+        self.maml.meta.fields = self.maml.meta.fields[:1]
+        self.assertRaises(KeyError, self.maml.field, "RA")
+
+    def test_changed_in_place(self):
+        """Renamed fields are noticed on lookup, other in place changes after invalidating."""
+        self.maml.field("ID")
+        self.maml.fields_with_ucd("pos.eq.ra")
+        self.maml.meta.fields[4].name = "ra"
+        self.maml.meta.fields[4].ucd = "pos.eq.dec"
+        self.assertEqual(self.maml.fields_with_ucd("pos.eq.ra"), [])
+        self.assertRaises(KeyError, self.maml.field, "RA")
+        self.maml.invalidate_field_index()
+        self.assertEqual(self.maml.field("ra").name, "ra")
+
+    def test_builder(self):
+        """Every build has its own index."""
+        builder = MAMLBuilder("v1.1")
+        builder.set("table", "Name of Table")
+        builder.set("version", 1)
+        builder.set("date", "2025-09-11")
+        builder.set("author", "ME")
+        builder.add("fields", {"name": "ra", "data_type": "float64"})
+        first = builder.build()
+        self.assertEqual(first.field("ra").name, "ra")
+        builder.add("fields", {"name": "dec", "data_type": "float64"})
+        second = builder.build()
+        self.assertEqual(second.field("dec").name, "dec")
+        self.assertRaises(KeyError, first.field, "dec")
+
+
 class TestBuilderDefaults(unittest.TestCase):
     """
     Testing that the buiders work with defaults.
@@ -269,7 +594,7 @@ class TestBuilderFieldsFromPandas(unittest.TestCase):
         expected_fields = [
             {"name": "id", "data_type": "int64"},
             {"name": "value", "data_type": "float64"},
-            {"name": "name", "data_type": "object"},
+            {"name": "name", "data_type": "string"},
         ]
 
         self.assertEqual(self.builder._data["fields"], expected_fields)
@@ -289,11 +614,107 @@ class TestBuilderFieldsFromPandas(unittest.TestCase):
 
         expected_fields = [
             {"name": "Column With Space", "data_type": "int64"},
-            {"name": "special!char$", "data_type": "object"},
+            {"name": "special!char$", "data_type": "string"},
+        ]
+
+        self.assertEqual(self.builder._data["fields"], expected_fields)
+
+
+    def test_dtype_map(self):
+        """A custom mapping table overrides the default one."""
+        df = pd.DataFrame({"id": [1, 2], "flag": [True, False]})
+        self.builder.fields_from_pandas(df, dtype_map={"int64": "long"})
+        expected_fields = [
+            {"name": "id", "data_type": "long"},
+            {"name": "flag", "data_type": "bool"},
         ]
+        self.assertEqual(self.builder._data["fields"], expected_fields)
+
+    def test_infer_qc(self):
+        """The min/max of numeric columns are inferred, skipping missing values."""
+        df = pd.DataFrame(
+            {
+                "id": [3, 1, 2],
+                "value": [0.5, None, -0.5],
+                "empty": [None, None, None],
+                "flag": [True, False, True],
+                "name": ["a", "b", "c"],
+            }
+        )
+        self.builder.fields_from_pandas(df, infer_qc=True)
+        fields = self.builder._data["fields"]
+        self.assertEqual(fields[0]["qc"], {"min": 1, "max": 3})
+        self.assertEqual(fields[1]["qc"], {"min": -0.5, "max": 0.5})
+        for field in fields[2:]:
+            self.assertNotIn("qc", field)
+        self.builder.set("table", "t").set("version", 1).set("date", "2025-01-01")
+        self.builder.set("author", "me").build()
+
+    def test_infer_qc_nullable(self):
+        """Nullable columns that are all missing, or an empty frame, give no qc."""
+        df = pd.DataFrame(
+            {
+                "empty": pd.array([None, None], dtype="Int64"),
+                "value": pd.array([1.5, None], dtype="Float64"),
+            }
+        )
+        self.builder.fields_from_pandas(df, infer_qc=True)
+        fields = self.builder._data["fields"]
+        self.assertNotIn("qc", fields[0])
+        self.assertEqual(fields[1]["qc"], {"min": 1.5, "max": 1.5})
+
+        builder = MAMLBuilder("v1.1").fields_from_pandas(df.iloc[:0], infer_qc=True)
+        for field in builder._data["fields"]:
+            self.assertNotIn("qc", field)
 
+
+class TestBuilderFieldsFromPolars(unittest.TestCase):
+    """Testing that we can build the fields from polars dataframes and lazyframes"""
+
+    def setUp(self):
+        self.builder = MAMLBuilder("v1.1")
+        self.df = pl.DataFrame(
+            {
+                "id": [3, 1, 2],
+                "value": [0.5, None, -0.5],
+                "name": ["a", "b", "c"],
+                "flag": [True, False, True],
+                "time": [1, 2, 3],
+            }
+        ).with_columns(pl.col("time").cast(pl.Datetime("us", "UTC")))
+
+    def test_dataframe(self):
+        """Polars dtypes are converted to maml data types."""
+        self.builder.fields_from_polars(self.df)
+        expected_fields = [
+            {"name": "id", "data_type": "int64"},
+            {"name": "value", "data_type": "float64"},
+            {"name": "name", "data_type": "string"},
+            {"name": "flag", "data_type": "boolean"},
+            {"name": "time", "data_type": "datetime"},
+        ]
         self.assertEqual(self.builder._data["fields"], expected_fields)
 
+    def test_lazyframe(self):
+        """Lazyframes give the same fields and qc as dataframes."""
+        self.builder.fields_from_polars(self.df, infer_qc=True)
+        lazy_builder = MAMLBuilder("v1.1").fields_from_polars(self.df.lazy(), infer_qc=True)
+        self.assertEqual(lazy_builder._data["fields"], self.builder._data["fields"])
+        fields = self.builder._data["fields"]
+        self.assertEqual(fields[0]["qc"], {"min": 1, "max": 3})
+        self.assertEqual(fields[1]["qc"], {"min": -0.5, "max": 0.5})
+        self.assertNotIn("qc", fields[2])
+
+    def test_arrow_schema(self):
+        """Fields from an arrow schema (anything with names and types)."""
+        try:
+            schema = self.df.to_arrow().schema
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        self.builder.fields_from_arrow(schema)
+        polars_builder = MAMLBuilder("v1.1").fields_from_polars(self.df)
+        self.assertEqual(self.builder._data["fields"], polars_builder._data["fields"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,130 @@
+"""
+Tests for the markdown renderer.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from yaml_to_markdown.md_converter import MDConverter
+
+from pymaml import main
+from pymaml.maml import MAML
+from pymaml.markdown import render_markdown, render_tree
+
+
+def _render(data: dict, compact: bool = False) -> str:
+    stream = io.StringIO()
+    render_markdown(data, stream, compact)
+    return stream.getvalue()
+
+
+class TestRenderMarkdown(unittest.TestCase):
+    """Testing the default layout matches MDConverter and the compact layout."""
+
+    def test_same_as_mdconverter(self):
+        """The default layout is identical to yaml_to_markdown's."""
+        cases = {
+            "v1.0": MAML.from_file("tests/example_v1p0.maml", "v1.0").to_dict(),
+            "v1.1": MAML.from_file("tests/example_v1p1.maml", "v1.1").to_dict(),
+            "quirks": {
+                "link": "http://example.org",
+                "image": "plot.PNG",
+                "file": "data.fits",
+                "multi-line": "a\nb",
+                "nested": {"deeper": {"x": 1, "y": ["a", "b.csv"]}},
+                "lists": [[1, 2], [3]],
+                "rows": [{"a": 1}, {"b": "x.jpg", "c": [1, 2]}],
+                "number": 1.5,
+                "none": None,
+            },
+        }
+        for name, data in cases.items():
+            with self.subTest(name):
+                expected = io.StringIO()
+                MDConverter().convert(data, expected)
+                self.assertEqual(_render(data), expected.getvalue())
+
+    def test_example_file(self):
+        """to_markdown still writes the example markdown."""
+        maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        with tempfile.TemporaryDirectory() as directory:
+            outfile = os.path.join(directory, "out.md")
+            maml.to_markdown(outfile)
+            with open(outfile, encoding="utf8") as file:
+                result = file.read()
+        with open("tests/example_markdown_v1p1.md", encoding="utf8") as file:
+            self.assertEqual(result.strip(), file.read().strip())
+
+    def test_empty_list(self):
+        """Empty lists give an empty section instead of failing."""
+        self.assertEqual(_render({"keywords": []}), "## Keywords\n\n")
+
+    def test_compact(self):
+        """The fields are one table with the qc in columns and no empty columns."""
+        data = MAML.from_file("tests/example_v1p1.maml", "v1.1").to_dict(include_none=False)
+        text = _render(data, compact=True)
+        self.assertIn("| Name | Unit | Ucd | Data_Type | Min | Max | Miss |\n", text)
+        self.assertIn("| ID |  | meta.id;meta.main | int32 | 1.0 | 5.0 | Null |\n", text)
+        self.assertIn("| test_vector | 1.8, 2.0, 5.0 | something |\n", text)
+        self.assertIn("```yaml\nanything:\n  I:\n    like: 1.3\n```\n", text)
+        self.assertNotIn("Info", text)
+
+    def test_compact_escaping(self):
+        """Pipes and new lines can't break a compact table."""
+        text = _render({"DOIs": [{"DOI": "a|b", "type": "x\ny"}]}, compact=True)
+        self.assertIn("| a\\|b | x<br/>y |\n", text)
+
+
+class TestRenderTree(unittest.TestCase):
+    """Testing rendering a directory of maml files."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        nested = os.path.join(self.test_dir.name, "nested")
+        os.mkdir(nested)
+        shutil.copy("tests/example_v1p0.maml", self.test_dir.name)
+        shutil.copy("tests/example_v1p1.maml", nested)
+        shutil.copy("tests/invalid.maml", nested)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_render_tree(self):
+        """Every valid file is rendered, next to it or under out_dir."""
+        out_dir = os.path.join(self.test_dir.name, "docs")
+        for workers, out in ((1, None), (2, out_dir)):
+            with self.subTest(workers=workers, out=out):
+                results = {
+                    os.path.basename(r["file"]): r
+                    for r in render_tree(self.test_dir.name, out, workers=workers)
+                }
+                self.assertEqual(len(results), 3)
+                self.assertIsNotNone(results["invalid.maml"]["error"])
+                markdown = results["example_v1p1.maml"]["markdown"]
+                expected_dir = os.path.join(out or self.test_dir.name, "nested")
+                self.assertEqual(markdown, os.path.join(expected_dir, "example_v1p1.md"))
+                self.assertTrue(os.path.isfile(results["example_v1p0.maml"]["markdown"]))
+
+    def test_not_a_mapping(self):
+        """A file holding a list is reported as an error."""
+        with open(os.path.join(self.test_dir.name, "list.maml"), "w", encoding="utf8") as file:
+            file.write("- a\n- b\n")
+        results = {os.path.basename(r["file"]): r for r in render_tree(self.test_dir.name, workers=1)}
+        self.assertIn("mapping", results["list.maml"]["error"])
+
+    def test_command(self):
+        """The markdown command renders and reports failures."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = main(["markdown", self.test_dir.name, "--workers", "1", "--compact"])
+        self.assertEqual(code, 1)
+        self.assertIn("FAIL", output.getvalue())
+        self.assertIn("Rendered 2 of 3 files", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Tests for migrating maml between versions.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+from contextlib import redirect_stdout
+
+from pydantic import ValidationError
+
+from pymaml import MAML, V1P1, main, migrate_dict, migrate_tree, read_maml
+from pymaml.migrate import _STEPS, migrate_file, migration_path
+
+
+class TestMigrationPath(unittest.TestCase):
+    """Testing that the chain of steps is found from the registry."""
+
+    def test_paths(self):
+        """Registered steps are chained and the same version needs no step."""
+        self.assertEqual(migration_path("v1.0", "v1.1"), [("v1.0", "v1.1")])
+        self.assertEqual(migration_path("v1.1", "v1.0"), [("v1.1", "v1.0")])
+        self.assertEqual(migration_path("v1.1", "v1.1"), [])
+
+    def test_not_connected(self):
+        """Versions without registered steps between them cannot be migrated."""
+        with unittest.mock.patch.dict(_STEPS, {"v1.0": _STEPS["v1.0"]}, clear=True):
+            self.assertRaises(ValueError, migration_path, "v1.1", "v1.0")
+        self.assertRaises(ValueError, migration_path, "v1.0", "v9.9")
+
+
+class TestMigrate(unittest.TestCase):
+    """Testing the migration of dictionaries and maml objects."""
+
+    def setUp(self):
+        self.v1p0 = read_maml("tests/example_v1p0.maml")
+        self.v1p1 = read_maml("tests/example_v1p1.maml")
+
+    def test_upgrade_dict(self):
+        """A v1.0 dictionary becomes a valid v1.1 one, leaving the original alone."""
+        migrated = migrate_dict(self.v1p0, "v1.1")
+        self.assertEqual(migrated["MAML_version"], 1.1)
+        self.assertEqual(self.v1p0["MAML_version"], 1.0)
+        self.assertEqual(list(migrated), list(self.v1p0))
+        V1P1(**migrated)
+
+    def test_version_added_in_order(self):
+        """A missing MAML_version is added in its place."""
+        del self.v1p0["MAML_version"]
+        migrated = migrate_dict(self.v1p0, "v1.1", "v1.0")
+        self.assertEqual(list(migrated)[-2:], ["MAML_version", "fields"])
+
+    def test_downgrade(self):
+        """Downgrading is refused when it would lose keys."""
+        self.assertRaises(ValueError, migrate_dict, self.v1p1, "v1.0")
+        del self.v1p1["keyarray"], self.v1p1["extra"]
+        self.assertEqual(migrate_dict(self.v1p1, "v1.0")["MAML_version"], 1.0)
+
+    def test_result_is_validated(self):
+        """Results that are not valid for the target raise."""
+        del self.v1p0["table"]
+        self.assertRaises(ValidationError, migrate_dict, self.v1p0, "v1.1")
+
+    def test_maml(self):
+        """MAML objects are migrated without going through yaml."""
+        maml = MAML(self.v1p0, "v1.0")
+        migrated = maml.migrate("v1.1")
+        self.assertEqual(migrated.version, "v1.1")
+        self.assertIsInstance(migrated.meta, V1P1)
+        self.assertEqual(migrated.meta.MAML_version, 1.1)
+        self.assertEqual(migrated.to_dict()["fields"], maml.to_dict()["fields"])
+
+
+class TestMigrateFiles(unittest.TestCase):
+    """Testing the migration of files and directories."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.test_dir.name, "tree")
+        nested = os.path.join(self.root, "nested")
+        os.makedirs(nested)
+        shutil.copy("tests/example_v1p0.maml", self.root)
+        shutil.copy("tests/example_v1p1.maml", nested)
+        shutil.copy("tests/invalid.maml", nested)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def _results(self, **kwargs) -> dict:
+        results = migrate_tree(self.root, "v1.1", **kwargs)
+        return {os.path.basename(result["file"]): result for result in results}
+
+    def test_dry_run(self):
+        """A dry run reports the changes without writing."""
+        file_name = os.path.join(self.root, "example_v1p0.maml")
+        with open(file_name, encoding="utf8") as file:
+            before = file.read()
+        result = migrate_file(file_name, "v1.1", dry_run=True)
+        self.assertEqual(result["source"], "v1.0")
+        self.assertEqual(result["changes"], {"changed": {"MAML_version": [1.0, 1.1]}})
+        self.assertIsNone(result["output"])
+        with open(file_name, encoding="utf8") as file:
+            self.assertEqual(file.read(), before)
+
+    def test_in_place(self):
+        """Files are rewritten in place, unchanged files are left alone."""
+        results = self._results(workers=1)
+        upgraded = results["example_v1p0.maml"]
+        self.assertEqual(upgraded["output"], upgraded["file"])
+        self.assertIsNone(results["example_v1p1.maml"]["output"])
+        self.assertEqual(results["example_v1p1.maml"]["changes"], {})
+        self.assertIsNotNone(results["invalid.maml"]["error"])
+        migrated = MAML.from_file(os.path.join(self.root, "example_v1p0.maml"))
+        self.assertEqual(migrated.version, "v1.1")
+        self.assertEqual(sorted(os.listdir(self.root)), ["example_v1p0.maml", "nested"])
+
+    def test_out_dir_with_processes(self):
+        """Files are written to the same relative paths under out_dir by a process pool."""
+        out_dir = os.path.join(self.test_dir.name, "out")
+        results = self._results(out_dir=out_dir, workers=2, chunk_size=1)
+        self.assertEqual(
+            results["example_v1p1.maml"]["output"],
+            os.path.join(out_dir, "nested", "example_v1p1.maml"),
+        )
+        self.assertFalse(os.path.exists(os.path.join(out_dir, "nested", "invalid.maml")))
+        for directory, version in ((out_dir, "v1.1"), (self.root, "v1.0")):
+            maml = MAML.from_file(os.path.join(directory, "example_v1p0.maml"))
+            self.assertEqual(maml.version, version)
+
+    def test_repeated_field_names(self):
+        """Fields with repeated names do not stop a migration, only the top level is reported."""
+        file_name = os.path.join(self.root, "example_v1p0.maml")
+        data = read_maml(file_name)
+        data["fields"].append(data["fields"][0])
+        MAML(data, "v1.0").to_file(file_name)
+        result = migrate_file(file_name, "v1.1")
+        self.assertIsNone(result["error"])
+        self.assertEqual(result["changes"], {"changed": {"MAML_version": [1.0, 1.1]}})
+        self.assertEqual(MAML.from_file(file_name).version, "v1.1")
+
+    def test_only_reported_changes(self):
+        """Values that validation coerces (e.g. 1 to 1.0) are written as they were."""
+        file_name = os.path.join(self.root, "example_v1p0.maml")
+        with open(file_name, encoding="utf8") as file:
+            text = file.read()
+        text = text.replace("version: Required version (string, integer, or float)", "version: 1")
+        text = text.replace("    min: 1\n", "    min: 3\n")
+        with open(file_name, "w", encoding="utf8") as file:
+            file.write(text)
+        result = migrate_file(file_name, "v1.1")
+        self.assertEqual(result["changes"], {"changed": {"MAML_version": [1.0, 1.1]}})
+        with open(file_name, encoding="utf8") as file:
+            written = file.read()
+        self.assertIn("\nversion: 1\n", written)
+        self.assertIn("    min: 3\n", written)
+
+    def test_not_a_mapping(self):
+        """A file holding a list is reported as an error."""
+        with open(os.path.join(self.root, "list.maml"), "w", encoding="utf8") as file:
+            file.write("- a\n- b\n")
+        self.assertIn("mapping", self._results(dry_run=True, workers=1)["list.maml"]["error"])
+
+    def test_cli(self):
+        """The migrate command prints every file and a summary."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = main(["migrate", self.root, "--to", "v1.1", "--dry-run", "--workers", "1"])
+        self.assertEqual(status, 1)
+        self.assertIn("MAML_version: 1.0 -> 1.1", output.getvalue())
+        self.assertIn("Would change 1 of 3 files", output.getvalue())
+        self.assertIn("1 unchanged, 1 failed.", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests for storing maml in parquet metadata.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import polars as pl
+
+from pymaml.maml import MAML, MAMLBuilder
+from pymaml.parquet import METADATA_KEY, maml_text, scan_parquet_maml
+
+
+class TestParquetMetadata(unittest.TestCase):
+    """Testing writing and reading maml in parquet files."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        self.frame = pl.DataFrame({"RA": [1.0, 2.0], "Dec": [-1.0, 3.0]})
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def _write(self, name: str, metadata: dict | None) -> str:
+        file_name = os.path.join(self.test_dir.name, name)
+        self.frame.write_parquet(file_name, metadata=metadata)
+        return file_name
+
+    def test_round_trip(self):
+        """The maml read back from the footer is the maml written."""
+        file_name = self._write("table.parquet", self.maml.to_parquet_metadata())
+        with patch("polars.read_parquet") as read_parquet, patch("polars.scan_parquet") as scan:
+            maml = MAML.from_parquet(file_name)
+        read_parquet.assert_not_called()
+        scan.assert_not_called()
+        self.assertEqual(maml.version, "v1.1")
+        self.assertEqual(maml.meta, self.maml.meta)
+        self.assertEqual(pl.read_parquet(file_name).shape, (2, 2))
+
+    def test_arrow_style_metadata(self):
+        """Bytes keys and values, as pyarrow gives them, are read too."""
+        metadata = {
+            key.encode(): value.encode() for key, value in self.maml.to_parquet_metadata().items()
+        }
+        self.assertEqual(MAML.from_parquet_metadata(metadata, "v1.1").meta, self.maml.meta)
+        self.assertIsNone(maml_text({b"other": b"x"}))
+
+    def test_missing(self):
+        """Files without maml raise."""
+        file_name = self._write("plain.parquet", None)
+        with self.assertRaises(ValueError):
+            MAML.from_parquet(file_name)
+
+    def test_scan(self):
+        """Every file is reported in order, failures included."""
+        for i in range(5):
+            self._write(f"table_{i}.parquet", self.maml.to_parquet_metadata())
+        self._write("table_5.parquet", None)
+        self._write("table_6.parquet", {METADATA_KEY: "table: only"})
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                results = list(scan_parquet_maml(self.test_dir.name, workers=workers))
+                self.assertEqual(
+                    [os.path.basename(result["file"]) for result in results],
+                    [f"table_{i}.parquet" for i in range(7)],
+                )
+                for result in results[:5]:
+                    self.assertEqual(result["maml"].meta, self.maml.meta)
+                    self.assertIsNone(result["error"])
+                self.assertIn("No 'maml' key", results[5]["error"])
+                self.assertIn("ValidationError", results[6]["error"])
+
+    def test_fields_from_parquet(self):
+        """The builder fills in fields from the parquet schema."""
+        file_name = self._write("table.parquet", None)
+        builder = MAMLBuilder("v1.1").fields_from_parquet(file_name, infer_qc=True)
+        self.assertEqual(
+            builder._data["fields"],
+            [
+                {"name": "RA", "data_type": "float64", "qc": {"min": 1.0, "max": 2.0}},
+                {"name": "Dec", "data_type": "float64", "qc": {"min": -1.0, "max": 3.0}},
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
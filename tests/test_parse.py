@@ -2,11 +2,14 @@
 Tests for the parse module
 """
 
+import os
+import tempfile
 import unittest
 import datetime
 
 from pymaml import is_iso8601, valid_for
-from pymaml.parse import check_order
+from pymaml.parse import check_order, detect_version, order_error, validation_report
+from pymaml.read import iter_top_level, read_maml
 
 
 class TestIsISO8601(unittest.TestCase):
@@ -58,6 +61,43 @@ class TestValidFor(unittest.TestCase):
         self.assertEqual("Not valid for any version of MAML", valids[0])
 
 
+class TestValidationReport(unittest.TestCase):
+    """Testing the per version validation report"""
+
+    def test_valid_file(self):
+        """Every version should report no errors for the v1.0 example."""
+        report = validation_report(read_maml("tests/example_v1p0.maml"))
+        self.assertDictEqual(report, {"v1.0": [], "v1.1": []})
+
+    def test_errors_are_reported(self):
+        """The invalid file is missing the author and should say so for every version."""
+        report = validation_report(read_maml("tests/invalid.maml"))
+        for version in ("v1.0", "v1.1"):
+            with self.subTest(version=version):
+                locs = [error["loc"] for error in report[version]]
+                self.assertIn("author", locs)
+        self.assertIn("keyarray", [error["loc"] for error in report["v1.0"]])
+
+    def test_invalid_ucd_location(self):
+        """A bad ucd should be reported with the path to the offending field."""
+        data = {
+            "table": "table",
+            "version": 0,
+            "date": "1995-09-12",
+            "author": "me",
+            "fields": [
+                {"name": "good", "data_type": "float", "ucd": "pos.eq.ra"},
+                {"name": "bad", "data_type": "float", "ucd": "not.valid"},
+            ],
+        }
+        report = validation_report(data)
+        for version in ("v1.0", "v1.1"):
+            with self.subTest(version=version):
+                self.assertEqual(len(report[version]), 1)
+                self.assertEqual(report[version][0]["loc"], "fields.1.ucd")
+                self.assertIn("not.valid", report[version][0]["msg"])
+
+
 class TestOrder(unittest.TestCase):
     """
     Testing the check_order function.
@@ -110,5 +150,85 @@ class TestOrder(unittest.TestCase):
         self.assertFalse(res)
 
 
+    def test_error_paths(self):
+        """The path of the first out of order key should be reported."""
+        data = {
+            "survey": 1,
+            "author": 2,
+            "fields": [
+                {"name": 1, "unit": 1, "data_type": 1},
+                {"name": 1, "data_type": 1, "unit": 1},
+            ],
+        }
+        self.assertEqual(order_error(data, "v1.0"), "fields.1.unit")
+        self.assertEqual(order_error({"author": 1, "survey": 1}, "v1.1"), "survey")
+        self.assertIsNone(order_error({"survey": 1, "author": 1}, "v1.1"))
+
+    def test_nested_qc(self):
+        """Nested models inside fields are also checked."""
+        data = {"fields": [{"name": 1, "qc": {"max": 1, "min": 0}}]}
+        self.assertEqual(order_error(data, "v1.1"), "fields.0.qc.min")
+
+    def test_examples_in_order(self):
+        """The official examples are in the correct order."""
+        self.assertIsNone(order_error(read_maml("tests/example_v1p0.maml"), "v1.0"))
+        self.assertIsNone(order_error(read_maml("tests/example_v1p1.maml"), "v1.1"))
+
+
+class TestDetectVersion(unittest.TestCase):
+    """Testing the version is detected from the top level keys."""
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def _write(self, text: str) -> str:
+        file_name = os.path.join(self.test_dir.name, "test.maml")
+        with open(file_name, "w", encoding="utf8") as file:
+            file.write(text)
+        return file_name
+
+    def test_example_files(self):
+        """The examples are detected as the versions they were written for."""
+        self.assertEqual(detect_version("tests/example_v1p0.maml"), "v1.0")
+        self.assertEqual(detect_version("tests/example_v1p1.maml"), "v1.1")
+        self.assertEqual(detect_version(read_maml("tests/example_v1p1.maml")), "v1.1")
+
+    def test_declared(self):
+        """A known MAML_version wins, an unknown one is ignored."""
+        self.assertEqual(detect_version(self._write("table: a\nMAML_version: 1.1\n")), "v1.1")
+        self.assertEqual(detect_version(self._write("table: a\nMAML_version: '1.0'\n")), "v1.0")
+        self.assertEqual(detect_version(self._write("table: a\nMAML_version: 7\n")), "v1.0")
+        self.assertEqual(detect_version({"keyarray": [], "MAML_version": None}), "v1.1")
+
+    def test_keys(self):
+        """Without a declaration the first version having every key is chosen."""
+        self.assertEqual(detect_version(self._write("table: a\nfields: []\n")), "v1.0")
+        self.assertEqual(detect_version(self._write("extra:\n  a: 1\ntable: a\n")), "v1.1")
+        self.assertEqual(detect_version(self._write("colour: red\n")), "v1.1")
+
+    def test_not_a_mapping(self):
+        """Data that is neither a dictionary nor a path raises a ValueError."""
+        for data in (["a", "b"], None, 1.1):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                detect_version(data)
+
+    def test_top_level_keys(self):
+        """Only the top level keys of the first document are scanned."""
+        file_name = self._write(
+            "table: a\nfields:\n  - name: b\n    qc: {min: 1}\nextra: {x: [1, 2]}\n"
+            "version: 2\n---\nauthor: me\n"
+        )
+        self.assertEqual(
+            list(iter_top_level(file_name)),
+            [("table", "a"), ("fields", None), ("extra", None), ("version", "2")],
+        )
+        self.assertEqual(list(iter_top_level(self._write("- a\n- b\n"))), [])
+        with self.assertRaises(ValueError):
+            list(iter_top_level(self._write("a: [b")))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for validating table data against the maml fields.
+"""
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+import polars as pl
+
+from pymaml import MAML
+
+
+def _table() -> dict:
+    """Columns matching tests/example_v1p1.maml with a few rows breaking the qc."""
+    return {
+        "ID": [0, 1, 5, 6, 3, 2],
+        "Name": ["A", "B", "F", "E", None, "C"],
+        "Date": ["2025-06-12", "2025-07-01", "2025-09-04", "Null", "2025-06-13", "x"],
+        "Flag": [True, False, True, True, False, True],
+        "RA": [43.0, 44.0, 49.0, float("nan"), 45.0, 46.0],
+        "Dec": [1.2, 3.5, 3.6, 1.0, None, 2.0],
+    }
+
+
+EXPECTED = {
+    "ID": {
+        "missing": False,
+        "data_type": "int64",
+        "below_min": 1,
+        "above_max": 1,
+        "too_long": None,
+        "rows": [0, 3],
+    },
+    "Name": {
+        "missing": False,
+        "data_type": None,
+        "below_min": 0,
+        "above_max": 1,
+        "too_long": None,
+        "rows": [2],
+    },
+    "Date": {
+        "missing": False,
+        "data_type": None,
+        "below_min": 1,
+        "above_max": 2,
+        "too_long": None,
+        "rows": [0, 2, 5],
+    },
+    "Flag": {
+        "missing": False,
+        "data_type": None,
+        "below_min": None,
+        "above_max": None,
+        "too_long": None,
+        "rows": [],
+    },
+    "RA": {
+        "missing": False,
+        "data_type": None,
+        "below_min": 1,
+        "above_max": 1,
+        "too_long": None,
+        "rows": [0, 2],
+    },
+    "Dec": {
+        "missing": False,
+        "data_type": None,
+        "below_min": 1,
+        "above_max": 1,
+        "too_long": None,
+        "rows": [2, 3],
+    },
+    "Mag": {
+        "missing": True,
+        "data_type": None,
+        "below_min": None,
+        "above_max": None,
+        "too_long": None,
+        "rows": [],
+    },
+}
+
+
+class TestValidateData(unittest.TestCase):
+    """Testing every supported kind of table gives the same result."""
+
+    def setUp(self):
+        self.maml = MAML.from_file("tests/example_v1p1.maml", "v1.1")
+        self.pandas = pd.DataFrame(_table())
+        self.polars = pl.DataFrame(_table(), nan_to_null=False)
+
+    def test_pandas(self):
+        """Pandas dataframes."""
+        self.assertDictEqual(self.maml.validate_data(self.pandas), EXPECTED)
+
+    def test_polars(self):
+        """Polars dataframes and lazyframes."""
+        self.assertDictEqual(self.maml.validate_data(self.polars), EXPECTED)
+        self.assertDictEqual(self.maml.validate_data(self.polars.lazy()), EXPECTED)
+
+    def test_files(self):
+        """Parquet and csv files are scanned."""
+        with tempfile.TemporaryDirectory() as directory:
+            parquet = os.path.join(directory, "table.parquet")
+            self.polars.write_parquet(parquet)
+            self.assertDictEqual(self.maml.validate_data(parquet), EXPECTED)
+            with self.assertRaises(ValueError):
+                self.maml.validate_data(os.path.join(directory, "table.fits"))
+
+    def test_chunks(self):
+        """Chunks are combined and row numbers refer to the whole table."""
+        chunks = [self.pandas.iloc[:3], self.pandas.iloc[3:]]
+        self.assertDictEqual(self.maml.validate_data(chunks), EXPECTED)
+        polars_chunks = self.polars.iter_slices(2)
+        self.assertDictEqual(self.maml.validate_data(polars_chunks), EXPECTED)
+
+    def test_sample_size(self):
+        """Only up to sample_size rows are returned."""
+        result = self.maml.validate_data(self.pandas, sample_size=1)
+        self.assertEqual(result["Date"]["rows"], [0])
+        self.assertEqual(result["Date"]["above_max"], 2)
+
+    def test_miss_and_array_size(self):
+        """Values equal to qc.miss are ignored and strings longer than array_size counted."""
+        builder_data = self.maml.to_dict(include_none=False)
+        builder_data["fields"] = [
+            {"name": "x", "data_type": "float64", "qc": {"min": 0, "max": 1, "miss": -99}},
+            {"name": "s", "data_type": "string", "array_size": 2, "qc": {"miss": "MISSING"}},
+        ]
+        maml = MAML(builder_data, "v1.1")
+        table = {"x": [0.5, -99.0, 2.0, 0.0], "s": ["ab", "abc", None, "MISSING"]}
+        for data in (pd.DataFrame(table), pl.DataFrame(table)):
+            with self.subTest(data=type(data).__module__):
+                result = maml.validate_data(data)
+                self.assertEqual(result["x"]["below_min"], 0)
+                self.assertEqual(result["x"]["above_max"], 1)
+                self.assertEqual(result["x"]["rows"], [2])
+                self.assertEqual(result["s"]["too_long"], 1)
+                self.assertEqual(result["s"]["rows"], [1])
+
+    def test_categorical(self):
+        """Categorical and enum string columns are checked as text."""
+        builder_data = self.maml.to_dict(include_none=False)
+        builder_data["fields"] = [
+            {"name": "s", "data_type": "string", "array_size": 2, "qc": {"min": "b", "max": "x"}}
+        ]
+        maml = MAML(builder_data, "v1.1")
+        values = ["ab", "abc", "b", None, "y"]
+        frames = {
+            "pandas": pd.DataFrame({"s": pd.Categorical(values)}),
+            "polars": pl.DataFrame({"s": values}, schema={"s": pl.Categorical}),
+            "enum": pl.DataFrame({"s": values}, schema={"s": pl.Enum(["ab", "abc", "b", "y"])}),
+        }
+        for name, data in frames.items():
+            with self.subTest(name):
+                result = maml.validate_data(data)
+                self.assertEqual(result["s"]["below_min"], 2)
+                self.assertEqual(result["s"]["above_max"], 1)
+                self.assertEqual(result["s"]["too_long"], 1)
+                self.assertEqual(result["s"]["rows"], [0, 1, 4])
+
+    def test_dates(self):
+        """Date and datetime columns are compared with the parsed bounds."""
+        builder_data = self.maml.to_dict(include_none=False)
+        builder_data["fields"] = [
+            {"name": "t", "data_type": "datetime", "qc": {"min": "2025-01-01", "max": "2025-12-31"}}
+        ]
+        maml = MAML(builder_data, "v1.1")
+        times = pd.to_datetime(["2024-12-31", "2025-06-01", "2026-01-01"])
+        for data in (pd.DataFrame({"t": times}), pl.DataFrame({"t": times.to_numpy()})):
+            with self.subTest(data=type(data).__module__):
+                result = maml.validate_data(data)
+                self.assertEqual(result["t"]["below_min"], 1)
+                self.assertEqual(result["t"]["above_max"], 1)
+                self.assertEqual(result["t"]["rows"], [0, 2])
+
+    def test_unsupported(self):
+        """Other types of data are refused."""
+        with self.assertRaises(TypeError):
+            self.maml.validate_data(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
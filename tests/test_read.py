@@ -2,13 +2,18 @@
 Tests for the read module.
 """
 
+import datetime
+import io
+import mmap
 import unittest
 import tempfile
 import warnings
 from pathlib import Path
 
+import yaml
 
 from pymaml import read_maml
+from pymaml.read import YAML_BACKEND, iter_maml_documents, read_maml_buffer
 
 
 class TestReadMaml(unittest.TestCase):
@@ -68,6 +73,12 @@ class TestReadMaml(unittest.TestCase):
             read_maml(path)
         self.assertIn("File is not even valid YAML", str(cm.exception))
 
+    def test_scanner_error_raises_valueerror(self):
+        """Testing that yaml scanner errors are also raised as ValueError"""
+        path = self._write_file("broken.maml", "a: b: c")
+        with self.assertRaises(ValueError):
+            read_maml(path)
+
     def test_empty_file_returns_none(self):
         """Testing empty files"""
         path = self._write_file("empty.maml", "")
@@ -79,5 +90,116 @@ class TestReadMaml(unittest.TestCase):
             self.assertTrue(any("FILE IS EMPTY!" in str(warn.message) for warn in w))
 
 
+class TestReadMamlBuffer(unittest.TestCase):
+    """Testing reading maml that is already in memory."""
+
+    def setUp(self):
+        with open("tests/example_v1p1.maml", "rb") as file:
+            self.content = file.read()
+        self.expected = read_maml("tests/example_v1p1.maml")
+
+    def test_buffers(self):
+        """Every kind of buffer gives the same dictionary as reading the file."""
+        buffers = {
+            "bytes": self.content,
+            "str": self.content.decode("utf8"),
+            "bytearray": bytearray(self.content),
+            "memoryview": memoryview(self.content),
+            "BytesIO": io.BytesIO(self.content),
+            "StringIO": io.StringIO(self.content.decode("utf8")),
+        }
+        for name, buffer in buffers.items():
+            with self.subTest(name):
+                self.assertEqual(read_maml_buffer(buffer), self.expected)
+
+    def test_mmap(self):
+        """Memory mapped files are read and can be closed afterwards."""
+        with open("tests/example_v1p1.maml", "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            mapped.seek(10)
+            self.assertEqual(read_maml_buffer(mapped), self.expected)
+            mapped.close()
+
+    def test_chunked(self):
+        """Buffers larger than one read are parsed completely."""
+        content = b"fields:\n" + b"".join(b"  - name: c%d\n" % i for i in range(5000))
+        result = read_maml_buffer(memoryview(content))
+        self.assertEqual(len(result["fields"]), 5000)
+
+    def test_no_extension_warning(self):
+        """There is no file name, so only empty input warns."""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            self.assertEqual(read_maml_buffer(b"a: 1"), {"a": 1})
+            self.assertEqual(caught, [])
+            self.assertEqual(read_maml_buffer(b""), {})
+            self.assertIn("FILE IS EMPTY!", str(caught[0].message))
+
+    def test_errors(self):
+        """Invalid yaml and unreadable objects raise."""
+        with self.assertRaises(ValueError):
+            read_maml_buffer(b"a: [b")
+        with self.assertRaises(TypeError):
+            read_maml_buffer(12)
+
+
+class TestBackends(unittest.TestCase):
+    """Testing the C and pure python loaders read maml identically."""
+
+    def test_backend_name(self):
+        """The backend used is reported."""
+        expected = "libyaml" if yaml.__with_libyaml__ else "python"
+        self.assertEqual(YAML_BACKEND, expected)
+
+    @unittest.skipUnless(yaml.__with_libyaml__, "PyYAML built without libyaml")
+    def test_identical_dicts(self):
+        """Both loaders return the same dictionaries, including dates."""
+        for name in ("example.maml", "example_v1p0.maml", "example_v1p1.maml"):
+            with self.subTest(file=name):
+                with open(f"tests/{name}", encoding="utf8") as file:
+                    text = file.read()
+                python = yaml.load(text, Loader=yaml.SafeLoader)
+                libyaml = yaml.load(text, Loader=yaml.CSafeLoader)
+                self.assertEqual(python, libyaml)
+                self.assertEqual(read_maml(f"tests/{name}"), python)
+        date = yaml.load("date: 2025-09-01", Loader=yaml.CSafeLoader)["date"]
+        self.assertEqual(date, datetime.date(2025, 9, 1))
+
+
+class TestIterMamlDocuments(unittest.TestCase):
+    """Testing multi-document streams are read one document at a time."""
+
+    TEXT = "# \u00e9 comment\na: 1\n---\nb: 2\n---\n---\nc:\n  d: 3\n"
+
+    def test_documents(self):
+        """Every non-empty document is yielded with its index, line and byte offset."""
+        data = self.TEXT.encode("utf8")
+        documents = list(iter_maml_documents(io.BytesIO(data)))
+        self.assertEqual([doc[0] for doc in documents], [0, 1, 3])
+        self.assertEqual([doc[1] for doc in documents], [2, 4, 7])
+        self.assertEqual([doc[3] for doc in documents], [{"a": 1}, {"b": 2}, {"c": {"d": 3}}])
+        for _, _, offset, document in documents:
+            key = next(iter(document)).encode("utf8")
+            self.assertEqual(data[offset : offset + 1], key)
+
+    def test_text_stream_and_file(self):
+        """Text streams and file names give the same result as binary streams."""
+        expected = list(iter_maml_documents(io.BytesIO(self.TEXT.encode("utf8"))))
+        self.assertEqual(list(iter_maml_documents(io.StringIO(self.TEXT))), expected)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "multi.maml"
+            path.write_text(self.TEXT, encoding="utf8")
+            self.assertEqual(list(iter_maml_documents(str(path))), expected)
+
+    def test_invalid_document(self):
+        """Broken yaml is reported with the index of the failing document."""
+        stream = io.StringIO("a: 1\n---\nnot: [valid_yaml\n")
+        documents = iter_maml_documents(stream)
+        self.assertEqual(next(documents)[3], {"a": 1})
+        with self.assertRaises(ValueError) as cm:
+            next(documents)
+        self.assertIn("Document 1", str(cm.exception))
+
+
 if __name__ == "__main__":
     unittest.main()
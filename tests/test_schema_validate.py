@@ -0,0 +1,136 @@
+"""
+Parity tests between the compiled json schema validator and the pydantic models.
+"""
+
+import copy
+import datetime
+import glob
+import unittest
+
+from pymaml.parse import MODELS, validation_report
+from pymaml.read import read_maml
+from pymaml.schema_validate import (
+    compile_predicate,
+    compile_schema,
+    is_valid,
+    load_schema,
+    quick_validate,
+    quick_validation_report,
+)
+
+
+def _verdicts(report: dict) -> dict:
+    return {version: not errors for version, errors in report.items()}
+
+
+def _mutations(data: dict) -> dict:
+    """Named copies of the data each broken (or not) in one way."""
+    changes = {
+        "no author": lambda d: d.pop("author"),
+        "explicit none": lambda d: d.__setitem__("survey", None),
+        "numeric version": lambda d: d.__setitem__("version", 3),
+        "list version": lambda d: d.__setitem__("version", [3]),
+        "bool version": lambda d: d.__setitem__("version", True),
+        "bad date": lambda d: d.__setitem__("date", "nope"),
+        "string date": lambda d: d.__setitem__("date", "2025-01-01"),
+        "bad ucd": lambda d: d["fields"][0].__setitem__("ucd", "bad.ucd"),
+        "non string ucd": lambda d: d["fields"][0].__setitem__("ucd", ["pos.eq.ra", 3]),
+        "integral float array_size": lambda d: d["fields"][0].__setitem__("array_size", 3.0),
+        "float array_size": lambda d: d["fields"][0].__setitem__("array_size", 3.5),
+        "no qc": lambda d: d["fields"][0].__setitem__("qc", None),
+        "unknown qc key": lambda d: d["fields"][0]["qc"].__setitem__("other", 1),
+        "list ucd": lambda d: d["fields"][0].__setitem__("ucd", ["pos.eq.ra", "meta.main"]),
+        "unknown field key": lambda d: d["fields"][0].__setitem__("other", 1),
+        "no data_type": lambda d: d["fields"][0].pop("data_type"),
+        "numeric unit": lambda d: d["fields"][0].__setitem__("unit", 5),
+        "fields not a list": lambda d: d.__setitem__("fields", {}),
+        "incomplete DOI": lambda d: d.__setitem__("DOIs", [{"DOI": "x"}]),
+        "numeric depends table": lambda d: d.__setitem__("depends", [{"table": 3}]),
+        "numeric keywords": lambda d: d.__setitem__("keywords", 5),
+        "string MAML_version": lambda d: d.__setitem__("MAML_version", "x"),
+        "quoted MAML_version": lambda d: d.__setitem__("MAML_version", "1.1"),
+        "bool MAML_version": lambda d: d.__setitem__("MAML_version", True),
+        "huge version": lambda d: d.__setitem__("version", 10**400),
+        "huge qc": lambda d: d["fields"][0].__setitem__("qc", {"max": 10**400}),
+        "huge array_size": lambda d: d["fields"][0].__setitem__("array_size", 10**400),
+        "midnight datetime date": lambda d: d.__setitem__("date", datetime.datetime(2025, 1, 1)),
+        "datetime date": lambda d: d.__setitem__("date", datetime.datetime(2025, 1, 1, 12)),
+        "midnight string date": lambda d: d.__setitem__("date", "2025-01-01T00:00:00"),
+        "string datetime date": lambda d: d.__setitem__("date", "2025-01-01T12:00:00"),
+        "integer date": lambda d: d.__setitem__("date", 1735689600),
+        "integer date not at midnight": lambda d: d.__setitem__("date", 1735689601),
+        "none date": lambda d: d.__setitem__("date", None),
+        "list keywords of numbers": lambda d: d.__setitem__("keywords", [1, 2]),
+        "unknown key": lambda d: d.__setitem__("unknown", 1),
+    }
+    mutated = {}
+    for name, change in changes.items():
+        copied = copy.deepcopy(data)
+        change(copied)
+        mutated[name] = copied
+    return mutated
+
+
+class TestParity(unittest.TestCase):
+    """The compiled schemas must agree with the pydantic models."""
+
+    def setUp(self):
+        self.files = sorted(glob.glob("tests/**/*.maml", recursive=True))
+
+    def _assert_agree(self, data):
+        expected = _verdicts(validation_report(data))
+        self.assertEqual(_verdicts(quick_validation_report(data)), expected)
+        self.assertEqual({v: is_valid(data, v) for v in MODELS}, expected)
+
+    def test_test_files(self):
+        """Every maml file in the tests directory."""
+        self.assertGreater(len(self.files), 0)
+        for file_name in self.files:
+            with self.subTest(file=file_name):
+                self._assert_agree(read_maml(file_name))
+
+    def test_mutations(self):
+        """Variations of the official examples broken in different ways."""
+        for file_name in ("tests/example_v1p0.maml", "tests/example_v1p1.maml"):
+            for name, data in _mutations(read_maml(file_name)).items():
+                with self.subTest(file=file_name, mutation=name):
+                    self._assert_agree(data)
+
+
+class TestErrors(unittest.TestCase):
+    """Testing the errors reported by the compiled schemas."""
+
+    def test_locations(self):
+        """Errors point at the offending key."""
+        data = read_maml("tests/invalid.maml")
+        self.assertEqual(
+            [error["loc"] for error in quick_validate(data, "v1.0")],
+            ["author", "keyarray", "extra"],
+        )
+        data = read_maml("tests/example_v1p1.maml")
+        data["fields"][2]["ucd"] = "not.valid"
+        errors = quick_validate(data, "v1.1")
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]["loc"], "fields.2.ucd")
+
+    def test_unsupported_keyword(self):
+        """Schemas using keywords the compiler does not know about are refused."""
+        schema = load_schema("v1.1")
+        schema["properties"]["table"]["pattern"] = ".*"
+        with self.assertRaises(NotImplementedError):
+            compile_schema(schema)
+
+    def test_predicate(self):
+        """The predicate of a simple schema."""
+        predicate = compile_predicate({"type": ["integer", "null"]})
+        self.assertTrue(predicate(3))
+        self.assertTrue(predicate(3.0))
+        self.assertTrue(predicate(None))
+        self.assertTrue(predicate("3"))  # coerced, as pydantic does
+        self.assertFalse(predicate(3.5))
+        self.assertFalse(predicate("x"))
+        self.assertFalse(predicate([3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
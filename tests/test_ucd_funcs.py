@@ -0,0 +1,80 @@
+"""
+Tests for the ucd_funcs module.
+"""
+
+import unittest
+
+from pymaml import V1P1
+from pymaml.ucd_funcs import (
+    clear_ucd_cache,
+    controlled_vocabulary,
+    is_valid_ucd,
+    join_ucd,
+    ucd_cache_info,
+    warm_ucd_cache,
+)
+
+
+class TestJoinUCD(unittest.TestCase):
+    """Testing ucds given as lists are joined correctly."""
+
+    def test_join(self):
+        """Lists are joined with semicolons and strings are untouched."""
+        self.assertEqual(join_ucd(["pos.eq.ra", "meta.main"]), "pos.eq.ra;meta.main")
+        self.assertEqual(join_ucd("pos.eq.ra"), "pos.eq.ra")
+
+
+class TestUCDCache(unittest.TestCase):
+    """Testing the ucd cache."""
+
+    def setUp(self):
+        clear_ucd_cache()
+
+    def tearDown(self):
+        clear_ucd_cache()
+
+    def test_results(self):
+        """Cached results should be the same as the uncached check."""
+        self.assertTrue(is_valid_ucd("pos.eq.ra;meta.main"))
+        self.assertFalse(is_valid_ucd("not.valid"))
+        self.assertTrue(is_valid_ucd("pos.eq.ra;meta.main"))
+        self.assertFalse(is_valid_ucd("not.valid"))
+        info = ucd_cache_info()
+        self.assertEqual(info["misses"], 2)
+        self.assertEqual(info["hits"], 2)
+
+    def test_wide_table_scales_with_unique_ucds(self):
+        """Validating 2000 columns with 4 distinct ucds should only check 4 ucds."""
+        ucds = ["pos.eq.ra;meta.main", "pos.eq.dec", "phot.mag;em.opt.R", "meta.id"]
+        data = {
+            "table": "table",
+            "version": 0,
+            "date": "1995-09-12",
+            "author": "me",
+            "fields": [
+                {"name": f"col_{i}", "data_type": "float", "ucd": ucds[i % 4]}
+                for i in range(2000)
+            ],
+        }
+        V1P1(**data)
+        info = ucd_cache_info()
+        self.assertEqual(info["misses"], 4)
+        self.assertEqual(info["hits"], 1996)
+
+    def test_warm(self):
+        """Warming fills the cache with the controlled vocabulary."""
+        words = controlled_vocabulary()
+        self.assertIn("pos.eq.ra", words)
+        self.assertEqual(warm_ucd_cache(), len(words))
+        self.assertEqual(ucd_cache_info()["currsize"], len(set(words)))
+        is_valid_ucd("pos.eq.ra")
+        self.assertEqual(ucd_cache_info()["hits"], 1)
+
+    def test_warm_custom(self):
+        """Warming with a given list of ucds."""
+        self.assertEqual(warm_ucd_cache(["pos.eq.ra;meta.main"]), 1)
+        self.assertEqual(ucd_cache_info()["currsize"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()